@@ -1,12 +1,25 @@
-import streamlit as st
-import pandas as pd
-from faker import Faker
+import os
 import random
-from datetime import datetime, timedelta, date
-from geopy.distance import geodesic
+from pathlib import Path
+
+import streamlit as st
+
+from gerador_dados import (AREAS, como_exibicao, estimar_tamanho, exportar_em_partes, gerar_dados_em_cache,
+                           gerar_linhas, iniciar_tarefa, limite_linhas, perfilar)
+
+# Acima deste número de linhas o conjunto não é montado em memória: as páginas são
+# geradas sob demanda e o arquivo para download é gravado em segundo plano
+LIMITE_EM_MEMORIA = 100_000
+
+# Máximo de linhas do conjunto virtual e do conjunto gravado em arquivo
+MAX_LINHAS_VIRTUAL = 1_000_000_000
+MAX_LINHAS = 100_000_000
+
+# Linhas convertidas por vez no download e linhas da amostra que estima o tamanho do arquivo
+LINHAS_POR_PARTE = 50_000
+LINHAS_AMOSTRA = 2_000
 
 # CONFIGURAÇÃO INICIAL
-fake = Faker('pt_BR')
 st.set_page_config(page_title="Gerador de Dados", page_icon="💾", layout="wide")
 
 # Cabeçalho centralizado
@@ -17,15 +30,7 @@ with col_c:
     st.write("")  # espaçamento opcional
 
 # ÁREA E SUBÁREA
-areas = {
-    'Vendas': [],
-    'Saúde': [],
-    'RH': [],
-    'Fornecedores': [],
-    'Logística': ['Transporte', 'Estoque', 'Distribuição'],
-    'Financeiro': ['Contas a Pagar', 'Contas a Receber', 'Fluxo de Caixa'],
-    'SLA de Atendimento': ['Suporte Técnico', 'Helpdesk', 'Manutenção']
-}
+areas = AREAS
 
 # Layout centralizado para seleção de parâmetros
 col1, col2, col3 = st.columns([1, 2, 1])  # colunas laterais menores
@@ -37,470 +42,73 @@ with col2:
     if areas[area]:
         subarea = st.selectbox('📁 Selecione a subárea:', areas[area], key='subarea_select')
 
-    qtd = st.slider(
-        '📊 Quantas linhas deseja gerar?',
-        min_value=10,
-        max_value=1000,
-        step=10,
-        value=20,
-        key='slider_qtd'
-    )
-
-# DICIONÁRIO DE COORDENADAS DAS PRINCIPAIS CIDADES BRASILEIRAS
-CIDADES_COORDS = {
-    'São Paulo': (-23.5505, -46.6333),
-    'Rio de Janeiro': (-22.9068, -43.1729),
-    'Belo Horizonte': (-19.9167, -43.9345),
-    'Brasília': (-15.7939, -47.8828),
-    'Curitiba': (-25.4284, -49.2733),
-    'Porto Alegre': (-30.0346, -51.2177),
-    'Salvador': (-12.9714, -38.5014),
-    'Fortaleza': (-3.7319, -38.5267),
-    'Recife': (-8.0476, -34.8770),
-    'Manaus': (-3.1190, -60.0217),
-    'Goiânia': (-16.6869, -49.2648),
-    'Campinas': (-22.9099, -47.0626),
-    'Florianópolis': (-27.5954, -48.5480),
-    'Vitória': (-20.3155, -40.3128),
-    'Santos': (-23.9618, -46.3322),
-    'Joinville': (-26.3045, -48.8487),
-    'Blumenau': (-26.9194, -49.0661),
-    'Caxias do Sul': (-29.1678, -51.1794),
-    'Ribeirão Preto': (-21.1704, -47.8103),
-    'Uberlândia': (-18.9186, -48.2772),
-    'Sorocaba': (-23.5015, -47.4526),
-    'Cuiabá': (-15.6014, -56.0979),
-    'Belém': (-1.4558, -48.5039),
-    'João Pessoa': (-7.1195, -34.8450),
-    'Natal': (-5.7945, -35.2110)
-}
+    # Conjunto virtual: só as linhas da página exibida são geradas
+    virtual = st.toggle('♾️ Conjunto virtual (gera só a página exibida)', key='modo_virtual')
+
+    # Colunas sem repetição (CNPJ, Nota Fiscal, ...) limitam as linhas de algumas áreas
+    limite = limite_linhas(area, subarea)
+    max_linhas = min(MAX_LINHAS_VIRTUAL if virtual else MAX_LINHAS, limite or MAX_LINHAS_VIRTUAL)
+    chave_qtd = 'qtd_virtual' if virtual else 'qtd_linhas'
+    if st.session_state.get(chave_qtd, 0) > max_linhas:
+        st.session_state[chave_qtd] = max_linhas
+
+    if virtual:
+        qtd = st.number_input(
+            '📊 Linhas do conjunto virtual:',
+            min_value=10,
+            max_value=max_linhas,
+            step=1_000_000,
+            value=min(10_000_000, max_linhas),
+            key='qtd_virtual'
+        )
+    else:
+        qtd = st.number_input(
+            '📊 Quantas linhas deseja gerar?',
+            min_value=10,
+            max_value=max_linhas,
+            step=1000,
+            value=20,
+            key='qtd_linhas'
+        )
+    if limite is not None and limite < MAX_LINHAS_VIRTUAL:
+        st.caption(f'Esta área gera no máximo {limite:,} linhas sem repetir as chaves únicas.')
+    if qtd > LIMITE_EM_MEMORIA:
+        st.caption(f'Acima de {LIMITE_EM_MEMORIA:,} linhas, as páginas são geradas sob demanda e '
+                   'o arquivo é gravado em segundo plano.')
+
+    # Semente da geração: os mesmos parâmetros e a mesma semente reaproveitam o cache
+    if 'seed' not in st.session_state:
+        st.session_state.seed = random.randrange(2**32)
+
+    if st.button('🎲 Gerar novos dados', use_container_width=True):
+        st.session_state.seed = random.randrange(2**32)
+        st.session_state.pagina_atual = 1
 
-def calcular_distancia(cidade_origem, cidade_destino):
-    """Calcula a distância real entre duas cidades brasileiras"""
-    if cidade_origem in CIDADES_COORDS and cidade_destino in CIDADES_COORDS:
-        coords_origem = CIDADES_COORDS[cidade_origem]
-        coords_destino = CIDADES_COORDS[cidade_destino]
-        distancia_km = geodesic(coords_origem, coords_destino).kilometers
-        return round(distancia_km)
-    return random.randint(100, 2000)  # fallback caso cidade não esteja no dicionário
-
-# FUNÇÃO PRINCIPAL
-def gerar_dados(area, qtd, subarea=None):
-    dados = []
-
-    # ÁREA: VENDAS
-    if area == 'Vendas':
-        # Lista fixa de 10 vendedores
-        vendedores = [
-            "Ana", "Bruno", "Carla", "Diego", "Eduardo",
-            "Fernanda", "Gabriel", "Helena", "João", "Mariana"
-        ]
-
-        # Produtos de informática com faixas de preço coerentes
-        produtos_precos = {
-            'Mouse': (30, 150),
-            'Teclado': (50, 300),
-            'Headset': (80, 400),
-            'Webcam': (100, 500),
-            'Memória RAM 8GB': (150, 300),
-            'Memória RAM 16GB': (250, 500),
-            'SSD 256GB': (180, 350),
-            'SSD 512GB': (300, 600),
-            'SSD 1TB': (450, 900),
-            'HD Externo 1TB': (250, 450),
-            'Placa de Vídeo GTX': (1200, 2500),
-            'Placa de Vídeo RTX': (2500, 5000),
-            'Processador Intel i5': (800, 1500),
-            'Processador Intel i7': (1500, 2500),
-            'Processador AMD Ryzen 5': (700, 1300),
-            'Processador AMD Ryzen 7': (1300, 2200),
-            'Fonte 500W': (200, 400),
-            'Fonte 700W': (350, 600),
-            'Placa-Mãe': (400, 1200),
-            'Gabinete': (150, 600),
-            'Monitor 24"': (600, 1200),
-            'Monitor 27"': (900, 2000),
-            'Notebook': (2000, 5000),
-            'Computador Desktop': (2500, 6000),
-            'Impressora': (400, 1500),
-            'Roteador Wi-Fi': (100, 400),
-            'Switch de Rede': (150, 500),
-            'Cabo HDMI': (20, 80),
-            'Cabo de Rede': (15, 50),
-            'Pendrive 32GB': (25, 60),
-            'Pendrive 64GB': (40, 90),
-            'Cooler para CPU': (50, 200),
-            'Cadeira Gamer': (600, 2000),
-            'Mesa para Computador': (300, 1200)
-        }
-
-        pagamentos = ['Cartão', 'Dinheiro', 'Pix', 'Boleto']
-
-        # Data mínima: 1º de janeiro de 2025
-        data_inicio_minima = date(2025, 1, 1)
-        # Data atual
-        data_atual = datetime.now().date()
-
-        for _ in range(qtd):
-            # Gera data a partir de janeiro de 2025
-            data_venda = fake.date_between(start_date=data_inicio_minima, end_date='today')
-
-            # Gera nome sem títulos (apenas primeiro e último nome)
-            nome_cliente = f"{fake.first_name()} {fake.last_name()}"
-
-            # Seleciona produto e sua faixa de preço
-            produto = random.choice(list(produtos_precos.keys()))
-            preco_min, preco_max = produtos_precos[produto]
-
-            # Define forma de pagamento
-            forma_pagamento = random.choice(pagamentos)
-
-            # Define STATUS e Nº VEZES baseado na forma de pagamento
-            if forma_pagamento in ['Pix', 'Dinheiro']:
-                status = 'PAGO'
-                num_vezes = 1
-            else:
-                # Para outras formas, escolhe entre PAGO, NÃO PAGO ou PENDENTE
-                status = random.choice(['PAGO', 'NÃO PAGO', 'PENDENTE'])
-                # Número de parcelas entre 1 e 12
-                num_vezes = random.randint(1, 12)
-
-            # Define quantidade do produto
-            quantidade = random.randint(1, 5)
-
-            # Define valor unitário dentro da faixa do produto
-            valor_unitario = round(random.uniform(preco_min, preco_max), 2)
-            valor_total = valor_unitario * quantidade
-
-            # Define desconto em PERCENTUAL (0% a 20%)
-            desconto_percentual = random.choice([0, 0, 0, 5, 10, 15, 20])
-            desconto_valor = round(valor_total * (desconto_percentual / 100), 2)
-
-            # Valor final
-            valor_final = round(valor_total - desconto_valor, 2)
-
-            # Calcula DATA VENCIMENTO
-            if forma_pagamento in ['Pix', 'Dinheiro'] or num_vezes == 1:
-                # Pagamento à vista - vencimento é a data da compra
-                data_vencimento = data_venda
-            else:
-                # Pagamento parcelado - calcula próximo vencimento
-                # Primeira parcela vence 30 dias após a compra
-                dias_por_parcela = 30
-
-                # Calcula quantas parcelas já venceram até hoje
-                dias_desde_compra = (data_atual - data_venda).days
-                parcelas_vencidas = dias_desde_compra // dias_por_parcela
-
-                # Próxima parcela a vencer (se todas já venceram, mostra a última)
-                if parcelas_vencidas >= num_vezes:
-                    # Todas as parcelas já venceram - mostra a última parcela
-                    proxima_parcela = num_vezes
-                else:
-                    # Ainda há parcelas a vencer - mostra a próxima
-                    proxima_parcela = parcelas_vencidas + 1
-
-                # Data de vencimento da próxima parcela
-                data_vencimento = data_venda + timedelta(days=proxima_parcela * dias_por_parcela)
-
-            dados.append({
-                'Data': data_venda,
-                'Cliente': nome_cliente,
-                'Produto': produto,
-                'Quantidade': quantidade,
-                'Valor': valor_final,
-                'Desconto': f"{desconto_percentual}%",
-                'Forma de Pagamento': forma_pagamento,
-                'Nº Vezes': num_vezes,
-                'Data Vencimento': data_vencimento,
-                'Status': status,
-                'Vendedor': fake.first_name()
-            })
-
-    # ÁREA: SAÚDE
-    elif area == 'Saúde':
-        especialidades = ['Clínico Geral', 'Cardiologia', 'Ortopedia', 'Dermatologia', 'Pediatria']
-        convenios = ['Particular', 'Plano A', 'Plano B', 'SUS']
-
-        for _ in range(qtd):
-            dados.append({
-                'Data da Consulta': fake.date_between(start_date='-6M', end_date='today'),
-                'Paciente': fake.name(),
-                'Especialidade': random.choice(especialidades),
-                'Convênio': random.choice(convenios),
-                'Valor (R$)': round(random.uniform(100, 500), 2),
-                'Médico': f"Dr(a). {fake.last_name()}"
-            })
-
-    # ÁREA: RH
-    elif area == 'RH':
-        cargos = ['Coordenador', 'Gerente', 'Técnico', 'Pleno', 'Júnior', 'Sênior']
-        departamentos = ['TI', 'Financeiro', 'Vendas', 'Marketing', 'Operações']
-
-        for _ in range(qtd):
-            dados.append({
-                'Nome': fake.name(),
-                'Cargo': random.choice(cargos),
-                'Departamento': random.choice(departamentos),
-                'Data de Admissão': fake.date_between(start_date='-5y', end_date='today'),
-                'Salário (R$)': round(random.uniform(2000, 15000), 2)
-            })
-
-    # ÁREA: FORNECEDORES
-    elif area == 'Fornecedores':
-        categorias = ['Eletrônicos', 'Móveis', 'Material de Escritório', 'Alimentos', 'Limpeza']
-
-        for _ in range(qtd):
-            dados.append({
-                'Razão Social': fake.company(),
-                'Nome Fantasia': fake.company_suffix(),
-                'Endereço': fake.street_address(),
-                'Cidade': fake.city(),
-                'Bairro': fake.street_name(),
-                'Estado': fake.state_abbr(),
-                'CEP': fake.postcode(),
-                'CNPJ': fake.cnpj(),
-                'Numero de Contato': fake.phone_number(),
-                'Email de contato': fake.company_email()
-            })
-
-    # ÁREA: LOGÍSTICA
-    elif area == 'Logística':
-        if subarea == 'Transporte':
-            tipos_transporte = ['Rodoviário', 'Aéreo', 'Marítimo']
-            tipos_combustivel = ['Óleo Diesel S10', 'Óleo Diesel S500']
-
-            # Modelos de veículos disponíveis
-            veiculos_scania = ['R 410', 'R 450', 'G 540', 'G 450', 'S 540', '770 S', 'P 320', 'P 410']
-            veiculos_mercedes = ['Accelo', 'Atego', 'Axor', 'Actros']
-
-            # Preços médios do diesel em janeiro de 2026 (R$ por litro)
-            # S10 é ligeiramente mais caro que S500
-            preco_diesel = {
-                'Óleo Diesel S10': (6.20, 6.80),
-                'Óleo Diesel S500': (6.00, 6.60)
-            }
-
-            # Frota fixa de 15 veículos com seus respectivos motoristas
-            frota = []
-            for i in range(15):
-                # Gera nome completo sem títulos
-                nome_completo = f"{fake.first_name()} {fake.last_name()}"
-                placa = fake.license_plate()
-
-                # Alterna entre Scania e Mercedes (60% Scania, 40% Mercedes)
-                if random.random() < 0.6:
-                    marca = 'Scania'
-                    modelo = random.choice(veiculos_scania)
-                else:
-                    marca = 'Mercedes'
-                    modelo = random.choice(veiculos_mercedes)
-
-                veiculo_nome = f"{marca} {modelo}"
-
-                frota.append({
-                    'motorista': nome_completo,
-                    'placa': placa,
-                    'veiculo': veiculo_nome
-                })
-
-            # Data atual para comparação
-            data_atual = datetime.now().date()
-
-            # Data inicial: 1º de março de 2025
-            data_inicio_minima = date(2025, 3, 1)
-
-            # Lista de cidades disponíveis
-            cidades_disponiveis = list(CIDADES_COORDS.keys())
-
-            for _ in range(qtd):
-                # Data início a partir de março/2025
-                data_inicio = fake.date_between(start_date=data_inicio_minima, end_date='today')
-
-                # Define a previsão de término (entre 1 e 10 dias após o início)
-                dias_previsao = random.randint(1, 10)
-                data_previsao_termino = data_inicio + timedelta(days=dias_previsao)
-
-                # Define o término real, que pode ser antes ou depois da previsão
-                # 70% de chance de entregar no prazo ou antes, 30% de atrasar
-                if random.random() < 0.7:
-                    # Entrega no prazo ou antes
-                    dias_duracao = random.randint(1, dias_previsao)
-                else:
-                    # Entrega atrasada
-                    dias_duracao = random.randint(dias_previsao + 1, dias_previsao + 5)
-
-                data_termino = data_inicio + timedelta(days=dias_duracao)
-
-                # Se a data de término for no futuro, deixa em branco
-                if data_termino > data_atual:
-                    data_termino_display = None
-                else:
-                    data_termino_display = data_termino
-
-                # Seleciona um veículo da frota (motorista e placa juntos)
-                veiculo = random.choice(frota)
-
-                # Seleciona cidades origem e destino (diferentes)
-                cidade_origem = random.choice(cidades_disponiveis)
-                cidade_destino = random.choice([c for c in cidades_disponiveis if c != cidade_origem])
-
-                # Coordenadas de origem e destino
-                lat_origem, lon_origem = CIDADES_COORDS[cidade_origem]
-                lat_destino, lon_destino = CIDADES_COORDS[cidade_destino]
-
-                # Calcula distância real entre as cidades
-                distancia_km = calcular_distancia(cidade_origem, cidade_destino)
-
-                # Consumo médio de caminhão: 2.5 a 4 km/litro
-                # Quanto maior a distância, melhor a média (viagens longas em rodovia)
-                if distancia_km > 1000:
-                    consumo_medio = random.uniform(3.2, 4.0)
-                elif distancia_km > 500:
-                    consumo_medio = random.uniform(2.8, 3.5)
-                else:
-                    consumo_medio = random.uniform(2.5, 3.2)
-
-                # Calcula litros necessários (com pequena margem de 5-15% para abastecimentos extras)
-                litros_base = distancia_km / consumo_medio
-                margem = random.uniform(1.05, 1.15)
-                litros_total = round(litros_base * margem, 2)
-
-                # Tipo de combustível (95% S10, 5% S500 para caminhões modernos)
-                combustivel = random.choices(tipos_combustivel, weights=[95, 5])[0]
-
-                # Valor do litro baseado no tipo de combustível
-                preco_min, preco_max = preco_diesel[combustivel]
-                valor_litro = round(random.uniform(preco_min, preco_max), 2)
-
-                dados.append({
-                    'Data Início': data_inicio,
-                    'Previsão Término': data_previsao_termino,
-                    'Data Término': data_termino_display,
-                    'Motorista': veiculo['motorista'],
-                    'Veículo': veiculo['veiculo'],
-                    'Tipo Transporte': random.choice(tipos_transporte),
-                    'Placa Veículo': veiculo['placa'],
-                    'Cidade Origem': cidade_origem,
-                    'Latitude Origem': lat_origem,
-                    'Longitude Origem': lon_origem,
-                    'Cidade Destino': cidade_destino,
-                    'Latitude Destino': lat_destino,
-                    'Longitude Destino': lon_destino,
-                    'Distância (KM)': distancia_km,
-                    'Litros': litros_total,
-                    'Combustível': combustivel,
-                    'Valor do Litro (R$)': valor_litro,
-                    'Valor Mercadoria (R$)': round(random.uniform(1000, 50000), 2)
-                })
-
-        elif subarea == 'Estoque':
-            produtos = ['Teclado', 'Mouse', 'Monitor', 'Cabo HDMI', 'Notebook']
-
-            for _ in range(qtd):
-                dados.append({
-                    'Produto': random.choice(produtos),
-                    'Quantidade': random.randint(10, 500),
-                    'Localização': fake.city(),
-                    'Data Atualização': fake.date_between(start_date='-3M', end_date='today')
-                })
-
-        elif subarea == 'Distribuição':
-            centros = ['SP', 'RJ', 'MG', 'PR', 'RS']
-
-            for _ in range(qtd):
-                dados.append({
-                    'Centro Distribuição': random.choice(centros),
-                    'Pedidos Enviados': random.randint(50, 500),
-                    'Pedidos Pendentes': random.randint(0, 50),
-                    'Data': fake.date_between(start_date='-2M', end_date='today')
-                })
-
-    # ÁREA: FINANCEIRO
-    elif area == 'Financeiro':
-        if subarea == 'Contas a Pagar':
-            categorias = ['Fornecedores', 'Serviços', 'Impostos']
-
-            for _ in range(qtd):
-                dados.append({
-                    'Data Vencimento': fake.date_between(start_date='-1M', end_date='+1M'),
-                    'Fornecedor': fake.company(),
-                    'Categoria': random.choice(categorias),
-                    'Valor (R$)': round(random.uniform(500, 10000), 2),
-                    'Pago': random.choice(['Sim', 'Não'])
-                })
-
-        elif subarea == 'Contas a Receber':
-            clientes = [fake.company() for _ in range(20)]
-
-            for _ in range(qtd):
-                dados.append({
-                    'Data Recebimento': fake.date_between(start_date='-1M', end_date='today'),
-                    'Cliente': random.choice(clientes),
-                    'Nota Fiscal': fake.random_int(1000, 9999),
-                    'Valor (R$)': round(random.uniform(1000, 20000), 2),
-                    'Status': random.choice(['Pago', 'Em Aberto', 'Atrasado'])
-                })
-
-        elif subarea == 'Fluxo de Caixa':
-            tipos = ['Entrada', 'Saída']
-
-            for _ in range(qtd):
-                tipo = random.choice(tipos)
-                valor = random.uniform(500, 10000)
-
-                dados.append({
-                    'Data': fake.date_between(start_date='-2M', end_date='today'),
-                    'Tipo': tipo,
-                    'Descrição': fake.sentence(nb_words=4),
-                    'Valor (R$)': round(valor if tipo == 'Entrada' else -valor, 2)
-                })
-
-    # ÁREA: SLA DE ATENDIMENTO
-    elif area == 'SLA de Atendimento':
-        if subarea == 'Suporte Técnico':
-            for _ in range(qtd):
-                inicio = fake.date_time_between(start_date='-30d', end_date='-1d')
-                fim = inicio + timedelta(minutes=random.randint(15, 240))
-
-                dados.append({
-                    'ID Chamado': fake.uuid4()[:8],
-                    'Cliente': fake.company(),
-                    'Data Abertura': inicio.strftime('%Y-%m-%d %H:%M'),
-                    'Data Fechamento': fim.strftime('%Y-%m-%d %H:%M'),
-                    'Tempo (min)': (fim - inicio).seconds // 60,
-                    'Atendente': fake.first_name(),
-                    'Status': random.choice(['Resolvido', 'Em Andamento', 'Cancelado'])
-                })
-
-        elif subarea == 'Helpdesk':
-            categorias = ['Hardware', 'Software', 'Rede', 'E-mail']
-
-            for _ in range(qtd):
-                dados.append({
-                    'Ticket': fake.uuid4()[:8],
-                    'Usuário': fake.name(),
-                    'Categoria': random.choice(categorias),
-                    'Prioridade': random.choice(['Baixa', 'Média', 'Alta']),
-                    'Status': random.choice(['Fechado', 'Aberto', 'Em Análise'])
-                })
-
-        elif subarea == 'Manutenção':
-            tipos = ['Preventiva', 'Corretiva']
-
-            for _ in range(qtd):
-                dados.append({
-                    'Equipamento': fake.word(),
-                    'Tipo': random.choice(tipos),
-                    'Responsável': fake.name(),
-                    'Data Execução': fake.date_between(start_date='-3M', end_date='today'),
-                    'Custo (R$)': round(random.uniform(300, 8000), 2)
-                })
-
-    return pd.DataFrame(dados)
+# CACHE DOS DADOS GERADOS
+# Chave: (área, subárea, quantidade, semente). Paginação e troca de linhas por página
+# reaproveitam o mesmo DataFrame; só as 8 combinações mais recentes ficam em memória.
+# O DataFrame é compartilhado (sem cópia) e não deve ser alterado. Junto com ele fica
+# o relatório de perfil da geração, exibido no painel "Perfil da geração".
+# O cache guarda a forma compacta (categorias, tipos estreitos); as formas de texto
+# são montadas só para a página exibida e para o CSV.
+# Abaixo dele fica o cache em disco (`gerar_dados_em_cache`), compartilhado entre
+# processos do servidor: uma combinação já gerada por qualquer sessão é só mapeada
+# do arquivo Arrow, sem gerar de novo nem copiar as colunas numéricas.
+@st.cache_resource(max_entries=8, show_spinner='Gerando dados...')
+def carregar_dados(area, subarea, qtd, seed, nativo=False, compacto=True):
+    with perfilar() as perfil:
+        df = gerar_dados_em_cache(area, qtd, subarea, seed=seed, nativo=nativo, compacto=compacto)
+    return df, perfil.relatorio()
 
 # EXECUÇÃO E EXIBIÇÃO
-df = gerar_dados(area, qtd, subarea)
+# Conjuntos virtuais ou grandes demais para a memória são paginados sob demanda
+paginado = virtual or qtd > LIMITE_EM_MEMORIA
+if paginado:
+    df = None
+    total_linhas = qtd
+else:
+    df, relatorio_perfil = carregar_dados(area, subarea, qtd, st.session_state.seed)
+    total_linhas = len(df)
 
 # PAGINAÇÃO
 st.markdown("---")
@@ -515,12 +123,15 @@ with col_pag2:
     )
 
 # Calcula total de páginas
-total_paginas = (len(df) - 1) // linhas_por_pagina + 1
+total_paginas = (total_linhas - 1) // linhas_por_pagina + 1
 
 # Controle de página
 if 'pagina_atual' not in st.session_state:
     st.session_state.pagina_atual = 1
 
+# Mantém a página dentro do limite quando a quantidade de linhas diminui
+st.session_state.pagina_atual = min(st.session_state.pagina_atual, total_paginas)
+
 col_nav1, col_nav2, col_nav3, col_nav4, col_nav5 = st.columns([1, 1, 2, 1, 1])
 
 with col_nav1:
@@ -544,17 +155,165 @@ with col_nav5:
     if st.button('Última ⏭️', use_container_width=True):
         st.session_state.pagina_atual = total_paginas
 
+# No conjunto paginado, permite saltar direto para qualquer página
+if paginado:
+    st.number_input('🔢 Ir para a página:', min_value=1, max_value=total_paginas, key='pagina_atual')
+
 # Determina o intervalo de linhas para exibição
 inicio = (st.session_state.pagina_atual - 1) * linhas_por_pagina
-fim = inicio + linhas_por_pagina
-
-st.dataframe(df.iloc[inicio:fim])
-
-# Download do CSV
-csv = df.to_csv(index=False).encode('utf-8')
-st.download_button(
-    label="⬇️ Baixar CSV",
-    data=csv,
-    file_name="dados_sinteticos.csv",
-    mime="text/csv"
-)
+fim = min(inicio + linhas_por_pagina, total_linhas)
+
+if paginado:
+    # Gera só as linhas da página, idênticas à mesma fatia do conjunto completo
+    with perfilar() as perfil:
+        try:
+            pagina = gerar_linhas(area, inicio, fim, subarea, seed=st.session_state.seed)
+        except ValueError as erro:
+            # Ex.: formato de chave alterado para menos valores que as linhas da página
+            pagina = None
+            st.error(f'Não foi possível gerar a página: {erro}')
+    relatorio_perfil = perfil.relatorio()
+    if pagina is not None:
+        st.dataframe(pagina)
+else:
+    st.dataframe(como_exibicao(df.iloc[inicio:fim]))
+
+# DOWNLOAD
+# Formato exibido -> (formato, compressão, nome do arquivo, tipo MIME)
+FORMATOS_DOWNLOAD = {
+    'CSV': ('csv', None, 'dados_sinteticos.csv', 'text/csv'),
+    'CSV (gzip)': ('csv', 'gzip', 'dados_sinteticos.csv.gz', 'application/gzip'),
+    'CSV (zip)': ('csv', 'zip', 'dados_sinteticos.csv.zip', 'application/zip'),
+    'Parquet': ('parquet', 'zstd', 'dados_sinteticos.parquet', 'application/vnd.apache.parquet'),
+    'Feather (Arrow)': ('feather', 'zstd', 'dados_sinteticos.feather', 'application/vnd.apache.arrow.file'),
+}
+
+formato_download = st.selectbox('💾 Formato do arquivo:', list(FORMATOS_DOWNLOAD), key='formato_download')
+formato, compressao, nome_arquivo, mime = FORMATOS_DOWNLOAD[formato_download]
+
+def formatar_bytes(tamanho):
+    for unidade in ('B', 'KiB', 'MiB', 'GiB'):
+        if tamanho < 1024 or unidade == 'GiB':
+            return f'{tamanho:.0f} {unidade}' if unidade == 'B' else f'{tamanho:.1f} {unidade}'
+        tamanho /= 1024
+
+# Tamanho aproximado do arquivo, extrapolado de uma amostra com a mesma forma do download
+@st.cache_data(max_entries=32, show_spinner=False)
+def estimar_download(area, subarea, qtd, seed, formato, compressao):
+    amostra = gerar_linhas(area, 0, min(qtd, LINHAS_AMOSTRA), subarea, seed=seed, nativo=formato != 'csv')
+    return estimar_tamanho(amostra, qtd, formato, compressao=compressao)
+
+def formatar_duracao(segundos):
+    """Duração como 'M:SS' ou 'H:MM:SS'"""
+    minutos, segundos = divmod(int(segundos), 60)
+    horas, minutos = divmod(minutos, 60)
+    return f'{horas}:{minutos:02d}:{segundos:02d}' if horas else f'{minutos}:{segundos:02d}'
+
+# GERAÇÃO EM SEGUNDO PLANO
+# Conjuntos paginados são gravados em arquivo por uma thread (`iniciar_tarefa`). A tarefa
+# fica na sessão e sobrevive às reexecuções do script; enquanto ela roda, só este painel
+# se atualiza a cada segundo e o resto da página continua interativo. O arquivo é
+# apagado quando a sessão termina (ou, se ela não for encerrada, após `TEMPO_VIDA`).
+tarefa = st.session_state.get('tarefa')
+acompanhando = tarefa is not None and tarefa.ativa
+
+@st.fragment(run_every=1.0 if acompanhando else None)
+def painel_tarefa():
+    tarefa = st.session_state.get('tarefa')
+    parametros = (area, subarea, qtd, st.session_state.seed, formato_download)
+
+    if acompanhando and not tarefa.ativa:
+        # Terminou: reexecuta o script inteiro, que para a atualização periódica do
+        # painel e já mostra o resultado
+        st.rerun()
+
+    if tarefa is not None and tarefa.ativa:
+        progresso = tarefa.progresso()
+        restante = progresso['segundos_restantes']
+        st.progress(
+            progresso['fracao'],
+            text=(f"{progresso['linhas']:,} de {progresso['total']:,} linhas · "
+                  f"{progresso['linhas_por_segundo']:,.0f} linhas/s · "
+                  f"faltam {formatar_duracao(restante) if restante is not None else '...'}"),
+        )
+        if st.button('⏹️ Cancelar', use_container_width=True):
+            tarefa.cancelar()
+            tarefa.aguardar()
+            st.rerun()
+        return
+
+    if tarefa is not None and st.session_state.get('tarefa_parametros') == parametros:
+        progresso = tarefa.progresso()
+        if tarefa.estado == 'concluida' and not os.path.exists(tarefa.caminho):
+            st.info('O arquivo gerado expirou; gere novamente para baixar.')
+        elif tarefa.estado == 'concluida':
+            st.success(f"{progresso['linhas']:,} linhas geradas em {formatar_duracao(progresso['segundos'])}.")
+            # O arquivo só é lido quando o botão é clicado
+            st.download_button(
+                label=f"⬇️ Baixar {formato_download} ({formatar_bytes(os.path.getsize(tarefa.caminho))})",
+                data=lambda caminho=tarefa.caminho: Path(caminho).read_bytes(),
+                file_name=nome_arquivo,
+                mime=mime,
+                use_container_width=True
+            )
+            return
+        elif tarefa.estado == 'cancelada':
+            st.warning(f"Geração cancelada após {progresso['linhas']:,} linhas.")
+        else:
+            st.error(f'Falha na geração: {tarefa.erro}')
+
+    if qtd > MAX_LINHAS:
+        # Só o conjunto virtual passa de MAX_LINHAS; o arquivo gravado no servidor não
+        st.info(f'O arquivo para download tem no máximo {MAX_LINHAS:,} linhas; '
+                'para o conjunto completo, use a linha de comando abaixo.')
+        return
+
+    if st.button(f'🚀 Gerar {qtd:,} linhas em segundo plano', use_container_width=True):
+        if tarefa is not None:
+            tarefa.descartar()
+        st.session_state.tarefa = iniciar_tarefa(
+            area, qtd, subarea, seed=st.session_state.seed, formato=formato, compressao=compressao,
+            nome_arquivo=nome_arquivo
+        )
+        st.session_state.tarefa_parametros = parametros
+        st.rerun()
+
+if paginado:
+    painel_tarefa()
+    if virtual:
+        # Alternativa sem o servidor do Streamlit, com vários processos
+        comando = f"python -m gerador_dados '{area}'"
+        if subarea:
+            comando += f" --subarea '{subarea}'"
+        comando += f" -n {qtd} --seed {st.session_state.seed} --workers 0 -o {nome_arquivo}"
+        st.caption('Também é possível exportar o conjunto completo pela linha de comando:')
+        st.code(comando, language='bash')
+else:
+    # O arquivo só é montado quando o botão é clicado (numa thread à parte), parte a
+    # parte direto no compressor, sem a cópia inteira do CSV em texto e em bytes
+    seed = st.session_state.seed
+    nome_membro = nome_arquivo.removesuffix('.zip')
+
+    def dados_download():
+        if formato == 'csv':
+            partes = (como_exibicao(df.iloc[i:i + LINHAS_POR_PARTE]) for i in range(0, len(df), LINHAS_POR_PARTE))
+        else:
+            # Mesma semente, mas com datas nativas para Parquet/Arrow
+            partes = [gerar_dados_em_cache(area, qtd, subarea, seed=seed, nativo=True)]
+        return b''.join(exportar_em_partes(partes, formato, compressao=compressao, nome_membro=nome_membro))
+
+    tamanho = estimar_download(area, subarea, qtd, seed, formato, compressao)
+    st.download_button(
+        label=f"⬇️ Baixar {formato_download} (~{formatar_bytes(tamanho)})",
+        data=dados_download,
+        file_name=nome_arquivo,
+        mime=mime
+    )
+
+# PERFIL DA GERAÇÃO
+# Tempo e chamadas por etapa/provedor da última geração (tempos inclusivos)
+with st.expander('⏱️ Perfil da geração'):
+    st.markdown(f"**Tempo total:** {relatorio_perfil['segundos_total'] * 1000:.1f} ms")
+    if df is not None:
+        st.markdown(f"**Memória do DataFrame (compacto):** {df.memory_usage(deep=True).sum() / 1024:.1f} KiB")
+    st.dataframe(relatorio_perfil['chamadas'], use_container_width=True)
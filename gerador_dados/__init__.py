@@ -0,0 +1,61 @@
+"""Gerador de dados sintéticos por área/subárea.
+
+Os submódulos (e com eles pandas, Faker e geopy) só são importados quando
+um nome é usado pela primeira vez, então `import gerador_dados` é rápido.
+"""
+from importlib import import_module
+
+from .areas import AREAS
+
+__version__ = '1.0.0'
+
+# Nome público -> submódulo que o define
+_EXPORTS = {
+    'CacheDados': 'cache',
+    'gerar_dados_em_cache': 'cache',
+    'CIDADES_COORDS': 'cidades',
+    'adicionar_cidade': 'cidades',
+    'calcular_distancia': 'cidades',
+    'como_exibicao': 'compacto',
+    'comparar_memoria': 'compacto',
+    'Coluna': 'esquemas',
+    'Esquema': 'esquemas',
+    'registrar_area': 'esquemas',
+    'estimar_tamanho': 'exportacao',
+    'exportar_bytes': 'exportacao',
+    'exportar_em_partes': 'exportacao',
+    'gravar_blocos': 'exportacao',
+    'gravar_em_arquivo': 'exportacao',
+    'FormatoId': 'ids',
+    'definir_formato_id': 'ids',
+    'Incremental': 'incremental',
+    'gravar_incremental': 'incremental',
+    'gerar_dados': 'motor',
+    'gerar_em_blocos': 'motor',
+    'gerar_linhas': 'motor',
+    'limite_linhas': 'motor',
+    'gerar_dados_paralelo': 'paralelo',
+    'gerar_em_blocos_paralelo': 'paralelo',
+    'EsquemaEstrela': 'relacional',
+    'gerar_esquema': 'relacional',
+    'Perfil': 'perfil',
+    'perfilar': 'perfil',
+    'Servico': 'servico',
+    'servir': 'servico',
+    'Tarefa': 'tarefas',
+    'iniciar_tarefa': 'tarefas',
+    'Sazonalidade': 'temporal',
+    'definir_sazonalidade': 'temporal',
+}
+
+__all__ = ['AREAS', *_EXPORTS]
+
+def __getattr__(nome):
+    if nome not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(import_module(f'.{_EXPORTS[nome]}', __name__), nome)
+    globals()[nome] = valor
+    return valor
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
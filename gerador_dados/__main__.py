@@ -0,0 +1,156 @@
+"""Linha de comando: python -m gerador_dados AREA [--subarea ...] --linhas N --saida ARQUIVO
+
+Não importa o Streamlit; pandas, Faker e geopy só são carregados quando a
+geração começa.
+"""
+import argparse
+import json
+import sys
+import time
+from contextlib import nullcontext
+from datetime import date
+
+from .areas import AREAS
+from .exportacao import FORMATOS, FORMATOS_BANCO, FORMATOS_NATIVOS, deduzir_formato
+
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m gerador_dados',
+        description='Gera dados sintéticos por área/subárea direto em arquivo.',
+    )
+    parser.add_argument('area', nargs='?', help='área a gerar (ex.: Vendas, Logística)')
+    parser.add_argument('--subarea', help='subárea, obrigatória nas áreas que têm subáreas')
+    parser.add_argument('-n', '--linhas', type=int, default=1000, help='quantidade de linhas (padrão: 1000)')
+    parser.add_argument('--seed', type=int, help='semente para resultados reprodutíveis')
+    parser.add_argument('-o', '--saida', help='arquivo de saída')
+    parser.add_argument('-f', '--formato', choices=FORMATOS,
+                        help='formato de saída (padrão: deduzido da extensão, senão csv)')
+    parser.add_argument('--compressao',
+                        help='codec: gzip/bz2/xz/zstd no CSV, NDJSON e SQL (padrão: pela extensão, ex. .csv.gz), '
+                             'snappy/zstd/gzip/brotli/lz4/none no Parquet, lz4/zstd/uncompressed no Feather')
+    parser.add_argument('--nivel-compressao', type=int, help='nível de compressão do codec')
+    parser.add_argument('--linhas-por-grupo', type=int,
+                        help='linhas por row group (Parquet), record batch (Feather/Arrow) '
+                             'ou transação (SQLite/DuckDB/SQL)')
+    parser.add_argument('--tabela',
+                        help='tabela criada em .sqlite/.duckdb/.sql (padrão: nome da área, ex. logistica_transporte)')
+    parser.add_argument('--indice', action='append', default=[], metavar='COLUNAS',
+                        help='cria um índice depois da carga; colunas separadas por vírgula (repetível)')
+    parser.add_argument('--bloco', type=int, default=100_000, help='linhas por bloco (padrão: 100000)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='processos em paralelo; 0 usa todos os núcleos (padrão: 1)')
+    parser.add_argument('--compacto', action='store_true',
+                        help='colunas categóricas, datas nativas, Desconto numérico e tipos numéricos estreitos')
+    parser.add_argument('--perfil', action='store_true',
+                        help='mede tempo e chamadas por etapa/provedor e imprime o relatório no stderr')
+    parser.add_argument('--perfil-memoria', action='store_true',
+                        help='com --perfil, registra também alocações por área (tracemalloc; mais lento)')
+    parser.add_argument('--perfil-json', help='com --perfil, grava o relatório estruturado neste arquivo JSON')
+    parser.add_argument('--incremental', metavar='CHECKPOINT',
+                        help='atualiza .sqlite/.duckdb só com os dias novos e as linhas que mudaram, '
+                             'guardando o estado neste arquivo JSON (Vendas e Logística/Transporte)')
+    parser.add_argument('--linhas-por-dia', type=int, default=1000,
+                        help='com --incremental, linhas geradas por dia (padrão: 1000)')
+    parser.add_argument('--hoje', type=date.fromisoformat, metavar='AAAA-MM-DD',
+                        help='com --incremental, data até a qual atualizar (padrão: hoje)')
+    parser.add_argument('--listar', action='store_true', help='lista as áreas e subáreas e sai')
+    return parser
+
+def validar(parser, args):
+    if args.listar:
+        return
+    if args.area is None or args.saida is None:
+        parser.error('informe a área e --saida (ou use --listar)')
+    if args.area not in AREAS:
+        parser.error(f"área inválida: {args.area!r} (opções: {', '.join(AREAS)})")
+    subareas = AREAS[args.area]
+    if subareas and args.subarea not in subareas:
+        parser.error(f"a área {args.area!r} exige --subarea entre: {', '.join(subareas)}")
+    if not subareas and args.subarea is not None:
+        parser.error(f"a área {args.area!r} não tem subáreas")
+    if (args.perfil_memoria or args.perfil_json) and not args.perfil:
+        parser.error('--perfil-memoria e --perfil-json exigem --perfil')
+    if args.linhas < 0 or args.bloco <= 0:
+        parser.error('--linhas deve ser >= 0 e --bloco deve ser > 0')
+    formato, compressao = deduzir_formato(args.saida)
+    if args.formato is None:
+        args.formato = formato
+    if args.compressao is None and args.formato == formato:
+        args.compressao = compressao
+    if args.incremental and args.formato not in ('sqlite', 'duckdb'):
+        parser.error('--incremental grava em .sqlite ou .duckdb')
+
+def main(argv=None):
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+    validar(parser, args)
+
+    if args.listar:
+        for area, subareas in AREAS.items():
+            print(area)
+            for subarea in subareas:
+                print(f'  {subarea}')
+        return 0
+
+    if args.incremental:
+        try:
+            return atualizar_incremental(args)
+        except ValueError as erro:
+            parser.exit(1, f'erro: {erro}\n')
+
+    from .exportacao import gravar_blocos
+    from .perfil import perfilar
+
+    # Parquet/Arrow e bancos recebem datas como datetime64 para gravar tipos nativos
+    nativo = args.formato in FORMATOS_NATIVOS
+    if args.workers == 1:
+        from .motor import gerar_em_blocos
+
+        blocos = gerar_em_blocos(args.area, args.linhas, args.subarea, seed=args.seed,
+                                 tamanho_bloco=args.bloco, nativo=nativo, compacto=args.compacto)
+    else:
+        from .paralelo import gerar_em_blocos_paralelo
+
+        blocos = gerar_em_blocos_paralelo(args.area, args.linhas, args.subarea, seed=args.seed,
+                                          tamanho_bloco=args.bloco, workers=args.workers or None,
+                                          nativo=nativo, compacto=args.compacto)
+
+    opcoes_banco = {}
+    if args.formato in FORMATOS_BANCO:
+        from .bancos import nome_tabela
+
+        opcoes_banco = {
+            'tabela': args.tabela or nome_tabela(args.area, args.subarea),
+            'indices': [indice.split(',') for indice in args.indice],
+        }
+
+    inicio = time.perf_counter()
+    with perfilar(args.perfil_memoria) if args.perfil else nullcontext() as perfil:
+        total = gravar_blocos(blocos, args.saida, args.formato, compressao=args.compressao,
+                              nivel_compressao=args.nivel_compressao,
+                              linhas_por_grupo=args.linhas_por_grupo, **opcoes_banco)
+    duracao = time.perf_counter() - inicio
+    print(f'{total} linhas gravadas em {args.saida} ({duracao:.2f}s)', file=sys.stderr)
+
+    if perfil is not None:
+        print(perfil.texto(), file=sys.stderr)
+        if args.perfil_json:
+            with open(args.perfil_json, 'w', encoding='utf-8') as arquivo:
+                json.dump(perfil.relatorio(), arquivo, ensure_ascii=False, indent=2)
+    return 0
+
+def atualizar_incremental(args):
+    from .incremental import gravar_incremental
+
+    inicio = time.perf_counter()
+    novas, alteradas = gravar_incremental(
+        args.incremental, args.saida, args.area, args.subarea, seed=args.seed,
+        linhas_por_dia=args.linhas_por_dia, formato=args.formato, tabela=args.tabela, hoje=args.hoje,
+        compacto=args.compacto, linhas_por_transacao=args.linhas_por_grupo,
+    )
+    duracao = time.perf_counter() - inicio
+    print(f'{novas} linhas novas e {alteradas} atualizadas em {args.saida} ({duracao:.2f}s)', file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
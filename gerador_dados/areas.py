@@ -0,0 +1,12 @@
+"""Áreas e subáreas disponíveis para geração (novas áreas entram por `esquemas.registrar_area`)"""
+
+# ÁREA E SUBÁREA
+AREAS = {
+    'Vendas': [],
+    'Saúde': [],
+    'RH': [],
+    'Fornecedores': [],
+    'Logística': ['Transporte', 'Estoque', 'Distribuição'],
+    'Financeiro': ['Contas a Pagar', 'Contas a Receber', 'Fluxo de Caixa'],
+    'SLA de Atendimento': ['Suporte Técnico', 'Helpdesk', 'Manutenção']
+}
@@ -0,0 +1,308 @@
+"""Carga direta em bancos: SQLite, DuckDB e `COPY` de texto do PostgreSQL.
+
+Os blocos de `gerar_em_blocos` são inseridos assim que chegam, em transações
+de `linhas_por_transacao` linhas, sem passar por um CSV intermediário. A
+tabela é criada com DDL derivado dos tipos das colunas do primeiro bloco, e
+os índices pedidos em `indices` (e, ao anexar, os que a tabela já tinha) só
+são criados depois da carga.
+
+Para o PostgreSQL (e bancos compatíveis) é gerado um script com `CREATE TABLE`,
+`COPY ... FROM stdin` e os dados no formato de texto do `COPY`, que pode ser
+enviado direto ao `psql` (ex.: `psql -f vendas.sql` ou `zcat vendas.sql.gz | psql`).
+"""
+import re
+import unicodedata
+
+# pandas e numpy só são importados nas funções de carga, para que `exportacao`
+# (e a linha de comando) possam ler `FORMATOS_BANCO` sem carregá-los
+FORMATOS_BANCO = ('sqlite', 'duckdb', 'sql')
+
+# Linhas por transação, quando não informado
+LINHAS_POR_TRANSACAO = 100_000
+
+def nome_tabela(area, subarea=None):
+    """Nome de tabela sem acentos nem espaços (ex.: 'logistica_transporte')"""
+    texto = f'{area} {subarea}' if subarea else area
+    texto = unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^0-9a-z]+', '_', texto.lower()).strip('_')
+
+def citar(nome):
+    """Identificador SQL entre aspas duplas (colunas como "Nº Vezes")"""
+    return '"' + str(nome).replace('"', '""') + '"'
+
+# DDL
+def tipo_sql(serie, colunas_data=()):
+    """Tipo SQL (comum a SQLite, DuckDB e PostgreSQL) de uma coluna do DataFrame"""
+    import pandas as pd
+
+    dtype = serie.dtype
+    if serie.name in colunas_data:
+        return 'DATE'
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'BOOLEAN'
+    if pd.api.types.is_integer_dtype(dtype):
+        return {1: 'SMALLINT', 2: 'SMALLINT', 4: 'INTEGER'}.get(dtype.itemsize, 'BIGINT')
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL' if dtype.itemsize == 4 else 'DOUBLE PRECISION'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'TIMESTAMP'
+    return 'TEXT'
+
+def ddl(bloco, tabela):
+    """`CREATE TABLE` com uma coluna por coluna do DataFrame"""
+    colunas_data = bloco.attrs.get('colunas_data', ())
+    definicoes = ',\n'.join(
+        f'    {citar(nome)} {tipo_sql(bloco[nome], colunas_data)}' for nome in bloco.columns
+    )
+    return f'CREATE TABLE {citar(tabela)} (\n{definicoes}\n)'
+
+def ddl_indices(tabela, indices, unico=False):
+    """`CREATE INDEX` (ou `CREATE UNIQUE INDEX`) para cada coluna (ou tupla de colunas) de `indices`"""
+    comandos = []
+    for colunas in indices:
+        colunas = (colunas,) if isinstance(colunas, str) else tuple(colunas)
+        nome = nome_tabela(f"ix {tabela} {' '.join(colunas)}")
+        comandos.append(
+            f"CREATE {'UNIQUE ' if unico else ''}INDEX {citar(nome)} ON {citar(tabela)} "
+            f"({', '.join(citar(c) for c in colunas)})"
+        )
+    return comandos
+
+# SQLITE
+def gravar_sqlite(blocos, caminho, tabela='dados', indices=(), linhas_por_transacao=None,
+                  substituir=True, desativar_indices=True, chave=None):
+    """Insere os blocos na tabela `tabela` do arquivo SQLite `caminho` e devolve o total de linhas.
+
+    Com `substituir=False` anexa a uma tabela existente; com
+    `desativar_indices=True` os índices dela são removidos durante a carga e
+    recriados no fim. `chave` é uma coluna de valores únicos: ganha um índice
+    UNIQUE e, ao anexar, as linhas com chave já presente são substituídas, então
+    repetir uma carga interrompida não duplica linhas.
+    """
+    import sqlite3
+
+    conexao = sqlite3.connect(caminho, isolation_level=None)
+    try:
+        if substituir:
+            # Carga em massa numa tabela nova: sem fsync a cada transação. Ao anexar
+            # ficam os padrões do SQLite, para uma falha não corromper o histórico
+            conexao.execute('PRAGMA synchronous = OFF')
+            conexao.execute('PRAGMA journal_mode = MEMORY')
+        existentes = []
+        if not substituir and desativar_indices and chave is None:
+            existentes = _indices_sqlite(conexao, tabela)
+        comando = 'INSERT OR REPLACE' if chave is not None and not substituir else 'INSERT'
+        return _carregar(
+            conexao, blocos, tabela, indices, existentes, linhas_por_transacao, substituir, chave,
+            inserir=lambda bloco: conexao.executemany(
+                f"{comando} INTO {citar(tabela)} VALUES ({', '.join('?' * bloco.shape[1])})",
+                _linhas_python(bloco),
+            ),
+        )
+    finally:
+        conexao.close()
+
+def _indices_sqlite(conexao, tabela):
+    return conexao.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (tabela,),
+    ).fetchall()
+
+# DUCKDB
+def gravar_duckdb(blocos, caminho, tabela='dados', indices=(), linhas_por_transacao=None,
+                  substituir=True, desativar_indices=True, chave=None):
+    """Como `gravar_sqlite`, num arquivo DuckDB (os blocos entram direto do DataFrame)"""
+    try:
+        import duckdb
+    except ImportError as erro:
+        raise ImportError("A carga em DuckDB requer o pacote 'duckdb'") from erro
+
+    conexao = duckdb.connect(str(caminho))
+    try:
+        existentes = []
+        if not substituir and desativar_indices and chave is None:
+            existentes = conexao.execute(
+                'SELECT index_name, sql FROM duckdb_indexes() WHERE table_name = ?', [tabela]
+            ).fetchall()
+        comando = 'INSERT OR REPLACE' if chave is not None and not substituir else 'INSERT'
+
+        def inserir(bloco):
+            conexao.register('_bloco', bloco)
+            conexao.execute(f'{comando} INTO {citar(tabela)} SELECT * FROM _bloco')
+            conexao.unregister('_bloco')
+
+        return _carregar(conexao, blocos, tabela, indices, existentes, linhas_por_transacao,
+                         substituir, chave, inserir)
+    finally:
+        conexao.close()
+
+def _carregar(conexao, blocos, tabela, indices, existentes, linhas_por_transacao, substituir, chave, inserir):
+    """Laço comum de SQLite e DuckDB: DDL, inserção em transações e índices no fim"""
+    linhas_por_transacao = linhas_por_transacao or LINHAS_POR_TRANSACAO
+    for nome, _ in existentes:
+        conexao.execute(f'DROP INDEX {citar(nome)}')
+
+    total = 0
+    pendentes = 0
+    criada = not substituir
+    conexao.execute('BEGIN')
+    for bloco in blocos:
+        if not criada:
+            conexao.execute(f'DROP TABLE IF EXISTS {citar(tabela)}')
+            conexao.execute(ddl(bloco, tabela))
+            criada = True
+        inserir(bloco)
+        total += len(bloco)
+        pendentes += len(bloco)
+        if pendentes >= linhas_por_transacao:
+            conexao.execute('COMMIT')
+            conexao.execute('BEGIN')
+            pendentes = 0
+    conexao.execute('COMMIT')
+
+    comandos = [sql for _, sql in existentes] + ddl_indices(tabela, indices)
+    if chave is not None and substituir:
+        # Ao anexar, o índice único já existe e recebe as linhas pelo upsert
+        comandos += ddl_indices(tabela, [chave], unico=True)
+    for comando in comandos:
+        conexao.execute(comando)
+    return total
+
+def _linhas_python(bloco):
+    """Tuplas de valores Python (datas em ISO, nulos como None) para `executemany`"""
+    import numpy as np
+    import pandas as pd
+
+    colunas_data = bloco.attrs.get('colunas_data', ())
+    colunas = []
+    for nome in bloco.columns:
+        serie = bloco[nome]
+        if pd.api.types.is_datetime64_any_dtype(serie.dtype):
+            valores = _datas_texto(serie, nome in colunas_data)
+            valores[serie.isna().to_numpy()] = None
+            valores = valores.tolist()
+        elif pd.api.types.is_numeric_dtype(serie.dtype) and not serie.isna().any():
+            valores = serie.to_numpy()
+            if valores.dtype == np.float32:
+                # Menor texto que representa o float32 (557.56, não 557.5599975585938)
+                valores = valores.astype(str).astype(np.float64)
+            valores = valores.tolist()
+        else:
+            valores = serie.astype(object).where(serie.notna(), None).tolist()
+        colunas.append(valores)
+    return zip(*colunas)
+
+def _datas_texto(serie, so_data):
+    """Datas como 'AAAA-MM-DD' ou instantes como 'AAAA-MM-DD HH:MM:SS' (array de objetos)"""
+    import numpy as np
+
+    unidade = 'D' if so_data else 's'
+    valores = np.datetime_as_string(serie.to_numpy().astype(f'datetime64[{unidade}]'), unit=unidade)
+    if len(valores) == 0:
+        # np.char.replace falha em arrays vazios
+        return valores.astype(object)
+    return np.char.replace(valores, 'T', ' ').astype(object)
+
+# POSTGRESQL (COPY EM TEXTO)
+# Caracteres que o formato de texto do COPY exige escapar
+_ESCAPES_COPY = {'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'}
+_NULO_COPY = '\\N'
+
+def gravar_copy(blocos, caminho, tabela='dados', indices=(), linhas_por_transacao=None,
+                compressao=None, nivel_compressao=None, substituir=True):
+    """Grava um script SQL com DDL e `COPY ... FROM stdin` para PostgreSQL e compatíveis.
+
+    Cada grupo de `linhas_por_transacao` linhas vira um `COPY` próprio numa
+    transação própria; os índices são criados no fim do script.
+    """
+    from .exportacao import _abrir_texto
+
+    linhas_por_transacao = linhas_por_transacao or LINHAS_POR_TRANSACAO
+    total = 0
+    pendentes = 0
+    comando_copy = None
+    with _abrir_texto(caminho, compressao, nivel_compressao) as arquivo:
+        for bloco in blocos:
+            if comando_copy is None:
+                if substituir:
+                    arquivo.write(f'DROP TABLE IF EXISTS {citar(tabela)};\n{ddl(bloco, tabela)};\n\n')
+                colunas = ', '.join(citar(nome) for nome in bloco.columns)
+                comando_copy = f'BEGIN;\nCOPY {citar(tabela)} ({colunas}) FROM stdin;\n'
+                arquivo.write(comando_copy)
+            elif pendentes >= linhas_por_transacao:
+                arquivo.write('\\.\nCOMMIT;\n' + comando_copy)
+                pendentes = 0
+            arquivo.writelines(_linhas_copy(bloco))
+            total += len(bloco)
+            pendentes += len(bloco)
+        if comando_copy is not None:
+            arquivo.write('\\.\nCOMMIT;\n')
+        for comando in ddl_indices(tabela, indices):
+            arquivo.write(f'{comando};\n')
+    return total
+
+def _linhas_copy(bloco):
+    """Linhas do bloco no formato de texto do COPY (tabulações, \\N para nulos)"""
+    import numpy as np
+    import pandas as pd
+
+    colunas_data = bloco.attrs.get('colunas_data', ())
+    colunas = []
+    for nome in bloco.columns:
+        serie = bloco[nome]
+        nulos = serie.isna().to_numpy()
+        if pd.api.types.is_datetime64_any_dtype(serie.dtype):
+            valores = _datas_texto(serie, nome in colunas_data)
+        elif pd.api.types.is_bool_dtype(serie.dtype):
+            valores = np.where(serie.to_numpy(), 't', 'f').astype(object)
+        elif pd.api.types.is_numeric_dtype(serie.dtype):
+            valores = serie.to_numpy().astype(str).astype(object)
+        else:
+            texto = serie.astype(object).where(~nulos, '').astype(str)
+            if texto.str.contains(r'[\\\t\n\r]', regex=True).any():
+                texto = texto.str.replace(r'[\\\t\n\r]', lambda m: _ESCAPES_COPY[m.group(0)], regex=True)
+            valores = texto.to_numpy(dtype=object)
+        valores[nulos] = _NULO_COPY
+        colunas.append(valores)
+    return ('\t'.join(linha) + '\n' for linha in zip(*colunas))
+
+# ATUALIZAÇÃO DE LINHAS
+def atualizar_sqlite(caminho, tabela, alteradas, chave='Linha'):
+    """Grava as colunas de `alteradas` nas linhas cuja coluna `chave` é o índice do DataFrame"""
+    import sqlite3
+
+    if alteradas.empty:
+        return 0
+    dados = alteradas.copy()
+    dados[chave] = alteradas.index.to_numpy()
+    atribuicoes = ', '.join(f'{citar(nome)} = ?' for nome in alteradas.columns)
+    conexao = sqlite3.connect(caminho)
+    try:
+        with conexao:
+            conexao.executemany(
+                f'UPDATE {citar(tabela)} SET {atribuicoes} WHERE {citar(chave)} = ?',
+                _linhas_python(dados),
+            )
+    finally:
+        conexao.close()
+    return len(alteradas)
+
+def atualizar_duckdb(caminho, tabela, alteradas, chave='Linha'):
+    """Como `atualizar_sqlite`, num arquivo DuckDB"""
+    import duckdb
+
+    if alteradas.empty:
+        return 0
+    dados = alteradas.copy()
+    dados[chave] = alteradas.index.to_numpy()
+    atribuicoes = ', '.join(f'{citar(nome)} = _bloco.{citar(nome)}' for nome in alteradas.columns)
+    conexao = duckdb.connect(str(caminho))
+    try:
+        conexao.register('_bloco', dados)
+        conexao.execute(
+            f'UPDATE {citar(tabela)} SET {atribuicoes} FROM _bloco '
+            f'WHERE {citar(tabela)}.{citar(chave)} = _bloco.{citar(chave)}'
+        )
+    finally:
+        conexao.close()
+    return len(alteradas)
@@ -0,0 +1,194 @@
+"""Benchmark de geração: python -m gerador_dados.benchmark [--linhas ...] [--saida arquivo.json]
+
+Para cada área/subárea de `AREAS` e cada quantidade de linhas mede linhas por
+segundo, tempo de sorteio das colunas e de montagem do DataFrame, pico de
+memória (RSS) e tempo/tamanho de serialização por formato. Cada caso roda num
+processo novo, para que o pico de memória de um não contamine o outro.
+
+Com `--referencia`, compara com um JSON anterior e termina com código 1 se a
+vazão de algum caso cair mais que `--tolerancia`.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+from multiprocessing import get_context
+
+from .areas import AREAS
+
+LINHAS_PADRAO = (1_000, 100_000, 1_000_000)
+FORMATOS_PADRAO = ('csv', 'csv.gz', 'parquet', 'feather')
+
+def casos(areas=None):
+    """Pares (área, subárea) do benchmark, na ordem de `AREAS`"""
+    for area, subareas in AREAS.items():
+        if areas and area not in areas:
+            continue
+        for subarea in subareas or [None]:
+            yield area, subarea
+
+def _pico_rss_mb():
+    import resource
+
+    # ru_maxrss é em KiB no Linux e em bytes no macOS
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+def medir_caso(area, subarea, linhas, formatos, repeticoes=1, seed=0):
+    """Mede um caso no processo atual e devolve um dicionário de resultados"""
+    import tempfile
+    from pathlib import Path
+
+    import pandas as pd
+
+    from .contador import GeradorContador, chave_linhas
+    from .exportacao import deduzir_formato, gravar_blocos
+    from .motor import gerar_colunas, preparar_contexto, semente_raiz
+
+    # Aquecimento: pools do Faker e matriz de distâncias ficam fora da medição
+    raiz = semente_raiz(seed)
+    contexto = preparar_contexto(area, subarea, raiz)
+    gerar_colunas(area, 10, subarea, GeradorContador(chave_linhas(raiz, area, subarea), 0, 10), contexto)
+    rss_inicial = _pico_rss_mb()
+
+    melhor = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        rng = GeradorContador(chave_linhas(raiz, area, subarea), 0, linhas)
+        colunas = gerar_colunas(area, linhas, subarea, rng, contexto)
+        meio = time.perf_counter()
+        df = pd.DataFrame(colunas)
+        fim = time.perf_counter()
+        if melhor is None or fim - inicio < melhor[0]:
+            melhor = (fim - inicio, meio - inicio, fim - meio)
+        del colunas
+    segundos, segundos_colunas, segundos_dataframe = melhor
+    pico_geracao = _pico_rss_mb()
+
+    serializacao = {}
+    df_nativo = None
+    with tempfile.TemporaryDirectory() as pasta:
+        for nome in formatos:
+            caminho = Path(pasta) / f'dados.{nome}'
+            formato, compressao = deduzir_formato(caminho)
+            bloco = df
+            if formato != 'csv':
+                # Parquet/Arrow recebem as datas nativas, como na exportação real
+                if df_nativo is None:
+                    rng = GeradorContador(chave_linhas(raiz, area, subarea), 0, linhas)
+                    df_nativo = pd.DataFrame(gerar_colunas(area, linhas, subarea, rng, contexto, nativo=True))
+                bloco = df_nativo
+            inicio = time.perf_counter()
+            gravar_blocos([bloco], caminho, formato, compressao=compressao)
+            serializacao[nome] = {
+                'segundos': round(time.perf_counter() - inicio, 6),
+                'bytes': caminho.stat().st_size,
+            }
+            caminho.unlink()
+
+    return {
+        'area': area,
+        'subarea': subarea,
+        'linhas': linhas,
+        'segundos': round(segundos, 6),
+        'linhas_por_segundo': round(linhas / segundos, 1) if segundos else None,
+        'segundos_colunas': round(segundos_colunas, 6),
+        'segundos_dataframe': round(segundos_dataframe, 6),
+        'pico_rss_mb': round(pico_geracao, 1),
+        'incremento_rss_mb': round(pico_geracao - rss_inicial, 1),
+        'serializacao': serializacao,
+    }
+
+def executar(linhas=LINHAS_PADRAO, formatos=FORMATOS_PADRAO, areas=None, repeticoes=1, progresso=None):
+    """Roda todos os casos, cada um num processo novo, e devolve o relatório completo"""
+    from .paralelo import pool_processos
+
+    resultados = []
+    contexto_mp = get_context('spawn')
+    for area, subarea in casos(areas):
+        for qtd in linhas:
+            with pool_processos(1, mp_context=contexto_mp) as pool:
+                resultado = pool.submit(medir_caso, area, subarea, qtd, formatos, repeticoes).result()
+            resultados.append(resultado)
+            if progresso:
+                progresso(resultado)
+    return {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'ambiente': _ambiente(),
+        'resultados': resultados,
+    }
+
+def comparar(relatorio, referencia, tolerancia):
+    """Casos cuja vazão caiu mais que `tolerancia` (fração) em relação à referência"""
+    anteriores = {
+        (r['area'], r['subarea'], r['linhas']): r['linhas_por_segundo']
+        for r in referencia['resultados']
+    }
+    regressoes = []
+    for r in relatorio['resultados']:
+        anterior = anteriores.get((r['area'], r['subarea'], r['linhas']))
+        if anterior and r['linhas_por_segundo'] < anterior * (1 - tolerancia):
+            regressoes.append({**_chave(r), 'anterior': anterior, 'atual': r['linhas_por_segundo']})
+    return regressoes
+
+def _chave(resultado):
+    return {k: resultado[k] for k in ('area', 'subarea', 'linhas')}
+
+def _ambiente():
+    import numpy as np
+    import pandas as pd
+
+    return {
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+def _imprimir(resultado):
+    subarea = f" / {resultado['subarea']}" if resultado['subarea'] else ''
+    print(
+        f"{resultado['area']}{subarea} [{resultado['linhas']:>9,}]: "
+        f"{resultado['linhas_por_segundo']:>12,.0f} linhas/s, "
+        f"DataFrame {resultado['segundos_dataframe']:.3f}s, "
+        f"pico {resultado['pico_rss_mb']:.0f} MB",
+        file=sys.stderr,
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m gerador_dados.benchmark', description=__doc__.split('\n')[0])
+    parser.add_argument('--linhas', type=int, nargs='+', default=list(LINHAS_PADRAO),
+                        help='quantidades de linhas (padrão: 1000 100000 1000000)')
+    parser.add_argument('--formatos', nargs='*', default=list(FORMATOS_PADRAO),
+                        help='formatos de serialização medidos (padrão: csv csv.gz parquet feather)')
+    parser.add_argument('--areas', nargs='+', help='restringe às áreas informadas')
+    parser.add_argument('--repeticoes', type=int, default=1, help='repetições por caso; vale a melhor')
+    parser.add_argument('-o', '--saida', help='arquivo JSON de resultados (padrão: stdout)')
+    parser.add_argument('--referencia', help='JSON de uma execução anterior para comparar')
+    parser.add_argument('--tolerancia', type=float, default=0.2,
+                        help='queda máxima de vazão aceita em relação à referência (padrão: 0.2)')
+    args = parser.parse_args(argv)
+
+    relatorio = executar(args.linhas, args.formatos, args.areas, args.repeticoes, progresso=_imprimir)
+
+    if args.referencia:
+        with open(args.referencia, encoding='utf-8') as arquivo:
+            relatorio['regressoes'] = comparar(relatorio, json.load(arquivo), args.tolerancia)
+
+    texto = json.dumps(relatorio, ensure_ascii=False, indent=2)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(texto + '\n')
+    else:
+        print(texto)
+
+    for regressao in relatorio.get('regressoes', []):
+        print(f"REGRESSÃO: {regressao}", file=sys.stderr)
+    return 1 if relatorio.get('regressoes') else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
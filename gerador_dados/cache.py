@@ -0,0 +1,276 @@
+"""Cache em disco, compartilhado entre processos, de conjuntos gerados.
+
+Cada conjunto fica num arquivo Arrow IPC sem compressão, nomeado pelo hash
+dos parâmetros da geração (área, subárea, linhas, seed, modo), do código do
+pacote e do Faker, do dia atual (as janelas vão até 'today') e de tudo que
+muda os valores em tempo de execução: sazonalidade, formatos de ID, cidades,
+tamanhos dos pools e o código das áreas de `registrar_area`. A leitura mapeia o arquivo
+em memória: as colunas numéricas e de datas do DataFrame apontam direto
+para as páginas do arquivo, compartilhadas pelo sistema operacional entre
+todas as sessões e processos que leem o mesmo conjunto.
+
+- Escrita segura: cada processo grava num arquivo temporário e o renomeia
+  atomicamente; um lock por chave (onde há `fcntl`) faz quem pede o mesmo
+  conjunto esperar a primeira geração em vez de repeti-la.
+- Despejo LRU: cada leitura atualiza a data de modificação do arquivo e,
+  passado `tamanho_maximo`, os arquivos usados há mais tempo são apagados.
+  Leitores que já mapearam um arquivo apagado continuam com ele (POSIX).
+
+O diretório e o limite padrão vêm de `GERADOR_DADOS_CACHE` e
+`GERADOR_DADOS_CACHE_BYTES`.
+"""
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import types
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache, partial
+
+from .perfil import medido
+
+# Limite padrão do cache em disco
+TAMANHO_MAXIMO = 2 * 1024 ** 3
+
+_EXTENSAO = '.arrow'
+
+class CacheDados:
+    """Conjuntos gerados em `diretorio`, até `tamanho_maximo` bytes"""
+
+    def __init__(self, diretorio=None, tamanho_maximo=None):
+        self.diretorio = diretorio or os.environ.get('GERADOR_DADOS_CACHE') or os.path.join(
+            tempfile.gettempdir(), 'gerador_dados_cache'
+        )
+        self.tamanho_maximo = int(
+            tamanho_maximo or os.environ.get('GERADOR_DADOS_CACHE_BYTES') or TAMANHO_MAXIMO
+        )
+        os.makedirs(self.diretorio, exist_ok=True)
+
+    def chave(self, area, qtd, subarea=None, seed=None, nativo=False, compacto=False):
+        """Hash dos parâmetros e de tudo mais que muda os valores gerados"""
+        from .cidades import CIDADES_COORDS
+        from .ids import FORMATOS_ID
+        from .pools import TAMANHO_POOL, TAMANHOS_POOL
+        from .temporal import sazonalidade
+
+        parametros = {
+            'codigo': _codigo_pacote(),
+            'hoje': datetime.now().date().isoformat(),
+            'area': area,
+            'subarea': subarea,
+            'qtd': qtd,
+            'seed': seed,
+            'nativo': nativo,
+            'compacto': compacto,
+            'sazonalidade': repr(sazonalidade(area, subarea)),
+            'formatos_id': {coluna: repr(formato) for coluna, formato in FORMATOS_ID.items()},
+            # Na ordem de inserção, que é a dos índices da matriz de distâncias
+            'cidades': repr(list(CIDADES_COORDS.items())),
+            'pools': [TAMANHO_POOL, TAMANHOS_POOL],
+            'esquema': _impressao_registrado(area, subarea),
+        }
+        texto = json.dumps(parametros, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(texto.encode('utf-8')).hexdigest()[:32]
+
+    def obter(self, area, qtd, subarea=None, seed=None, nativo=False, compacto=False):
+        """DataFrame de `gerar_dados` com esses parâmetros, lido do cache ou gerado e gravado nele.
+
+        Sem `seed` a geração não se repete, então não passa pelo cache.
+        """
+        from .motor import gerar_dados
+
+        if seed is None:
+            return gerar_dados(area, qtd, subarea, seed, nativo, compacto)
+        chave = self.chave(area, qtd, subarea, seed, nativo, compacto)
+        df = self.ler(chave)
+        if df is not None:
+            return df
+        with self._lock(chave[:2]):
+            # Outro processo pode ter gravado enquanto esperávamos o lock
+            df = self.ler(chave)
+            if df is None:
+                df = gerar_dados(area, qtd, subarea, seed, nativo, compacto)
+                self.gravar(chave, df)
+        return df
+
+    @medido('cache:leitura')
+    def ler(self, chave):
+        """DataFrame mapeado do arquivo da chave, ou None se não estiver no cache"""
+        pa, ipc = _pyarrow()
+        caminho = self._caminho(chave)
+        try:
+            with pa.memory_map(caminho) as fonte:
+                tabela = ipc.open_file(fonte).read_all()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(caminho)
+        except OSError:
+            pass
+        metadados = tabela.schema.metadata or {}
+        df = tabela.to_pandas(split_blocks=True)
+        df.attrs['colunas_data'] = json.loads(metadados.get(b'colunas_data', b'[]'))
+        return df
+
+    @medido('cache:gravacao')
+    def gravar(self, chave, df):
+        """Grava `df` na chave (troca atômica do arquivo) e despeja o excedente"""
+        pa, ipc = _pyarrow()
+        tabela = pa.Table.from_pandas(df, preserve_index=False)
+        metadados = {**(tabela.schema.metadata or {}),
+                     b'colunas_data': json.dumps(df.attrs.get('colunas_data', [])).encode('utf-8')}
+        tabela = tabela.replace_schema_metadata(metadados)
+        descritor, temporario = tempfile.mkstemp(prefix=f'.{chave}.', suffix='.tmp', dir=self.diretorio)
+        try:
+            with os.fdopen(descritor, 'wb') as arquivo, ipc.new_file(arquivo, tabela.schema) as escritor:
+                escritor.write_table(tabela)
+            os.replace(temporario, self._caminho(chave))
+        except BaseException:
+            os.unlink(temporario)
+            raise
+        self.despejar(manter=self._caminho(chave))
+
+    def despejar(self, manter=None):
+        """Apaga os arquivos menos usados até o cache caber em `tamanho_maximo`.
+
+        `manter` (o arquivo recém-gravado) nunca é apagado, mesmo sozinho acima do limite.
+        """
+        with self._lock('despejo'):
+            arquivos = self._arquivos()
+            total = sum(tamanho for _, tamanho, _ in arquivos)
+            for caminho, tamanho, _ in sorted(arquivos, key=lambda arquivo: arquivo[2]):
+                if total <= self.tamanho_maximo:
+                    break
+                if caminho == manter:
+                    continue
+                try:
+                    os.unlink(caminho)
+                except OSError:
+                    # No Windows, um arquivo ainda mapeado não pode ser apagado
+                    continue
+                total -= tamanho
+
+    def tamanho(self):
+        """Bytes ocupados pelos conjuntos em cache"""
+        return sum(tamanho for _, tamanho, _ in self._arquivos())
+
+    def limpar(self):
+        """Apaga todos os conjuntos do cache"""
+        for caminho, _, _ in self._arquivos():
+            try:
+                os.unlink(caminho)
+            except OSError:
+                pass
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, chave + _EXTENSAO)
+
+    def _arquivos(self):
+        """(caminho, bytes, último uso) de cada conjunto"""
+        arquivos = []
+        with os.scandir(self.diretorio) as entradas:
+            for entrada in entradas:
+                if entrada.name.endswith(_EXTENSAO):
+                    try:
+                        estado = entrada.stat()
+                    except FileNotFoundError:
+                        continue
+                    arquivos.append((entrada.path, estado.st_size, estado.st_mtime))
+        return arquivos
+
+    @contextmanager
+    def _lock(self, nome):
+        """Lock exclusivo entre processos (sem efeito onde não há `fcntl`).
+
+        As chaves compartilham 256 locks pelo prefixo, para não deixar um
+        arquivo de lock por conjunto.
+        """
+        try:
+            import fcntl
+        except ImportError:
+            yield
+            return
+        with open(os.path.join(self.diretorio, f'.{nome}.lock'), 'a') as arquivo:
+            fcntl.flock(arquivo, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(arquivo, fcntl.LOCK_UN)
+
+# IMPRESSÕES DO CÓDIGO
+@lru_cache(maxsize=None)
+def _codigo_pacote():
+    """Hash das fontes do pacote e versão do Faker (que define os pools), calculado uma vez"""
+    from importlib.metadata import PackageNotFoundError, version
+
+    resumo = hashlib.sha256()
+    pasta = os.path.dirname(__file__)
+    for nome in sorted(os.listdir(pasta)):
+        if nome.endswith('.py'):
+            with open(os.path.join(pasta, nome), 'rb') as arquivo:
+                resumo.update(nome.encode('utf-8') + arquivo.read())
+    try:
+        resumo.update(version('faker').encode('utf-8'))
+    except PackageNotFoundError:
+        pass
+    return resumo.hexdigest()
+
+def _impressao_registrado(area, subarea):
+    """Impressão das colunas da área se ela veio de `registrar_area` (None para as do pacote)"""
+    from .esquemas import registrados
+
+    for esquema in registrados():
+        if (esquema.area, esquema.subarea) == (area, subarea):
+            return [esquema.ordem, _impressao(esquema.contexto), [
+                [coluna.nome, coluna.depende, coluna.oculta, _impressao(coluna.gerar), _impressao(coluna.universo)]
+                for coluna in esquema.colunas
+            ]]
+    return None
+
+def _impressao(objeto):
+    """Texto estável entre processos que muda com o código, os argumentos e o módulo de uma função"""
+    if isinstance(objeto, partial):
+        return ['partial', _impressao(objeto.func), [_impressao(arg) for arg in objeto.args],
+                {nome: _impressao(valor) for nome, valor in objeto.keywords.items()}]
+    if isinstance(objeto, types.FunctionType):
+        celulas = [_impressao(celula.cell_contents) for celula in objeto.__closure__ or ()]
+        padroes = [_impressao(valor) for valor in objeto.__defaults__ or ()]
+        return [objeto.__module__, objeto.__qualname__, _impressao(objeto.__code__), celulas, padroes,
+                _fonte_modulo(objeto.__module__)]
+    if isinstance(objeto, types.CodeType):
+        return [objeto.co_code.hex(), objeto.co_names, [_impressao(const) for const in objeto.co_consts]]
+    if isinstance(objeto, (list, tuple)):
+        return [_impressao(item) for item in objeto]
+    if isinstance(objeto, dict):
+        return {repr(chave): _impressao(valor) for chave, valor in objeto.items()}
+    # Endereços de memória ('<... at 0x7f...>') mudariam a chave a cada processo
+    return repr(objeto) if ' at 0x' not in repr(objeto) else type(objeto).__qualname__
+
+def _fonte_modulo(nome):
+    """Hash do arquivo do módulo (cobre as constantes globais usadas pela função), se houver"""
+    caminho = getattr(sys.modules.get(nome), '__file__', None)
+    if not caminho or not os.path.isfile(caminho):
+        return None
+    with open(caminho, 'rb') as arquivo:
+        return hashlib.sha256(arquivo.read()).hexdigest()
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+    except ImportError as erro:
+        raise ImportError("O cache em disco requer o pacote 'pyarrow'") from erro
+    return pa, ipc
+
+_cache_padrao = None
+
+def gerar_dados_em_cache(area, qtd, subarea=None, seed=None, nativo=False, compacto=False, cache=None):
+    """`gerar_dados` através do cache em disco (por padrão, o de `GERADOR_DADOS_CACHE`)"""
+    global _cache_padrao
+    if cache is None:
+        if _cache_padrao is None:
+            _cache_padrao = CacheDados()
+        cache = _cache_padrao
+    return cache.obter(area, qtd, subarea, seed, nativo, compacto)
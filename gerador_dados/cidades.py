@@ -0,0 +1,94 @@
+"""Coordenadas das cidades e distâncias usadas em Logística/Transporte"""
+import random
+from functools import lru_cache
+
+import numpy as np
+
+from .perfil import medido
+
+# DICIONÁRIO DE COORDENADAS DAS PRINCIPAIS CIDADES BRASILEIRAS
+CIDADES_COORDS = {
+    'São Paulo': (-23.5505, -46.6333),
+    'Rio de Janeiro': (-22.9068, -43.1729),
+    'Belo Horizonte': (-19.9167, -43.9345),
+    'Brasília': (-15.7939, -47.8828),
+    'Curitiba': (-25.4284, -49.2733),
+    'Porto Alegre': (-30.0346, -51.2177),
+    'Salvador': (-12.9714, -38.5014),
+    'Fortaleza': (-3.7319, -38.5267),
+    'Recife': (-8.0476, -34.8770),
+    'Manaus': (-3.1190, -60.0217),
+    'Goiânia': (-16.6869, -49.2648),
+    'Campinas': (-22.9099, -47.0626),
+    'Florianópolis': (-27.5954, -48.5480),
+    'Vitória': (-20.3155, -40.3128),
+    'Santos': (-23.9618, -46.3322),
+    'Joinville': (-26.3045, -48.8487),
+    'Blumenau': (-26.9194, -49.0661),
+    'Caxias do Sul': (-29.1678, -51.1794),
+    'Ribeirão Preto': (-21.1704, -47.8103),
+    'Uberlândia': (-18.9186, -48.2772),
+    'Sorocaba': (-23.5015, -47.4526),
+    'Cuiabá': (-15.6014, -56.0979),
+    'Belém': (-1.4558, -48.5039),
+    'João Pessoa': (-7.1195, -34.8450),
+    'Natal': (-5.7945, -35.2110)
+}
+
+class MatrizDistancias:
+    """Distâncias geodésicas (km, arredondadas) entre todos os pares de cidades.
+
+    Cada par é calculado uma única vez; ao adicionar cidades, apenas as linhas e
+    colunas novas são calculadas. As consultas são feitas por arrays de índices.
+    """
+
+    def __init__(self, coords):
+        self.cidades = []
+        self.indices = {}
+        self.coords = np.empty((0, 2))
+        self.km = np.empty((0, 0), dtype=np.int64)
+        self.adicionar_cidades(coords)
+
+    @medido('distancias:calculo')
+    def adicionar_cidades(self, coords):
+        """Inclui as cidades de `coords` ({nome: (lat, lon)}) que ainda não estão na matriz"""
+        novas = {nome: c for nome, c in coords.items() if nome not in self.indices}
+        if not novas:
+            return
+
+        n_antigo = len(self.cidades)
+        n_total = n_antigo + len(novas)
+        self.cidades.extend(novas)
+        self.indices.update({nome: i for i, nome in enumerate(self.cidades)})
+        self.coords = np.vstack([self.coords, np.array(list(novas.values()), dtype=float)])
+
+        from geopy.distance import geodesic
+
+        km = np.zeros((n_total, n_total), dtype=np.int64)
+        km[:n_antigo, :n_antigo] = self.km
+        for i in range(n_antigo, n_total):
+            for j in range(i):
+                km[i, j] = km[j, i] = round(geodesic(tuple(self.coords[i]), tuple(self.coords[j])).kilometers)
+        self.km = km
+
+    @medido('distancias:consulta')
+    def distancias(self, idx_origem, idx_destino):
+        """Distâncias (km) para arrays de índices de origem e destino"""
+        return self.km[idx_origem, idx_destino]
+
+@lru_cache(maxsize=None)
+def matriz_distancias():
+    """Matriz de distâncias compartilhada por todo o processo"""
+    return MatrizDistancias(CIDADES_COORDS)
+
+def adicionar_cidade(nome, latitude, longitude):
+    """Cadastra uma cidade personalizada para origem/destino em Logística/Transporte"""
+    CIDADES_COORDS[nome] = (latitude, longitude)
+    matriz_distancias().adicionar_cidades({nome: (latitude, longitude)})
+
+def calcular_distancia(cidade_origem, cidade_destino):
+    """Calcula a distância real entre duas cidades brasileiras"""
+    matriz = matriz_distancias()
+    if cidade_origem in matriz.indices and cidade_destino in matriz.indices:
+        return int(matriz.km[matriz.indices[cidade_origem], matriz.indices[cidade_destino]])
+    return random.randint(100, 2000)  # fallback caso cidade não esteja no dicionário
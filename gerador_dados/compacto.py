@@ -0,0 +1,164 @@
+"""Modo compacto: categorias, datas nativas e tipos numéricos estreitos.
+
+Com `compacto=True`, `gerar_dados` devolve as colunas de opções fixas e de
+pools do Faker como `pd.Categorical` (códigos int8/int16 em vez de um objeto
+Python por linha), datas e horários como datetime64, `Desconto` como
+percentual numérico e inteiros/decimais nos menores tipos que comportam as
+faixas sorteadas em `gerar_colunas`. Os valores são os mesmos do modo padrão:
+`como_exibicao` recupera as formas de texto antigas para exibir.
+"""
+import numpy as np
+import pandas as pd
+
+# Coluna -> (tipo estreito, casas decimais). As faixas vêm de `gerar_colunas`:
+# quantidades e parcelas cabem em int8/int16 e os valores monetários ficam
+# abaixo de 2**16, onde o float32 preserva os centavos após arredondar. Chaves
+# numéricas de `ids.FORMATOS_ID` (Nota Fiscal) não estão aqui: o tipo depende
+# do formato (ver `estreitar`)
+TIPOS_COMPACTOS = {
+    'Quantidade': (np.int16, None),
+    'Nº Vezes': (np.int8, None),
+    'Desconto': (np.int8, None),
+    'Distância (KM)': (np.int16, None),
+    'Tempo (min)': (np.int16, None),
+    'Pedidos Enviados': (np.int16, None),
+    'Pedidos Pendentes': (np.int8, None),
+    'Valor': (np.float32, 2),
+    'Valor (R$)': (np.float32, 2),
+    'Salário (R$)': (np.float32, 2),
+    'Custo (R$)': (np.float32, 2),
+    'Litros': (np.float32, 2),
+    'Valor do Litro (R$)': (np.float32, 2),
+    'Valor Mercadoria (R$)': (np.float32, 2),
+    'Latitude Origem': (np.float32, 4),
+    'Longitude Origem': (np.float32, 4),
+    'Latitude Destino': (np.float32, 4),
+    'Longitude Destino': (np.float32, 4),
+}
+
+# Colunas numéricas do modo compacto exibidas com sufixo no modo padrão
+SUFIXOS_EXIBICAO = {
+    'Desconto': '%',
+}
+
+def indexar_objetos(valores, indices):
+    """`valores[indices]` como array de objetos (modo padrão)"""
+    return np.asarray(valores, dtype=object)[indices]
+
+def indexar_categoria(valores, indices):
+    """`valores[indices]` como `pd.Categorical`, com categorias na ordem de `valores`"""
+    codigos, categorias = pd.factorize(np.asarray(valores, dtype=object))
+    return pd.Categorical.from_codes(codigos[indices], dtype=pd.CategoricalDtype(categorias))
+
+def estreitar(colunas, formatos_id=None, faixas=None, padrao=True):
+    """Converte as colunas numéricas para o menor tipo que comporta seus valores.
+
+    - `faixas`: {nome: (mínimo, máximo, casas)} declaradas nas colunas (ver
+      `esquemas.inteiros`/`uniforme`), de onde sai o tipo estreito.
+    - `padrao`: nas áreas padrão, as colunas de `TIPOS_COMPACTOS` usam o tipo da tabela.
+    - `formatos_id`: chaves numéricas vão para o menor inteiro que comporta a
+      maior chave do formato (`base ** largura - 1`), e não o da amostra.
+
+    Colunas sem faixa conhecida ficam no tipo largo, assim como as que, no
+    bloco, têm valores fora do tipo estreito (nunca há estouro nem perda de centavos).
+    """
+    tipos = {nome: (tipo_estreito(*faixa), faixa[2]) for nome, faixa in (faixas or {}).items()}
+    if padrao:
+        tipos.update(TIPOS_COMPACTOS)
+    for nome, formato in (formatos_id or {}).items():
+        if formato.numerico:
+            tipos[nome] = (tipo_inteiro(formato.base ** formato.largura - 1), None)
+    for nome, (tipo, casas) in tipos.items():
+        if nome not in colunas:
+            continue
+        valores = np.asarray(colunas[nome])
+        if valores.dtype.kind in 'iuf' and _cabe(valores, tipo, casas):
+            colunas[nome] = valores.astype(tipo)
+    return colunas
+
+def tipo_inteiro(maximo, minimo=0):
+    """Menor inteiro com sinal (int8 a int64) que comporta valores de `minimo` a `maximo`"""
+    for tipo in (np.int8, np.int16, np.int32):
+        if np.iinfo(tipo).min <= minimo and maximo <= np.iinfo(tipo).max:
+            return tipo
+    return np.int64
+
+def tipo_estreito(minimo, maximo, casas=None):
+    """Tipo de valores em [minimo, maximo]: inteiro sem `casas`; senão float32 se preservar as casas"""
+    if casas is None:
+        return tipo_inteiro(maximo, minimo)
+    return np.float32 if _cabe_float32(max(abs(minimo), abs(maximo)), casas) else np.float64
+
+def _cabe_float32(maior, casas):
+    # Até 2**24 o float32 representa todos os inteiros, então `casas` decimais
+    # sobrevivem ao arredondamento abaixo de 2**24 / 10**casas (2**16 com centavos)
+    return maior * 10 ** (casas or 0) < 2 ** 24
+
+def _cabe(valores, tipo, casas):
+    """Se os valores do bloco cabem em `tipo` sem estouro nem perda de casas decimais"""
+    if len(valores) == 0 or tipo in (np.float64, np.int64):
+        return True
+    if np.dtype(tipo).kind == 'f':
+        return _cabe_float32(float(np.nanmax(np.abs(valores))), casas) if not np.isnan(valores).all() else True
+    if valores.dtype.kind == 'f':
+        return False
+    limites = np.iinfo(tipo)
+    return limites.min <= valores.min() and valores.max() <= limites.max
+
+def como_exibicao(df):
+    """Cópia de um DataFrame compacto com as formas do modo padrão, só para exibição.
+
+    Datas voltam a objetos `date`, horários a 'AAAA-MM-DD HH:MM', decimais a
+    float64 arredondado e `Desconto` ao rótulo '10%'.
+    """
+    from .motor import como_datas_exibicao, formatar_minutos_exibicao
+
+    exibicao = df.copy(deep=False)
+    colunas_data = df.attrs.get('colunas_data', ())
+    for nome in df.columns:
+        valores = df[nome]
+        if nome in colunas_data:
+            exibicao[nome] = como_datas_exibicao(valores.to_numpy())
+        elif pd.api.types.is_datetime64_any_dtype(valores):
+            exibicao[nome] = formatar_minutos_exibicao(valores.to_numpy())
+        elif isinstance(valores.dtype, pd.CategoricalDtype):
+            exibicao[nome] = valores.to_numpy(dtype=object)
+        elif nome in SUFIXOS_EXIBICAO:
+            exibicao[nome] = valores.astype(str).to_numpy(dtype=object) + SUFIXOS_EXIBICAO[nome]
+        elif nome in TIPOS_COMPACTOS and pd.api.types.is_numeric_dtype(valores):
+            tipo, casas = TIPOS_COMPACTOS[nome]
+            if casas is None:
+                exibicao[nome] = valores.astype(np.int64)
+            else:
+                exibicao[nome] = np.round(valores.astype(np.float64), casas)
+        elif valores.dtype == np.float32:
+            # Menor texto que representa o float32 (557.56, não 557.5599975585938)
+            exibicao[nome] = valores.to_numpy().astype(str).astype(np.float64)
+    return exibicao
+
+def memoria(df):
+    """Bytes ocupados pelo DataFrame, contando os objetos Python das colunas"""
+    return int(df.memory_usage(deep=True, index=False).sum())
+
+def comparar_memoria(area, qtd, subarea=None, seed=0):
+    """Memória por coluna e total do modo padrão e do compacto para a mesma geração"""
+    from .motor import gerar_dados
+
+    padrao = gerar_dados(area, qtd, subarea, seed=seed)
+    compacto = gerar_dados(area, qtd, subarea, seed=seed, compacto=True)
+    antes = padrao.memory_usage(deep=True, index=False)
+    depois = compacto.memory_usage(deep=True, index=False)
+    return {
+        'bytes_padrao': int(antes.sum()),
+        'bytes_compacto': int(depois.sum()),
+        'reducao': round(float(antes.sum() / depois.sum()), 2),
+        'colunas': {
+            nome: {
+                'tipo_padrao': str(padrao[nome].dtype),
+                'tipo_compacto': str(compacto[nome].dtype),
+                'bytes_padrao': int(antes[nome]),
+                'bytes_compacto': int(depois[nome]),
+            }
+            for nome in padrao.columns
+        },
+    }
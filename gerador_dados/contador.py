@@ -0,0 +1,191 @@
+"""Gerador aleatório baseado em contador, com acesso direto a qualquer linha.
+
+O valor sorteado para a linha `i` no k-ésimo sorteio de um bloco é um hash
+(splitmix64) de (chave, k, i). Como não há estado sequencial, gerar as linhas
+[a, b) custa O(b - a) e dá o mesmo resultado que gerar o conjunto inteiro e
+fatiar, qualquer que seja a divisão em blocos ou workers.
+"""
+import zlib
+
+import numpy as np
+
+from .perfil import medido
+
+_GAMA = np.uint64(0x9E3779B97F4A7C15)
+_MULT_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MULT_2 = np.uint64(0x94D049BB133111EB)
+_ESCALA_53 = 2.0 ** -53
+_DESLOCAMENTOS = (np.uint64(30), np.uint64(27), np.uint64(31))
+
+# Até este número de linhas, `preparar` sorteia todos os fluxos numa única
+# operação 2D; acima, fluxo a fluxo é mais rápido (menos memória por passo)
+LINHAS_LOTE_FLUXOS = 2048
+
+def misturar(x):
+    """Finalizador do splitmix64 aplicado elemento a elemento (uint64)"""
+    x = x ^ (x >> np.uint64(30))
+    x = x * _MULT_1
+    x = x ^ (x >> np.uint64(27))
+    x = x * _MULT_2
+    return x ^ (x >> np.uint64(31))
+
+def _misturar_no_lugar(x):
+    """`misturar` sobrescrevendo o array `x`, sem temporários a cada etapa"""
+    primeiro, segundo, terceiro = _DESLOCAMENTOS
+    x ^= x >> primeiro
+    x *= _MULT_1
+    x ^= x >> segundo
+    x *= _MULT_2
+    x ^= x >> terceiro
+    return x
+
+def chave_linhas(raiz, area, subarea):
+    """Chave de 64 bits das linhas de (seed, área, subárea)"""
+    rotulo = f'{area}/{subarea or ""}'.encode('utf-8')
+    semente = np.random.SeedSequence(raiz.entropy, spawn_key=(1, zlib.crc32(rotulo)))
+    return semente.generate_state(1, np.uint64)[0]
+
+class GeradorContador:
+    """Subconjunto da API de `numpy.random.Generator` para as linhas [inicio, inicio + qtd).
+
+    Todo sorteio devolve um valor por linha; `size`, quando informado, deve
+    ser `qtd`. Cada chamada usa o próximo fluxo, então cada sorteio deve ter
+    sempre o mesmo número de fluxo em todos os blocos (o que os planos de
+    `esquemas` garantem com `posicionar`).
+    """
+
+    def __init__(self, chave, inicio, qtd):
+        self.chave = np.uint64(chave)
+        self.inicio = inicio
+        self.qtd = qtd
+        self.linhas = np.arange(inicio, inicio + qtd, dtype=np.uint64)
+        self._fluxos = 0
+        self._base = None
+        self._preparados = {}
+
+    @classmethod
+    def em_linhas(cls, chave, linhas):
+        """Gerador para as linhas de `linhas`, que não precisam ser contíguas.
+
+        Cada linha recebe os mesmos valores que teria no bloco que a contém;
+        `inicio + qtd` vale a maior linha + 1, como nas checagens de universo.
+        """
+        linhas = np.asarray(linhas, dtype=np.uint64)
+        fim = int(linhas.max()) + 1 if len(linhas) else 0
+        gerador = cls(chave, fim - len(linhas), len(linhas))
+        gerador.linhas = linhas
+        return gerador
+
+    @property
+    def fluxo(self):
+        """Número do último fluxo usado (0 antes do primeiro sorteio)"""
+        return self._fluxos
+
+    def posicionar(self, fluxo):
+        """Faz o próximo sorteio usar o fluxo `fluxo + 1`, em qualquer ordem de execução"""
+        self._fluxos = fluxo
+
+    @medido('rng:preparar')
+    def preparar(self, fluxos):
+        """Sorteia de uma vez os bits dos `fluxos` (números absolutos) usados em seguida.
+
+        Só vale a pena em blocos pequenos (até `LINHAS_LOTE_FLUXOS` linhas), em
+        que o custo fixo de cada operação NumPy pesa mais que as linhas; nos
+        maiores não faz nada. Os valores são os mesmos de sortear fluxo a fluxo.
+        """
+        fluxos = np.asarray(fluxos, dtype=np.uint64)
+        if self.qtd > LINHAS_LOTE_FLUXOS or len(fluxos) == 0:
+            return
+        with np.errstate(over='ignore'):
+            chaves = misturar(self.chave + fluxos * _GAMA)
+            bits = _misturar_no_lugar(self._linhas_misturadas()[None, :] + chaves[:, None])
+        self._preparados = dict(zip(fluxos.tolist(), bits))
+
+    def _linhas_misturadas(self):
+        # Parte de cada fluxo que só depende da linha, calculada uma vez por bloco
+        if self._base is None:
+            with np.errstate(over='ignore'):
+                self._base = self.linhas * _GAMA
+        return self._base
+
+    @medido('rng:bits')
+    def _bits(self):
+        """64 bits aleatórios por linha no próximo fluxo"""
+        self._fluxos += 1
+        if self._preparados:
+            bits = self._preparados.pop(self._fluxos, None)
+            if bits is not None:
+                return bits
+        with np.errstate(over='ignore'):
+            chave_fluxo = misturar(self.chave + np.uint64(self._fluxos) * _GAMA)
+            return _misturar_no_lugar(self._linhas_misturadas() + chave_fluxo)
+
+    def _conferir(self, size):
+        if size is not None and size != self.qtd:
+            raise ValueError(f'GeradorContador só sorteia um valor por linha ({self.qtd}), não {size}')
+
+    def random(self, size=None):
+        self._conferir(size)
+        return (self._bits() >> np.uint64(11)) * _ESCALA_53
+
+    def uniform(self, low=0.0, high=1.0, size=None):
+        self._conferir(size)
+        return low + (np.asarray(high) - low) * self.random()
+
+    def integers(self, low, high=None, size=None, dtype=np.int64):
+        self._conferir(size)
+        if high is None:
+            low, high = 0, low
+        low = np.asarray(low, dtype=np.float64)
+        amplitude = np.asarray(high, dtype=np.float64) - low
+        valores = low + np.minimum(np.floor(self.random() * amplitude), amplitude - 1)
+        return valores.astype(dtype)
+
+    def numeros_linhas(self):
+        """Número absoluto de cada linha (uint64).
+
+        Consome um fluxo, como um sorteio, para que trocar um sorteio por ele não
+        altere os sorteios seguintes.
+        """
+        self._fluxos += 1
+        return self.linhas.copy()
+
+    @medido('rng:indices_unicos')
+    def indices_unicos(self, universo):
+        """Índice em [0, universo) por linha, sem repetição em todo o conjunto.
+
+        Aplica uma permutação pseudoaleatória (rede de Feistel) ao número
+        absoluto da linha, então não há repetição entre blocos nem workers.
+        """
+        if self.inicio + self.qtd > universo:
+            raise ValueError(f'Só há {universo} valores distintos para {self.inicio + self.qtd} linhas')
+        self._fluxos += 1
+        with np.errstate(over='ignore'):
+            chave_fluxo = misturar(self.chave + np.uint64(self._fluxos) * _GAMA)
+        return permutar(self.linhas, universo, chave_fluxo).astype(np.int64)
+
+def permutar(indices, universo, chave, rodadas=4):
+    """Permutação pseudoaleatória de [0, universo) aplicada a `indices` (uint64).
+
+    Feistel balanceada sobre o menor domínio 4**k >= universo; valores que caem
+    fora de [0, universo) são permutados de novo (cycle walking).
+    """
+    bits = max(1, (int(universo - 1).bit_length() + 1) // 2)
+    mascara = np.uint64((1 << bits) - 1)
+    deslocamento = np.uint64(bits)
+    universo = np.uint64(universo)
+
+    def feistel(x):
+        esquerda, direita = x >> deslocamento, x & mascara
+        with np.errstate(over='ignore'):
+            for rodada in range(rodadas):
+                f = misturar(direita ^ (chave + np.uint64(rodada) * _GAMA)) & mascara
+                esquerda, direita = direita, esquerda ^ f
+        return (esquerda << deslocamento) | direita
+
+    resultado = feistel(indices)
+    fora = resultado >= universo
+    while fora.any():
+        resultado[fora] = feistel(resultado[fora])
+        fora = resultado >= universo
+    return resultado
@@ -0,0 +1,333 @@
+"""Esquemas declarativos das áreas, compilados em planos de colunas.
+
+Cada área/subárea é um `Esquema`: uma lista de `Coluna`s, cada uma com uma
+função que gera os valores de todas as linhas do bloco de uma vez e as
+colunas de que depende. Colunas `oculta=True` são valores intermediários
+(índices sorteados, datas antes da formatação) que não vão para a saída.
+
+    def vagas_livres(lote, vagas):
+        return vagas - lote.inteiros(0, vagas)
+
+    registrar_area(Esquema('Eventos', colunas=[
+        datas('Data', '-1y', 'today'),
+        pool('Participante', 'name'),
+        opcao('Tipo', ['Palestra', 'Oficina']),
+        inteiros('Vagas', 10, 201),
+        Coluna('Vagas Livres', vagas_livres, depende=('Vagas',)),
+    ]))
+
+Um `Plano` ordena as colunas pelas dependências, descarta as que não levam
+às colunas pedidas e libera cada intermediário assim que o último
+dependente o usa. Os fluxos aleatórios de cada coluna (ver `contador`) são
+fixados pela ordem de declaração, então a ordem de execução, a projeção de
+colunas e a divisão em blocos não mudam os valores; em blocos pequenos,
+todos os fluxos do plano são sorteados numa única operação vetorizada.
+Mudar a ordem de declaração muda os dados gerados para uma mesma `seed`.
+
+As funções recebem um lote (`motor.Lote`) com o gerador das linhas, o
+contexto e os sorteios do modo de saída, seguido dos valores das
+dependências, na ordem de `depende`.
+"""
+from functools import partial
+
+from .areas import AREAS
+
+class Coluna:
+    """Coluna (ou valor intermediário, com `oculta=True`) gerada por `gerar(lote, *dependencias)`.
+
+    Colunas sem repetição em todo o conjunto informam em `universo(contexto)`
+    quantos valores distintos existem, o que limita as linhas do conjunto.
+    Colunas numéricas podem declarar `faixa=(mínimo, máximo, casas)` (casas
+    None para inteiros), de onde o modo compacto tira o tipo estreito; sem
+    ela, a coluna fica no tipo largo.
+    """
+
+    def __init__(self, nome, gerar, depende=(), oculta=False, universo=None, faixa=None):
+        self.nome = nome
+        self.gerar = gerar
+        self.depende = tuple(depende)
+        self.oculta = oculta
+        self.universo = universo
+        self.faixa = faixa
+
+    def __repr__(self):
+        return f'Coluna({self.nome!r}, depende={self.depende!r}, oculta={self.oculta})'
+
+class Esquema:
+    """Colunas de uma área/subárea, validadas e com os planos compilados em cache.
+
+    - `colunas`: declaradas na ordem que fixa os fluxos aleatórios.
+    - `ordem`: ordem das colunas na saída (padrão: a de declaração).
+    - `contexto`: função `(rng, fake) -> dict` com o estado sorteado uma vez por
+      geração e compartilhado por todos os blocos (ex.: a frota de Transporte).
+    """
+
+    def __init__(self, area, subarea=None, colunas=(), ordem=None, contexto=None):
+        self.area = area
+        self.subarea = subarea
+        self.colunas = list(colunas)
+        self.contexto = contexto
+        self._por_nome = {}
+        for coluna in self.colunas:
+            if coluna.nome in self._por_nome:
+                raise ValueError(f'Coluna repetida em {self.rotulo}: {coluna.nome!r}')
+            self._por_nome[coluna.nome] = coluna
+        for coluna in self.colunas:
+            for dependencia in coluna.depende:
+                if dependencia not in self._por_nome:
+                    raise ValueError(f'{self.rotulo}: {coluna.nome!r} depende de {dependencia!r}, que não existe')
+        visiveis = [coluna.nome for coluna in self.colunas if not coluna.oculta]
+        self.ordem = tuple(ordem or visiveis)
+        if sorted(self.ordem) != sorted(visiveis):
+            raise ValueError(f'{self.rotulo}: `ordem` deve listar exatamente as colunas visíveis {visiveis}')
+        self.topologica = self._ordenar()
+        self._fluxos = {}
+        self._planos = {}
+
+    @property
+    def rotulo(self):
+        return f'{self.area}/{self.subarea}' if self.subarea else self.area
+
+    def __repr__(self):
+        return f'Esquema({self.area!r}, {self.subarea!r}, colunas={list(self.ordem)})'
+
+    def __getstate__(self):
+        # Os planos em cache são recompilados no processo que recebe o esquema
+        return {**self.__dict__, '_fluxos': {}, '_planos': {}}
+
+    def _ordenar(self):
+        """Ordem topológica estável: cada coluna assim que suas dependências estão prontas"""
+        prontas = set()
+        ordem = []
+        restantes = list(self.colunas)
+        while restantes:
+            livres = [coluna for coluna in restantes if prontas.issuperset(coluna.depende)]
+            if not livres:
+                ciclo = ', '.join(repr(coluna.nome) for coluna in restantes)
+                raise ValueError(f'{self.rotulo}: dependência circular entre {ciclo}')
+            ordem.extend(livres)
+            prontas.update(coluna.nome for coluna in livres)
+            restantes = [coluna for coluna in restantes if coluna.nome not in prontas]
+        return ordem
+
+    def limite_linhas(self, contexto):
+        """Máximo de linhas de um conjunto (None = sem limite), pelas colunas sem repetição"""
+        universos = [coluna.universo(contexto) for coluna in self.colunas if coluna.universo is not None]
+        return min(universos, default=None)
+
+    def faixas(self):
+        """Faixas declaradas das colunas numéricas ({nome: (mínimo, máximo, casas)})"""
+        return {coluna.nome: coluna.faixa for coluna in self.colunas if coluna.faixa is not None}
+
+    def plano(self, lote, colunas=None):
+        """`Plano` que gera `colunas` (padrão: todas as visíveis) no modo de saída do lote"""
+        modo = (lote.nativo, lote.compacto)
+        chave = (modo, tuple(colunas) if colunas is not None else None)
+        plano = self._planos.get(chave)
+        if plano is None:
+            if modo not in self._fluxos:
+                self._fluxos[modo] = self._contar_fluxos(lote.sonda())
+            plano = self._planos[chave] = Plano(self, self._fluxos[modo], colunas)
+        return plano
+
+    def _contar_fluxos(self, sonda):
+        """Fluxos aleatórios que cada coluna consome, medidos gerando uma linha.
+
+        Cada sorteio consome um fluxo qualquer que seja o número de linhas, então
+        a contagem numa linha vale para todos os blocos.
+        """
+        rng = sonda.rng
+        valores = {}
+        fluxos = {}
+        for coluna in self.topologica:
+            antes = rng.fluxo
+            valores[coluna.nome] = coluna.gerar(sonda, *(valores[nome] for nome in coluna.depende))
+            fluxos[coluna.nome] = rng.fluxo - antes
+        return fluxos
+
+class Plano:
+    """Execução compilada de um `Esquema`: passos em ordem topológica, com fluxo fixo.
+
+    `passos` traz (coluna, primeiro fluxo, quantidade de fluxos, nomes liberados
+    depois do passo); `niveis` agrupa as colunas que não dependem umas das
+    outras (informativo: os fluxos de todos os passos são preparados juntos).
+    """
+
+    def __init__(self, esquema, fluxos, colunas=None):
+        saida = tuple(esquema.ordem if colunas is None else colunas)
+        desconhecidas = [nome for nome in saida if nome not in esquema.ordem]
+        if desconhecidas:
+            raise ValueError(f'Colunas inexistentes em {esquema.rotulo}: {desconhecidas}')
+        self.esquema = esquema
+        self.saida = saida
+
+        # Fluxo inicial de cada coluna pela ordem de declaração
+        inicio = {}
+        total = 0
+        for coluna in esquema.colunas:
+            inicio[coluna.nome] = total
+            total += fluxos[coluna.nome]
+        self.fluxos = total
+
+        # Só as colunas que levam à saída, na ordem topológica
+        necessarias = set()
+        pendentes = list(saida)
+        while pendentes:
+            nome = pendentes.pop()
+            if nome not in necessarias:
+                necessarias.add(nome)
+                pendentes.extend(esquema._por_nome[nome].depende)
+        ordem = [coluna for coluna in esquema.topologica if coluna.nome in necessarias]
+
+        # Último passo que usa cada valor, para liberar os intermediários cedo
+        ultimo_uso = {}
+        for posicao, coluna in enumerate(ordem):
+            for dependencia in coluna.depende:
+                ultimo_uso[dependencia] = posicao
+        liberar = [[] for _ in ordem]
+        for nome, posicao in ultimo_uso.items():
+            if nome not in saida:
+                liberar[posicao].append(nome)
+
+        self.passos = [
+            (coluna, inicio[coluna.nome], fluxos[coluna.nome], tuple(liberar[posicao]))
+            for posicao, coluna in enumerate(ordem)
+        ]
+        nivel = {}
+        for coluna in ordem:
+            nivel[coluna.nome] = 1 + max((nivel[nome] for nome in coluna.depende), default=-1)
+        self.niveis = [
+            [coluna.nome for coluna in ordem if nivel[coluna.nome] == n]
+            for n in range(1 + max(nivel.values(), default=-1))
+        ]
+
+    def __repr__(self):
+        return f'Plano({self.esquema.rotulo!r}, passos={len(self.passos)}, fluxos={self.fluxos})'
+
+    def descrever(self):
+        """Texto com cada passo: nível, fluxos, dependências e intermediários liberados"""
+        nivel = {nome: n for n, nomes in enumerate(self.niveis) for nome in nomes}
+        linhas = [f'Plano de {self.esquema.rotulo}: {len(self.passos)} passos, {self.fluxos} fluxos']
+        for coluna, inicio, quantidade, liberar in self.passos:
+            fluxos = f'{inicio + 1}-{inicio + quantidade}' if quantidade else '-'
+            texto = f'  [{nivel[coluna.nome]}] {coluna.nome:<28} fluxos {fluxos:<7}'
+            if coluna.depende:
+                texto += f" <- {', '.join(coluna.depende)}"
+            if liberar:
+                texto += f" (libera {', '.join(liberar)})"
+            linhas.append(texto)
+        return '\n'.join(linhas)
+
+    def executar(self, lote):
+        """Gera as colunas de saída para as linhas do lote (dict nome -> valores)"""
+        rng = lote.rng
+        inicial = rng.fluxo
+        rng.preparar([
+            inicial + inicio + k
+            for _, inicio, quantidade, _ in self.passos
+            for k in range(1, quantidade + 1)
+        ])
+        valores = {}
+        for coluna, inicio, _, liberar in self.passos:
+            rng.posicionar(inicial + inicio)
+            valores[coluna.nome] = coluna.gerar(lote, *(valores[nome] for nome in coluna.depende))
+            for nome in liberar:
+                del valores[nome]
+        # Sorteios feitos depois do plano (ex.: chaves do esquema estrela) seguem
+        # nos mesmos fluxos, com ou sem projeção
+        rng.posicionar(inicial + self.fluxos)
+        return {nome: valores[nome] for nome in self.saida}
+
+# COLUNAS COMUNS
+# As funções das colunas comuns são `partial`s de funções do módulo (não
+# lambdas) para que os esquemas possam ser enviados aos workers (ver `paralelo`)
+def opcao(nome, opcoes):
+    """Valor sorteado de uma lista fixa (categoria no modo compacto)"""
+    return Coluna(nome, partial(_opcao, opcoes))
+
+def pool(nome, provedor, prefixo=None):
+    """Valor do pool de um provedor do Faker (`name`, `company`, ...), com `prefixo` opcional"""
+    return Coluna(nome, partial(_pool, provedor, prefixo))
+
+def uniforme(nome, baixo, alto, casas=2):
+    """Número uniforme em [baixo, alto), arredondado em `casas`"""
+    return Coluna(nome, partial(_uniforme, baixo, alto, casas), faixa=(baixo, alto, casas))
+
+def inteiros(nome, baixo, alto):
+    """Inteiro uniforme em [baixo, alto), como `numpy.random.Generator.integers`"""
+    return Coluna(nome, partial(_inteiros, baixo, alto), faixa=(baixo, alto - 1, None))
+
+def datas(nome, inicio, fim):
+    """Data sorteada na janela [inicio, fim] ('-6M', 'today', `date`...), com a sazonalidade da área"""
+    return Coluna(nome, partial(_datas, inicio, fim))
+
+def ids(nome):
+    """Chave única em todo o conjunto, no formato de `ids.FORMATOS_ID[nome]`"""
+    return Coluna(nome, partial(_ids, nome), universo=partial(_universo_id, nome))
+
+def _opcao(opcoes, lote):
+    return lote.opcao(opcoes)
+
+def _pool(provedor, prefixo, lote):
+    valores = lote.pool(provedor)
+    return valores if prefixo is None else lote.prefixar(prefixo, valores)
+
+def _uniforme(baixo, alto, casas, lote):
+    return lote.uniforme(baixo, alto).round(casas)
+
+def _inteiros(baixo, alto, lote):
+    return lote.inteiros(baixo, alto)
+
+def _datas(inicio, fim, lote):
+    return lote.datas(lote.sortear_datas(inicio, fim))
+
+def _ids(nome, lote):
+    return lote.ids(nome)
+
+def _universo_id(nome, contexto):
+    return contexto['formatos_id'][nome].universo
+
+# REGISTRO
+# (área, subárea) -> Esquema
+ESQUEMAS = {}
+# Esquemas de `registrar_area`, na ordem de registro (os padrão ficam de fora)
+_REGISTRADOS = {}
+
+def registrar_area(esquema):
+    """Registra (ou substitui) o esquema de uma área/subárea e a inclui em `AREAS`.
+
+    A área passa a valer em toda a biblioteca do processo, com os mesmos
+    modos de saída e a mesma geração em blocos das áreas padrão. Os pools de
+    processos (`paralelo`, `servico`) registram o esquema nos workers, o que
+    exige que suas funções possam ser serializadas com `pickle` (funções do
+    nível do módulo, não lambdas nem funções locais).
+    """
+    _carregar_padrao()
+    area, subarea = esquema.area, esquema.subarea
+    subareas = AREAS.get(area)
+    if subareas is not None:
+        if subarea is None and subareas:
+            raise ValueError(f"A área {area!r} tem subáreas: {', '.join(subareas)}")
+        if subarea is not None and not subareas:
+            raise ValueError(f'A área {area!r} não tem subáreas')
+    ESQUEMAS[(area, subarea)] = _REGISTRADOS[(area, subarea)] = esquema
+    subareas = AREAS.setdefault(area, [])
+    if subarea is not None and subarea not in subareas:
+        subareas.append(subarea)
+    return esquema
+
+def registrados():
+    """Esquemas registrados com `registrar_area` neste processo, na ordem de registro"""
+    return list(_REGISTRADOS.values())
+
+def esquema(area, subarea=None):
+    """Esquema registrado da área/subárea"""
+    _carregar_padrao()
+    try:
+        return ESQUEMAS[(area, subarea)]
+    except KeyError:
+        raise ValueError(f'Área sem esquema registrado: {area!r}/{subarea!r}') from None
+
+def _carregar_padrao():
+    # As áreas padrão são declaradas no motor, que as põe em ESQUEMAS ao ser importado
+    from . import motor  # noqa: F401
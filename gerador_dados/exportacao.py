@@ -0,0 +1,406 @@
+"""Gravação em disco, bloco a bloco, de dados gerados por `gerar_em_blocos`.
+
+CSV e NDJSON (um objeto JSON por linha) podem ser comprimidos (gzip, bz2,
+xz, zstd, zip). Parquet e Feather/Arrow
+IPC gravam datas com tipos nativos e codificam em dicionário as colunas de
+texto com poucos valores distintos (Produto, Status, Cidade Origem, ...).
+SQLite, DuckDB e scripts `COPY` do PostgreSQL ficam em `bancos`.
+
+`exportar_em_partes` produz os mesmos arquivos como pedaços de bytes, sem
+passar pelo disco, para downloads e respostas HTTP.
+"""
+import io
+import os
+from contextlib import contextmanager
+
+from .bancos import FORMATOS_BANCO
+from .perfil import medido
+
+FORMATOS = ('csv', 'ndjson', 'parquet', 'feather', 'arrow', *FORMATOS_BANCO)
+FORMATOS_ARROW = ('parquet', 'feather', 'arrow')
+# Formatos que recebem datas como datetime64 (`nativo=True`) em vez de texto
+FORMATOS_NATIVOS = ('ndjson',) + FORMATOS_ARROW + FORMATOS_BANCO
+# Formatos de texto que aceitam compressão em fluxo
+FORMATOS_TEXTO = ('csv', 'ndjson', 'sql')
+COMPRESSOES_CSV = ('gzip', 'bz2', 'xz', 'zstd', 'zip')
+
+# Extensões reconhecidas em `deduzir_formato`
+_EXTENSOES_COMPRESSAO = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz', '.zst': 'zstd', '.zip': 'zip'}
+_EXTENSOES_FORMATO = {'db': 'sqlite', 'sqlite3': 'sqlite', 'jsonl': 'ndjson'}
+
+# Colunas de texto com até este número de valores distintos no primeiro bloco,
+# cada um repetido em média ao menos `REPETICOES_DICIONARIO` vezes, são
+# gravadas como dicionário. Sem a repetição, um primeiro bloco pequeno levaria
+# ao dicionário colunas de valores quase únicos (Cliente, Ticket), com um
+# vocabulário que cresceria a cada bloco
+LIMITE_DICIONARIO = 1000
+REPETICOES_DICIONARIO = 2
+
+# Linhas convertidas em texto por vez em `exportar_em_partes`
+LINHAS_POR_PARTE = 50_000
+
+def deduzir_formato(caminho):
+    """Formato e compressão a partir da extensão (ex.: 'dados.csv.gz' -> ('csv', 'gzip'))"""
+    nome = str(caminho).lower()
+    compressao = None
+    for extensao, codec in _EXTENSOES_COMPRESSAO.items():
+        if nome.endswith(extensao):
+            nome, compressao = nome[:-len(extensao)], codec
+            break
+    formato = nome.rsplit('.', 1)[-1] if '.' in nome else 'csv'
+    formato = _EXTENSOES_FORMATO.get(formato, formato)
+    if formato not in FORMATOS:
+        formato = 'csv'
+    if formato not in FORMATOS_TEXTO:
+        compressao = None
+    return formato, compressao
+
+def gravar_blocos(blocos, caminho, formato='csv', compressao=None, nivel_compressao=None,
+                  linhas_por_grupo=None, colunas_dicionario=None, tabela='dados', indices=()):
+    """Anexa cada DataFrame de `blocos` ao arquivo `caminho` e devolve o total de linhas.
+
+    Os blocos são escritos assim que chegam, sem concatenar nada em memória.
+
+    - `compressao`: codec do arquivo. CSV, NDJSON e SQL aceitam gzip/bz2/xz/zstd/zip (padrão:
+      sem compressão); Parquet aceita snappy/zstd/gzip/brotli/lz4/none (padrão:
+      snappy); Feather/Arrow aceita lz4/zstd/uncompressed (padrão: lz4).
+    - `linhas_por_grupo`: linhas por row group (Parquet), record batch (Arrow)
+      ou transação (SQLite, DuckDB e SQL).
+    - `colunas_dicionario`: colunas gravadas como dicionário; por padrão, as de
+      texto com até `LIMITE_DICIONARIO` valores distintos, e repetidos, no primeiro bloco.
+    - `tabela`/`indices`: tabela criada nos formatos de banco e colunas
+      indexadas depois da carga.
+    """
+    if formato == 'csv':
+        return _gravar_csv(blocos, caminho, compressao, nivel_compressao)
+    if formato == 'ndjson':
+        return _gravar_ndjson(blocos, caminho, compressao, nivel_compressao)
+    if formato in FORMATOS_ARROW:
+        return _gravar_arrow(blocos, caminho, formato, compressao, nivel_compressao,
+                             linhas_por_grupo, colunas_dicionario)
+    if formato in FORMATOS_BANCO:
+        from . import bancos
+
+        if formato == 'sql':
+            return bancos.gravar_copy(blocos, caminho, tabela, indices, linhas_por_grupo,
+                                      compressao, nivel_compressao)
+        gravar = bancos.gravar_sqlite if formato == 'sqlite' else bancos.gravar_duckdb
+        return gravar(blocos, caminho, tabela, indices, linhas_por_grupo)
+    raise ValueError(f"Formato não suportado: {formato!r} (use um de {FORMATOS})")
+
+def gravar_em_arquivo(area, qtd, caminho, subarea=None, seed=None, formato='csv',
+                      tamanho_bloco=100_000, **opcoes):
+    """Gera `qtd` linhas da área/subárea direto para `caminho`, com memória constante.
+
+    `opcoes` são repassadas a `gravar_blocos` (compressão, row groups, ...). Nos
+    formatos de banco a tabela padrão tem o nome da área (ex.: 'logistica_transporte').
+    """
+    from .bancos import nome_tabela
+    from .motor import gerar_em_blocos
+
+    if formato in FORMATOS_BANCO:
+        opcoes.setdefault('tabela', nome_tabela(area, subarea))
+    blocos = gerar_em_blocos(area, qtd, subarea, seed=seed, tamanho_bloco=tamanho_bloco,
+                             nativo=formato in FORMATOS_NATIVOS)
+    return gravar_blocos(blocos, caminho, formato, **opcoes)
+
+def exportar_bytes(blocos, formato='csv', **opcoes):
+    """Grava `blocos` como `gravar_blocos` e devolve o conteúdo do arquivo em bytes"""
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = Path(pasta) / f'dados.{formato}'
+        gravar_blocos(blocos, caminho, formato, **opcoes)
+        return caminho.read_bytes()
+
+def exportar_em_partes(blocos, formato='csv', compressao=None, nivel_compressao=None,
+                       linhas_por_grupo=None, colunas_dicionario=None, nome_membro='dados.csv'):
+    """Gera o arquivo de `gravar_blocos` como uma sequência de pedaços de bytes.
+
+    Nada é montado inteiro em memória: CSV e NDJSON são convertidos em texto a
+    cada `LINHAS_POR_PARTE` linhas e passam direto pelo compressor (gzip, bz2,
+    xz, zstd ou zip, com `nome_membro` dentro do zip); Parquet e Feather/Arrow
+    entregam o que foi gravado a cada bloco.
+    """
+    vazao = _Vazao()
+    if formato in ('csv', 'ndjson'):
+        with _comprimir(vazao, compressao, nivel_compressao, nome_membro) as saida:
+            cabecalho = True
+            for bloco in blocos:
+                for inicio in range(0, max(len(bloco), 1), LINHAS_POR_PARTE):
+                    parte = bloco.iloc[inicio:inicio + LINHAS_POR_PARTE]
+                    saida.write(_csv_bytes(parte, cabecalho) if formato == 'csv' else _ndjson_bytes(parte))
+                    cabecalho = False
+                    yield from vazao.drenar()
+    elif formato in FORMATOS_ARROW:
+        for _ in _escrever_arrow(blocos, vazao, formato, compressao, nivel_compressao, linhas_por_grupo,
+                                 colunas_dicionario):
+            yield from vazao.drenar()
+    else:
+        raise ValueError(f"Formato não suportado na exportação em partes: {formato!r} "
+                         f"(use csv, ndjson ou {FORMATOS_ARROW})")
+    yield from vazao.drenar()
+
+def estimar_tamanho(amostra, total_linhas, formato='csv', **opcoes):
+    """Tamanho aproximado, em bytes, do arquivo de `total_linhas` linhas com o perfil de `amostra`"""
+    if len(amostra) == 0:
+        return 0
+    tamanho = sum(len(parte) for parte in exportar_em_partes([amostra], formato, **opcoes))
+    return int(tamanho * total_linhas / len(amostra))
+
+class _Vazao(io.RawIOBase):
+    """Destino de escrita que só acumula os bytes até `drenar`"""
+
+    def __init__(self):
+        self._partes = []
+        self._posicao = 0
+
+    def writable(self):
+        return True
+
+    def write(self, dados):
+        self._partes.append(bytes(dados))
+        self._posicao += len(dados)
+        return len(dados)
+
+    def tell(self):
+        return self._posicao
+
+    def drenar(self):
+        """Bytes escritos desde a última drenagem (lista vazia se nenhum)"""
+        partes = [b''.join(self._partes)] if self._partes else []
+        self._partes = []
+        return partes
+
+@contextmanager
+def _comprimir(destino, compressao, nivel, nome_membro='dados.csv'):
+    """Fluxo binário que comprime em `destino` (arquivo ou `_Vazao`), sem fechá-lo"""
+    if compressao is None:
+        yield destino
+    elif compressao == 'gzip':
+        import gzip
+        with gzip.GzipFile(fileobj=destino, mode='wb', compresslevel=nivel or 6) as saida:
+            yield saida
+    elif compressao == 'bz2':
+        import bz2
+        with bz2.BZ2File(destino, 'wb', compresslevel=nivel or 9) as saida:
+            yield saida
+    elif compressao == 'xz':
+        import lzma
+        with lzma.LZMAFile(destino, 'wb', preset=nivel) as saida:
+            yield saida
+    elif compressao == 'zstd':
+        try:
+            import zstandard
+        except ImportError as erro:
+            raise ImportError("A compressão zstd do CSV requer o pacote 'zstandard'") from erro
+        with zstandard.ZstdCompressor(level=nivel or 3).stream_writer(destino, closefd=False) as saida:
+            yield saida
+    elif compressao == 'zip':
+        import zipfile
+        with zipfile.ZipFile(destino, 'w', zipfile.ZIP_DEFLATED, compresslevel=nivel) as arquivo:
+            with arquivo.open(nome_membro, 'w', force_zip64=True) as saida:
+                yield saida
+    else:
+        raise ValueError(f"Compressão de CSV não suportada: {compressao!r} (use um de {COMPRESSOES_CSV})")
+
+# CSV
+def _abrir_texto(caminho, compressao, nivel):
+    """Abre `caminho` para escrita de texto, comprimindo em fluxo quando pedido"""
+    opcoes = {'encoding': 'utf-8', 'newline': ''}
+    if compressao is None:
+        return open(caminho, 'w', **opcoes)
+    if compressao == 'gzip':
+        import gzip
+        return gzip.open(caminho, 'wt', compresslevel=nivel or 6, **opcoes)
+    if compressao == 'bz2':
+        import bz2
+        return bz2.open(caminho, 'wt', compresslevel=nivel or 9, **opcoes)
+    if compressao == 'xz':
+        import lzma
+        return lzma.open(caminho, 'wt', preset=nivel, **opcoes)
+    if compressao == 'zstd':
+        try:
+            import zstandard
+        except ImportError as erro:
+            raise ImportError("A compressão zstd do CSV requer o pacote 'zstandard'") from erro
+        contexto = zstandard.ZstdCompressor(level=nivel or 3)
+        return zstandard.open(caminho, 'wt', cctx=contexto, **opcoes)
+    if compressao == 'zip':
+        return _texto_zip(caminho, nivel, opcoes)
+    raise ValueError(f"Compressão de CSV não suportada: {compressao!r} (use um de {COMPRESSOES_CSV})")
+
+@contextmanager
+def _texto_zip(caminho, nivel, opcoes):
+    """Arquivo .zip com um único membro de texto, nomeado como o arquivo sem '.zip'"""
+    nome_membro = os.path.basename(str(caminho)).removesuffix('.zip') or 'dados.csv'
+    with open(caminho, 'wb') as arquivo, _comprimir(arquivo, 'zip', nivel, nome_membro) as saida:
+        with io.TextIOWrapper(saida, **opcoes) as texto:
+            yield texto
+
+def _gravar_csv(blocos, caminho, compressao, nivel):
+    total = 0
+    with _abrir_texto(caminho, compressao, nivel) as arquivo:
+        for bloco in blocos:
+            _escrever_csv(bloco, arquivo, cabecalho=total == 0)
+            total += len(bloco)
+    return total
+
+@medido('gravacao:csv')
+def _escrever_csv(bloco, arquivo, cabecalho):
+    bloco.to_csv(arquivo, header=cabecalho, index=False)
+
+@medido('gravacao:csv')
+def _csv_bytes(bloco, cabecalho):
+    return bloco.to_csv(header=cabecalho, index=False).encode('utf-8')
+
+# NDJSON
+def _gravar_ndjson(blocos, caminho, compressao, nivel):
+    total = 0
+    with _abrir_texto(caminho, compressao, nivel) as arquivo:
+        for bloco in blocos:
+            arquivo.write(_ndjson(bloco))
+            total += len(bloco)
+    return total
+
+@medido('gravacao:ndjson')
+def _ndjson(bloco):
+    """Um objeto JSON por linha, com datas ISO 8601 ('2025-03-01', '2025-03-01T14:05')"""
+    import numpy as np
+
+    if len(bloco) == 0:
+        return ''
+    colunas_data = bloco.attrs.get('colunas_data', ())
+    bloco = bloco.copy(deep=False)
+    for nome in bloco.columns:
+        tipo = bloco[nome].dtype
+        if tipo.kind == 'M':
+            valores = bloco[nome].to_numpy()
+            texto = np.datetime_as_string(valores, unit='D' if nome in colunas_data else 'm').astype(object)
+            texto[np.isnat(valores)] = None
+            bloco[nome] = texto
+        elif tipo == np.float32:
+            # float32 (modo compacto) passa pelo texto mais curto para não virar 261.6799926758
+            bloco[nome] = bloco[nome].to_numpy().astype(str).astype(np.float64)
+    return bloco.to_json(orient='records', lines=True, force_ascii=False).rstrip('\n') + '\n'
+
+def _ndjson_bytes(bloco):
+    return _ndjson(bloco).encode('utf-8')
+
+# PARQUET E FEATHER/ARROW IPC
+class _Dicionarios:
+    """Codifica colunas em dicionário com um vocabulário que só cresce entre blocos.
+
+    Como os valores novos entram sempre no fim, cada bloco só acrescenta um
+    delta ao dicionário anterior, o que o formato Arrow IPC exige.
+    """
+
+    def __init__(self, colunas):
+        self.vocabularios = {coluna: {} for coluna in colunas}
+
+    def codificar(self, nome, valores):
+        import numpy as np
+        import pandas as pd
+        import pyarrow as pa
+
+        vocabulario = self.vocabularios[nome]
+        codigos, distintos = pd.factorize(valores)
+        for valor in distintos:
+            vocabulario.setdefault(valor, len(vocabulario))
+        mapa = np.fromiter((vocabulario[v] for v in distintos), dtype=np.int32, count=len(distintos))
+        indices = pa.array(mapa[codigos] if len(mapa) else codigos.astype(np.int32),
+                           mask=codigos < 0, type=pa.int32())
+        return pa.DictionaryArray.from_arrays(indices, pa.array(list(vocabulario), type=pa.string()))
+
+def _colunas_dicionario(bloco):
+    """Colunas de texto com poucos valores distintos, e repetidos, no bloco"""
+    from pandas.api.types import is_string_dtype
+
+    colunas = []
+    for nome in bloco.columns:
+        if is_string_dtype(bloco[nome]):
+            distintos = bloco[nome].nunique()
+            if distintos <= LIMITE_DICIONARIO and distintos * REPETICOES_DICIONARIO <= len(bloco):
+                colunas.append(nome)
+    return colunas
+
+@medido('gravacao:conversao_arrow')
+def _para_tabela(bloco, dicionarios):
+    """Converte o DataFrame num Table do Arrow com datas nativas e dicionários"""
+    import pyarrow as pa
+
+    tabela = pa.Table.from_pandas(bloco, preserve_index=False)
+    for nome in tabela.column_names:
+        indice = tabela.schema.get_field_index(nome)
+        if nome in dicionarios.vocabularios:
+            coluna = dicionarios.codificar(nome, bloco[nome].to_numpy(dtype=object))
+        elif nome in bloco.attrs.get('colunas_data', ()):
+            coluna = tabela.column(indice).cast(pa.date32())
+        else:
+            continue
+        tabela = tabela.set_column(indice, nome, coluna)
+    return tabela.replace_schema_metadata(None)
+
+def _gravar_arrow(blocos, caminho, formato, compressao, nivel, linhas_por_grupo, colunas_dicionario):
+    total = 0
+    for total in _escrever_arrow(blocos, caminho, formato, compressao, nivel, linhas_por_grupo,
+                                 colunas_dicionario):
+        pass
+    return total
+
+def _escrever_arrow(blocos, destino, formato, compressao, nivel, linhas_por_grupo, colunas_dicionario):
+    """Grava os blocos em `destino` (caminho ou arquivo), devolvendo o total após cada bloco"""
+    try:
+        import pyarrow as pa
+    except ImportError as erro:
+        raise ImportError(f"A exportação em {formato} requer o pacote 'pyarrow'") from erro
+
+    total = 0
+    escritor = None
+    dicionarios = None
+    try:
+        for bloco in blocos:
+            if escritor is None:
+                if colunas_dicionario is None:
+                    colunas_dicionario = _colunas_dicionario(bloco)
+                dicionarios = _Dicionarios(colunas_dicionario)
+                tabela = _para_tabela(bloco, dicionarios)
+                esquema = tabela.schema
+                escritor = _abrir_arrow(destino, esquema, formato, compressao, nivel)
+            else:
+                # Mantém o esquema do primeiro bloco (ex.: 'Data Término' toda vazia num bloco)
+                tabela = _para_tabela(bloco, dicionarios).cast(esquema)
+
+            _escrever_tabela(escritor, tabela, formato, linhas_por_grupo)
+            total += len(bloco)
+            yield total
+        if escritor is None:
+            # Nenhum bloco: ainda assim um arquivo válido (sem colunas), não um vazio
+            escritor = _abrir_arrow(destino, pa.schema([]), formato, compressao, nivel)
+    finally:
+        if escritor is not None:
+            escritor.close()
+
+def _abrir_arrow(destino, esquema, formato, compressao, nivel):
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+
+    if formato == 'parquet':
+        return pq.ParquetWriter(destino, esquema, compression=compressao or 'snappy', compression_level=nivel)
+    opcoes = ipc.IpcWriteOptions(compression=_codec_ipc(compressao or 'lz4', nivel), emit_dictionary_deltas=True)
+    return ipc.new_file(destino, esquema, options=opcoes)
+
+@medido('gravacao', lambda escritor, tabela, formato, *_: formato)
+def _escrever_tabela(escritor, tabela, formato, linhas_por_grupo):
+    if formato == 'parquet':
+        escritor.write_table(tabela, row_group_size=linhas_por_grupo)
+    else:
+        escritor.write_table(tabela, max_chunksize=linhas_por_grupo)
+
+def _codec_ipc(compressao, nivel):
+    import pyarrow as pa
+
+    if compressao == 'uncompressed':
+        return None
+    return pa.Codec(compressao, compression_level=nivel)
@@ -0,0 +1,77 @@
+"""Alocação de chaves únicas (ID Chamado, Ticket, Nota Fiscal) em blocos vetorizados.
+
+A chave de cada linha vem do seu número absoluto: embaralhado por uma
+permutação (`GeradorContador.indices_unicos`) ou, com `ordenavel=True`, em
+sequência. Por isso não há repetição entre blocos nem entre workers, sem
+nenhuma coordenação, e o formato de cada coluna pode ser ajustado com
+`definir_formato_id`.
+"""
+import numpy as np
+
+_DIGITOS = np.frombuffer(b'0123456789abcdefghijklmnopqrstuvwxyz', dtype=np.uint8)
+
+class FormatoId:
+    """Formato das chaves de uma coluna.
+
+    - `largura`/`base`: número de dígitos e base (10 ou 16, até 36); as chaves
+      vêm de [minimo, base**largura).
+    - `prefixo`: texto antes dos dígitos (ex.: 'NF-').
+    - `ordenavel`: chaves crescentes com o número da linha, em vez de embaralhadas.
+    - `numerico`: devolve inteiros em vez de texto (sem prefixo).
+    """
+
+    def __init__(self, largura=8, base=16, prefixo='', ordenavel=False, minimo=0, numerico=False):
+        if not 2 <= base <= len(_DIGITOS):
+            raise ValueError(f'base deve estar entre 2 e {len(_DIGITOS)}')
+        if numerico and prefixo:
+            raise ValueError('chaves numéricas não têm prefixo')
+        self.largura = largura
+        self.base = base
+        self.prefixo = prefixo
+        self.ordenavel = ordenavel
+        self.minimo = minimo
+        self.numerico = numerico
+
+    @property
+    def universo(self):
+        """Quantidade de chaves distintas disponíveis"""
+        return self.base ** self.largura - self.minimo
+
+    def __repr__(self):
+        return (f'FormatoId(largura={self.largura}, base={self.base}, prefixo={self.prefixo!r}, '
+                f'ordenavel={self.ordenavel}, minimo={self.minimo}, numerico={self.numerico})')
+
+# Coluna -> formato das chaves. ID Chamado e Ticket mantêm 8 dígitos hexadecimais
+# (4,3 bilhões de chaves); a Nota Fiscal tem até 9 dígitos, como a numeração da NF-e
+FORMATOS_ID = {
+    'ID Chamado': FormatoId(largura=8, base=16),
+    'Ticket': FormatoId(largura=8, base=16),
+    'Nota Fiscal': FormatoId(largura=9, base=10, minimo=1000, numerico=True),
+}
+
+def definir_formato_id(coluna, formato=None, **opcoes):
+    """Altera o formato das chaves de `coluna` (um `FormatoId` ou as opções dele)"""
+    FORMATOS_ID[coluna] = formato or FormatoId(**opcoes)
+
+def alocar_ids(rng, qtd, formato):
+    """Chaves únicas em todo o conjunto para as linhas de `rng` (um `GeradorContador`)"""
+    if formato.ordenavel:
+        numeros = rng.numeros_linhas()
+        if rng.inicio + qtd > formato.universo:
+            raise ValueError(f'Só há {formato.universo} chaves distintas para {rng.inicio + qtd} linhas')
+    else:
+        numeros = rng.indices_unicos(formato.universo)
+    numeros = numeros.astype(np.int64) + formato.minimo
+    if formato.numerico:
+        return numeros
+    return formatar_ids(numeros, formato.largura, formato.base, formato.prefixo)
+
+def formatar_ids(numeros, largura, base=16, prefixo=''):
+    """Textos de `largura` dígitos na `base`, com zeros à esquerda e `prefixo`"""
+    numeros = np.asarray(numeros, dtype=np.uint64)
+    potencias = np.uint64(base) ** np.arange(largura - 1, -1, -1, dtype=np.uint64)
+    texto = _DIGITOS[(numeros[:, None] // potencias) % np.uint64(base)]
+    digitos = texto.view(f'S{largura}').ravel().astype(f'U{largura}')
+    if prefixo:
+        digitos = np.char.add(prefixo, digitos)
+    return digitos.astype(object)
@@ -0,0 +1,262 @@
+"""Modo incremental: séries temporais atualizadas dia a dia, sem refazer o histórico.
+
+Vendas e Transporte têm histórico de uma data fixa (`INICIO_HISTORICO`) até
+hoje, e `Data Vencimento`/`Data Término` dependem do dia atual, então gerar
+de novo a cada dia refaz o histórico inteiro. No modo incremental cada dia
+recebe as próprias linhas, numeradas em sequência e com a data daquele dia, e
+um checkpoint pequeno guarda:
+
+- a semente e a próxima linha (todo o estado do gerador baseado em contador);
+- a última data gerada;
+- as linhas cujos campos dependentes do dia ainda vão mudar (parcelas em
+  aberto, entregas em trânsito), com a data da próxima mudança.
+
+Assim uma atualização custa O(dias novos + linhas que mudaram):
+
+    incremental = Incremental.carregar('vendas.json')  # ou Incremental('Vendas', seed=42)
+    novas, alteradas = incremental.atualizar()
+    incremental.salvar('vendas.json')
+"""
+import base64
+import json
+import os
+import zlib
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from .contador import GeradorContador, chave_linhas
+from .motor import (DIAS_POR_PARCELA, INICIO_HISTORICO, gerar_colunas, montar_dataframe,
+                    preparar_contexto, rotulo_area, semente_raiz)
+from .temporal import sazonalidade
+
+_SEM_MUDANCA = np.datetime64('NaT', 'D')
+
+def _mudanca_vendas(df, hoje):
+    """O vencimento avança uma parcela no dia em que vence, até a última"""
+    vencimento = df['Data Vencimento'].to_numpy().astype('datetime64[D]')
+    vezes = df['Nº Vezes'].to_numpy().astype(np.int64)
+    ultima = df['Data'].to_numpy().astype('datetime64[D]') + vezes * DIAS_POR_PARCELA
+    return np.where((vezes > 1) & (vencimento < ultima), vencimento, _SEM_MUDANCA)
+
+def _mudanca_transporte(df, hoje):
+    """O término aparece quando a entrega acaba; enquanto em trânsito, confere todo dia"""
+    em_transito = df['Data Término'].isna().to_numpy()
+    return np.where(em_transito, np.datetime64(hoje + timedelta(days=1), 'D'), _SEM_MUDANCA)
+
+def _terminou(df):
+    return df['Data Término'].notna().to_numpy()
+
+# (área, subárea) -> colunas que dependem do dia atual, data da próxima mudança
+# de cada linha (NaT quando a linha não muda mais) e, quando a data é só uma
+# nova conferência, quais linhas conferidas de fato mudaram
+INCREMENTAIS = {
+    ('Vendas', None): {
+        'mutaveis': ['Data Vencimento'],
+        'proxima_mudanca': _mudanca_vendas,
+    },
+    ('Logística', 'Transporte'): {
+        'mutaveis': ['Data Término'],
+        'proxima_mudanca': _mudanca_transporte,
+        'mudou': _terminou,
+    },
+}
+
+class Incremental:
+    """Checkpoint de um conjunto incremental e geração dos dias novos.
+
+    - `linhas_por_dia`: linhas de cada dia; com sazonalidade cadastrada para a
+      área, varia com o peso do dia e fica nesse valor em média.
+    - `inicio`: primeiro dia do histórico (padrão: `INICIO_HISTORICO` da área).
+    """
+
+    def __init__(self, area, subarea=None, seed=None, linhas_por_dia=1000, inicio=None):
+        if (area, subarea) not in INCREMENTAIS:
+            opcoes = ', '.join(rotulo_area(*chave) for chave in INCREMENTAIS)
+            raise ValueError(f'Modo incremental indisponível para {rotulo_area(area, subarea)} (opções: {opcoes})')
+        self.area = area
+        self.subarea = subarea
+        self.entropia = semente_raiz(seed).entropy
+        self.linhas_por_dia = linhas_por_dia
+        self.ultima_data = (inicio or INICIO_HISTORICO[(area, subarea)]) - timedelta(days=1)
+        self.proxima_linha = 0
+        self.pendentes = {
+            'linha': np.empty(0, dtype=np.int64),
+            'dia': np.empty(0, dtype='datetime64[D]'),
+            'mudanca': np.empty(0, dtype='datetime64[D]'),
+        }
+        self._contexto = None
+
+    # CHECKPOINT
+    def salvar(self, caminho):
+        """Grava o checkpoint em JSON (troca atômica do arquivo)"""
+        estado = {
+            'area': self.area,
+            'subarea': self.subarea,
+            'entropia': self.entropia,
+            'linhas_por_dia': self.linhas_por_dia,
+            'ultima_data': self.ultima_data.isoformat(),
+            'proxima_linha': self.proxima_linha,
+            'pendentes': {nome: _codificar(valores) for nome, valores in self.pendentes.items()},
+        }
+        temporario = f'{caminho}.tmp'
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump(estado, arquivo, ensure_ascii=False)
+        os.replace(temporario, caminho)
+
+    @classmethod
+    def carregar(cls, caminho):
+        """Lê um checkpoint gravado por `salvar`"""
+        with open(caminho, encoding='utf-8') as arquivo:
+            estado = json.load(arquivo)
+        incremental = cls(estado['area'], estado['subarea'], estado['entropia'], estado['linhas_por_dia'])
+        incremental.ultima_data = date.fromisoformat(estado['ultima_data'])
+        incremental.proxima_linha = estado['proxima_linha']
+        incremental.pendentes = {
+            nome: _decodificar(texto, incremental.pendentes[nome].dtype)
+            for nome, texto in estado['pendentes'].items()
+        }
+        return incremental
+
+    # GERAÇÃO
+    def atualizar(self, hoje=None, compacto=False):
+        """Linhas dos dias novos e colunas mutáveis das linhas que mudaram, como DataFrames"""
+        hoje = hoje or datetime.now().date()
+        alteradas = self.alteradas(hoje, compacto)
+        blocos = list(self.novas(hoje, compacto))
+        if not blocos:
+            return self._gerar(hoje, hoje, [], compacto), alteradas
+        novas = pd.concat(blocos)
+        novas.attrs['colunas_data'] = blocos[0].attrs['colunas_data']
+        return novas, alteradas
+
+    def novas(self, hoje=None, compacto=False):
+        """Gera um DataFrame por dia após `ultima_data` até `hoje`, avançando o checkpoint.
+
+        O índice é o número da linha; datas saem como datetime64 (`nativo`).
+        """
+        hoje = hoje or datetime.now().date()
+        dia = self.ultima_data + timedelta(days=1)
+        while dia <= hoje:
+            linhas = np.arange(self.proxima_linha, self.proxima_linha + self.linhas_do_dia(dia))
+            df = self._gerar(dia, hoje, linhas, compacto)
+            self._registrar(df, dia, hoje)
+            self.ultima_data = dia
+            self.proxima_linha += len(linhas)
+            yield df
+            dia += timedelta(days=1)
+
+    def alteradas(self, hoje=None, compacto=False):
+        """Colunas mutáveis das linhas pendentes cuja mudança chegou até `hoje` (índice = linha)"""
+        hoje = hoje or datetime.now().date()
+        especificacao = INCREMENTAIS[(self.area, self.subarea)]
+        mutaveis = especificacao['mutaveis']
+        vencidas = self.pendentes['mudanca'] <= np.datetime64(hoje, 'D')
+        linhas = self.pendentes['linha'][vencidas]
+        dias = self.pendentes['dia'][vencidas]
+        self.pendentes = {nome: valores[~vencidas] for nome, valores in self.pendentes.items()}
+
+        # Uma geração por dia de origem, já que a data da linha vem da janela do dia
+        ordem = np.argsort(dias, kind='stable')
+        linhas, dias = linhas[ordem], dias[ordem]
+        unicos, comecos = np.unique(dias, return_index=True)
+        partes = []
+        for dia, selecao in zip(unicos, np.split(linhas, comecos[1:])):
+            df = self._gerar(dia.item(), hoje, selecao, compacto)
+            self._registrar(df, dia.item(), hoje)
+            if 'mudou' in especificacao:
+                df = df[especificacao['mudou'](df)]
+            partes.append(df[mutaveis])
+        if not partes:
+            return self._gerar(hoje, hoje, [], compacto)[mutaveis]
+        return pd.concat(partes)
+
+    def linhas_do_dia(self, dia):
+        """Quantidade de linhas do dia, proporcional ao peso de `sazonalidade` se houver"""
+        pesos = sazonalidade(self.area, self.subarea)
+        if pesos is None or not pesos.por_dia:
+            return self.linhas_por_dia
+        media = np.mean(pesos.dia_semana or 1.0) * np.mean(pesos.mes or 1.0)
+        peso = pesos.pesos_dias(np.array([dia], dtype='datetime64[D]'))[0]
+        return int(round(self.linhas_por_dia * peso / media))
+
+    def _gerar(self, dia, hoje, linhas, compacto):
+        """Linhas `linhas` com data `dia`, com os campos dependentes calculados em `hoje`"""
+        raiz = semente_raiz(self.entropia)
+        if self._contexto is None:
+            self._contexto = preparar_contexto(self.area, self.subarea, raiz)
+        contexto = {**self._contexto, 'hoje': hoje, 'janela': (dia, dia)}
+        rng = GeradorContador.em_linhas(chave_linhas(raiz, self.area, self.subarea), linhas)
+        colunas = gerar_colunas(self.area, rng.qtd, self.subarea, rng, contexto, nativo=True,
+                                compacto=compacto)
+        df = montar_dataframe(colunas, 0, rng.qtd)
+        df.index = pd.Index(np.asarray(linhas, dtype=np.int64))
+        return df
+
+    def _registrar(self, df, dia, hoje):
+        """Acrescenta às pendentes as linhas de `df` (do dia `dia`) que ainda vão mudar"""
+        mudanca = INCREMENTAIS[(self.area, self.subarea)]['proxima_mudanca'](df, hoje)
+        abertas = ~np.isnat(mudanca)
+        novos = {
+            'linha': df.index.to_numpy()[abertas],
+            'dia': np.full(abertas.sum(), np.datetime64(dia, 'D')),
+            'mudanca': mudanca[abertas],
+        }
+        self.pendentes = {
+            nome: np.concatenate([valores, novos[nome]]) for nome, valores in self.pendentes.items()
+        }
+
+def _codificar(valores):
+    """Array como texto base64 de int64 comprimidos (datas viram dias desde 1970)"""
+    dados = np.ascontiguousarray(valores.view(np.int64) if valores.dtype.kind == 'M' else valores, np.int64)
+    return base64.b64encode(zlib.compress(dados.tobytes())).decode('ascii')
+
+def _decodificar(texto, dtype):
+    valores = np.frombuffer(zlib.decompress(base64.b64decode(texto)), dtype=np.int64)
+    return valores.astype(np.int64).view(dtype) if np.dtype(dtype).kind == 'M' else valores.astype(dtype)
+
+# CARGA EM BANCO
+def gravar_incremental(checkpoint, saida, area=None, subarea=None, seed=None, linhas_por_dia=1000,
+                       formato=None, tabela=None, hoje=None, compacto=False, linhas_por_transacao=None):
+    """Atualiza a tabela SQLite/DuckDB `saida` até `hoje` e grava o `checkpoint`.
+
+    Sem checkpoint, cria a tabela com o histórico desde o início da área; com
+    ele, grava as colunas mutáveis das linhas que mudaram e anexa só os dias
+    novos. A tabela ganha a coluna `Linha` (com índice UNIQUE) com o número da
+    linha, e o checkpoint só é gravado depois da carga. Se a carga falhar no meio,
+    a próxima execução parte do checkpoint anterior e gera de novo as mesmas
+    linhas, que substituem as já gravadas (upsert pela `Linha`) em vez de
+    duplicá-las. Devolve (linhas novas, linhas alteradas).
+    """
+    from .bancos import atualizar_duckdb, atualizar_sqlite, gravar_duckdb, gravar_sqlite, nome_tabela
+    from .exportacao import deduzir_formato
+
+    formato = formato or deduzir_formato(saida)[0]
+    cargas = {'sqlite': (gravar_sqlite, atualizar_sqlite), 'duckdb': (gravar_duckdb, atualizar_duckdb)}
+    if formato not in cargas:
+        raise ValueError(f"O modo incremental grava em {' ou '.join(cargas)}, não em {formato!r}")
+    gravar, atualizar = cargas[formato]
+
+    existente = os.path.exists(checkpoint)
+    if existente:
+        incremental = Incremental.carregar(checkpoint)
+        if area is not None and (area, subarea) != (incremental.area, incremental.subarea):
+            raise ValueError(f'O checkpoint {checkpoint} é de {rotulo_area(incremental.area, incremental.subarea)}')
+    else:
+        incremental = Incremental(area, subarea, seed, linhas_por_dia)
+    tabela = tabela or nome_tabela(incremental.area, incremental.subarea)
+
+    hoje = hoje or datetime.now().date()
+    alteradas = atualizar(saida, tabela, incremental.alteradas(hoje, compacto))
+    novas = gravar(
+        (_com_linha(bloco) for bloco in incremental.novas(hoje, compacto)), saida, tabela,
+        linhas_por_transacao=linhas_por_transacao, substituir=not existente, desativar_indices=False,
+        chave='Linha',
+    )
+    incremental.salvar(checkpoint)
+    return novas, alteradas
+
+def _com_linha(bloco):
+    bloco.insert(0, 'Linha', bloco.index.to_numpy(np.int64))
+    return bloco
@@ -0,0 +1,615 @@
+"""Motor de geração colunar: cada coluna é sorteada de uma vez com NumPy"""
+from datetime import datetime, timedelta, date, time
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .areas import AREAS
+from .cidades import matriz_distancias
+from .compacto import estreitar, indexar_categoria, indexar_objetos
+from .contador import GeradorContador, chave_linhas
+from .esquemas import (ESQUEMAS, Coluna, Esquema, datas, esquema, ids, inteiros, opcao, pool, registrados,
+                       uniforme)
+from .ids import FORMATOS_ID, alocar_ids
+from .perfil import medido, medir_alocacoes
+from .pools import amostrar, amostrar_categoria, combinar, universo_unico
+from .temporal import sazonalidade, sortear_datas, sortear_datas_horas
+
+# CADASTROS FIXOS DE VENDAS
+# Lista fixa de 10 vendedores (dimensão de vendedores do esquema relacional)
+VENDEDORES = [
+    "Ana", "Bruno", "Carla", "Diego", "Eduardo",
+    "Fernanda", "Gabriel", "Helena", "João", "Mariana"
+]
+
+# Produtos de informática com faixas de preço coerentes
+PRODUTOS_PRECOS = {
+    'Mouse': (30, 150),
+    'Teclado': (50, 300),
+    'Headset': (80, 400),
+    'Webcam': (100, 500),
+    'Memória RAM 8GB': (150, 300),
+    'Memória RAM 16GB': (250, 500),
+    'SSD 256GB': (180, 350),
+    'SSD 512GB': (300, 600),
+    'SSD 1TB': (450, 900),
+    'HD Externo 1TB': (250, 450),
+    'Placa de Vídeo GTX': (1200, 2500),
+    'Placa de Vídeo RTX': (2500, 5000),
+    'Processador Intel i5': (800, 1500),
+    'Processador Intel i7': (1500, 2500),
+    'Processador AMD Ryzen 5': (700, 1300),
+    'Processador AMD Ryzen 7': (1300, 2200),
+    'Fonte 500W': (200, 400),
+    'Fonte 700W': (350, 600),
+    'Placa-Mãe': (400, 1200),
+    'Gabinete': (150, 600),
+    'Monitor 24"': (600, 1200),
+    'Monitor 27"': (900, 2000),
+    'Notebook': (2000, 5000),
+    'Computador Desktop': (2500, 6000),
+    'Impressora': (400, 1500),
+    'Roteador Wi-Fi': (100, 400),
+    'Switch de Rede': (150, 500),
+    'Cabo HDMI': (20, 80),
+    'Cabo de Rede': (15, 50),
+    'Pendrive 32GB': (25, 60),
+    'Pendrive 64GB': (40, 90),
+    'Cooler para CPU': (50, 200),
+    'Cadeira Gamer': (600, 2000),
+    'Mesa para Computador': (300, 1200)
+}
+
+# Início fixo do histórico das áreas cuja janela de datas vai até hoje
+INICIO_HISTORICO = {
+    ('Vendas', None): date(2025, 1, 1),
+    ('Logística', 'Transporte'): date(2025, 3, 1),
+}
+
+# Intervalo entre parcelas das vendas parceladas
+DIAS_POR_PARCELA = 30
+
+# FUNÇÕES AUXILIARES DE SORTEIO VETORIZADO
+@medido('escolher')
+def escolher(rng, opcoes, qtd):
+    """Sorteia `qtd` valores de `opcoes` com probabilidade uniforme"""
+    return indexar_objetos(opcoes, rng.integers(0, len(opcoes), qtd))
+
+@medido('escolher_categoria')
+def escolher_categoria(rng, opcoes, qtd):
+    """Como `escolher`, mas devolve um `pd.Categorical` com as categorias de `opcoes`"""
+    return indexar_categoria(opcoes, rng.integers(0, len(opcoes), qtd))
+
+@medido('como_datas_exibicao')
+def como_datas_exibicao(datas):
+    """Converte um array datetime64[D] em objetos `date`, formato exibido na tabela"""
+    return datas.astype('datetime64[D]').astype(object)
+
+def datas_nativas(datas):
+    """Mantém as datas como datetime64[D] (saída nativa para Parquet/Arrow)"""
+    return datas
+
+def minutos_nativos(instantes):
+    """Trunca instantes em minutos, mantendo datetime64 (saída nativa para Parquet/Arrow)"""
+    return instantes.astype('datetime64[m]')
+
+@medido('formatar_minutos_exibicao')
+def formatar_minutos_exibicao(instantes):
+    """Formata um array datetime64 como 'AAAA-MM-DD HH:MM'"""
+    texto = np.datetime_as_string(instantes.astype('datetime64[m]'), unit='m')
+    return np.char.replace(texto, 'T', ' ').astype(object)
+
+def prefixar(prefixo, valores):
+    """Acrescenta `prefixo` a cada valor (arrays de objetos ou `pd.Categorical`)"""
+    if isinstance(valores, pd.Categorical):
+        return valores.rename_categories(prefixo + valores.categories)
+    return prefixo + valores
+
+# FROTA DE LOGÍSTICA/TRANSPORTE
+@medido('montar_frota')
+def montar_frota(rng, fake):
+    """Monta a frota fixa de 15 veículos com seus respectivos motoristas"""
+    # Modelos de veículos disponíveis
+    veiculos_scania = ['R 410', 'R 450', 'G 540', 'G 450', 'S 540', '770 S', 'P 320', 'P 410']
+    veiculos_mercedes = ['Accelo', 'Atego', 'Axor', 'Actros']
+
+    frota = []
+    for i in range(15):
+        # Gera nome completo sem títulos
+        nome_completo = f"{fake.first_name()} {fake.last_name()}"
+        placa = fake.license_plate()
+
+        # Alterna entre Scania e Mercedes (60% Scania, 40% Mercedes)
+        if rng.random() < 0.6:
+            marca = 'Scania'
+            modelo = veiculos_scania[rng.integers(len(veiculos_scania))]
+        else:
+            marca = 'Mercedes'
+            modelo = veiculos_mercedes[rng.integers(len(veiculos_mercedes))]
+
+        veiculo_nome = f"{marca} {modelo}"
+
+        frota.append({
+            'motorista': nome_completo,
+            'placa': placa,
+            'veiculo': veiculo_nome
+        })
+
+    return frota
+
+# LOTE DE GERAÇÃO
+def rotulo_area(area, subarea):
+    """'Área/Subárea' (ou só 'Área'), usado nos relatórios de perfil"""
+    return f'{area}/{subarea}' if subarea else area
+
+class Lote:
+    """Linhas de um bloco em geração, recebidas pelas funções das colunas de um `Esquema`.
+
+    Junta o gerador das linhas (`rng`, um `GeradorContador`), o contexto da
+    geração e os sorteios e formatos do modo de saída: com `nativo=True` datas
+    e horários saem como datetime64 em vez de objetos `date` e textos
+    formatados; com `compacto=True`, além disso, opções fixas e pools saem como
+    `pd.Categorical`. Os valores sorteados são os mesmos em todos os modos.
+    """
+
+    def __init__(self, rng, qtd, contexto, nativo=False, compacto=False, hoje=None, janela=None):
+        self.rng = rng
+        self.qtd = qtd
+        self.contexto = contexto
+        self.nativo = nativo
+        self.compacto = compacto
+        # Pesos temporais da área (None = datas uniformes), ver `temporal.definir_sazonalidade`
+        self.pesos_tempo = contexto.get('sazonalidade')
+        # Formato das chaves únicas (ID Chamado, Ticket, Nota Fiscal), ver `ids.definir_formato_id`
+        self.formatos_id = contexto.get('formatos_id', FORMATOS_ID)
+        # Data de referência das janelas relativas e dos campos que dependem do dia atual
+        self.hoje = hoje or contexto.get('hoje') or datetime.now().date()
+        # Janela do histórico das áreas com `INICIO_HISTORICO` (ver `incremental`)
+        self.janela = janela
+        if nativo or compacto:
+            self.datas, self.minutos = datas_nativas, minutos_nativos
+        else:
+            self.datas, self.minutos = como_datas_exibicao, formatar_minutos_exibicao
+        if compacto:
+            self._opcao, self._pool, self.indexar = escolher_categoria, amostrar_categoria, indexar_categoria
+        else:
+            self._opcao, self._pool, self.indexar = escolher, amostrar, indexar_objetos
+
+    def sonda(self):
+        """Lote de uma linha no mesmo modo e contexto, para medir os fluxos de um esquema"""
+        return Lote(GeradorContador(self.rng.chave, 0, 1), 1, self.contexto, self.nativo, self.compacto,
+                    self.hoje, self.janela)
+
+    def opcao(self, opcoes):
+        return self._opcao(self.rng, opcoes, self.qtd)
+
+    def pool(self, provedor):
+        return self._pool(self.rng, provedor, self.qtd)
+
+    def amostrar(self, provedor, unico=False):
+        """Valores do pool como array de objetos em todos os modos (ex.: CNPJ, partes de nomes)"""
+        return amostrar(self.rng, provedor, self.qtd, unico=unico)
+
+    def prefixar(self, prefixo, valores):
+        return prefixar(prefixo, valores)
+
+    def uniforme(self, baixo, alto):
+        return self.rng.uniform(baixo, alto, self.qtd)
+
+    def inteiros(self, baixo, alto):
+        return self.rng.integers(baixo, alto, self.qtd)
+
+    def aleatorio(self):
+        return self.rng.random(self.qtd)
+
+    def sortear_datas(self, inicio, fim):
+        return sortear_datas(self.rng, inicio, fim, self.qtd, self.pesos_tempo, self.hoje)
+
+    def sortear_datas_horas(self, inicio, fim):
+        return sortear_datas_horas(self.rng, inicio, fim, self.qtd, self.pesos_tempo)
+
+    def ids(self, coluna):
+        return alocar_ids(self.rng, self.qtd, self.formatos_id[coluna])
+
+# ÁREA: VENDAS
+PAGAMENTOS = ['Cartão', 'Dinheiro', 'Pix', 'Boleto']
+STATUS_VENDA = ['PAGO', 'NÃO PAGO', 'PENDENTE']
+# Desconto em PERCENTUAL (0% a 20%)
+DESCONTOS = np.array([0, 0, 0, 5, 10, 15, 20])
+_ROTULOS_DESCONTO = np.array([f"{d}%" for d in DESCONTOS], dtype=object)
+_NOMES_PRODUTOS = np.array(list(PRODUTOS_PRECOS), dtype=object)
+_FAIXAS_PRECO = np.array(list(PRODUTOS_PRECOS.values()), dtype=float)
+
+def _valor_venda(lote, valor_unitario, quantidade, idx_desconto):
+    valor_total = valor_unitario * quantidade
+    desconto_valor = np.round(valor_total * (DESCONTOS[idx_desconto] / 100), 2)
+    return np.round(valor_total - desconto_valor, 2)
+
+def _vencimento(lote, data_venda, num_vezes, a_vista):
+    """Pagamento à vista vence na data da compra; parcelado mostra a próxima parcela a
+    vencer, a primeira 30 dias após a compra (se todas já venceram, a última)"""
+    data_atual = np.datetime64(lote.hoje, 'D')
+    dias_desde_compra = (data_atual - data_venda).astype(np.int64)
+    parcelas_vencidas = dias_desde_compra // DIAS_POR_PARCELA
+    proxima_parcela = np.minimum(parcelas_vencidas + 1, num_vezes)
+    parcelado = ~a_vista & (num_vezes != 1)
+    return lote.datas(data_venda + np.where(parcelado, proxima_parcela * DIAS_POR_PARCELA, 0))
+
+VENDAS = Esquema('Vendas', colunas=[
+    # Datas a partir de janeiro de 2025 (`INICIO_HISTORICO`) até hoje
+    Coluna('data_venda', lambda lote: lote.sortear_datas(*lote.janela), oculta=True),
+    Coluna('Data', lambda lote, data: lote.datas(data), depende=['data_venda']),
+    # Nome sem títulos (apenas primeiro e último nome)
+    Coluna('Cliente', lambda lote: combinar(lote.amostrar('first_name'), lote.amostrar('last_name'))),
+    Coluna('idx_produto', lambda lote: lote.inteiros(0, len(_NOMES_PRODUTOS)), oculta=True),
+    Coluna('Produto', lambda lote, idx: lote.indexar(_NOMES_PRODUTOS, idx), depende=['idx_produto']),
+    Coluna('idx_pagamento', lambda lote: lote.inteiros(0, len(PAGAMENTOS)), oculta=True),
+    Coluna('a_vista', lambda lote, idx: np.isin(idx, [PAGAMENTOS.index('Pix'), PAGAMENTOS.index('Dinheiro')]),
+           depende=['idx_pagamento'], oculta=True),
+    Coluna('Forma de Pagamento', lambda lote, idx: lote.indexar(PAGAMENTOS, idx), depende=['idx_pagamento']),
+    # Pix/Dinheiro são sempre PAGO em 1 vez, as demais formas sorteiam status e 1 a 12 parcelas
+    Coluna('Status', lambda lote, a_vista: lote.indexar(
+        STATUS_VENDA, np.where(a_vista, 0, lote.inteiros(0, len(STATUS_VENDA)))), depende=['a_vista']),
+    Coluna('Nº Vezes', lambda lote, a_vista: np.where(a_vista, 1, lote.inteiros(1, 13)), depende=['a_vista']),
+    inteiros('Quantidade', 1, 6),
+    # Valor unitário dentro da faixa do produto
+    Coluna('valor_unitario', lambda lote, idx: np.round(lote.uniforme(_FAIXAS_PRECO[idx, 0], _FAIXAS_PRECO[idx, 1]), 2),
+           depende=['idx_produto'], oculta=True),
+    Coluna('idx_desconto', lambda lote: lote.inteiros(0, len(DESCONTOS)), oculta=True),
+    Coluna('Valor', _valor_venda, depende=['valor_unitario', 'Quantidade', 'idx_desconto']),
+    # Rótulo '5%' na tabela; no modo compacto a coluna fica com o percentual numérico
+    Coluna('Desconto', lambda lote, idx: (DESCONTOS if lote.compacto else _ROTULOS_DESCONTO)[idx],
+           depende=['idx_desconto']),
+    Coluna('Data Vencimento', _vencimento, depende=['data_venda', 'Nº Vezes', 'a_vista']),
+    pool('Vendedor', 'first_name'),
+], ordem=['Data', 'Cliente', 'Produto', 'Quantidade', 'Valor', 'Desconto', 'Forma de Pagamento', 'Nº Vezes',
+          'Data Vencimento', 'Status', 'Vendedor'])
+
+# ÁREA: SAÚDE
+SAUDE = Esquema('Saúde', colunas=[
+    datas('Data da Consulta', '-6M', 'today'),
+    pool('Paciente', 'name'),
+    opcao('Especialidade', ['Clínico Geral', 'Cardiologia', 'Ortopedia', 'Dermatologia', 'Pediatria']),
+    opcao('Convênio', ['Particular', 'Plano A', 'Plano B', 'SUS']),
+    uniforme('Valor (R$)', 100, 500),
+    pool('Médico', 'last_name', prefixo='Dr(a). '),
+])
+
+# ÁREA: RH
+RH = Esquema('RH', colunas=[
+    pool('Nome', 'name'),
+    opcao('Cargo', ['Coordenador', 'Gerente', 'Técnico', 'Pleno', 'Júnior', 'Sênior']),
+    opcao('Departamento', ['TI', 'Financeiro', 'Vendas', 'Marketing', 'Operações']),
+    datas('Data de Admissão', '-5y', 'today'),
+    uniforme('Salário (R$)', 2000, 15000),
+])
+
+# ÁREA: FORNECEDORES
+FORNECEDORES = Esquema('Fornecedores', colunas=[
+    pool('Razão Social', 'company'),
+    pool('Nome Fantasia', 'company_suffix'),
+    pool('Endereço', 'street_address'),
+    pool('Cidade', 'city'),
+    pool('Bairro', 'street_name'),
+    pool('Estado', 'state_abbr'),
+    pool('CEP', 'postcode'),
+    Coluna('CNPJ', lambda lote: lote.amostrar('cnpj', unico=True), universo=lambda contexto: universo_unico('cnpj')),
+    pool('Numero de Contato', 'phone_number'),
+    pool('Email de contato', 'company_email'),
+])
+
+# ÁREA: LOGÍSTICA
+TIPOS_COMBUSTIVEL = np.array(['Óleo Diesel S10', 'Óleo Diesel S500'], dtype=object)
+
+# Preços médios do diesel em janeiro de 2026 (R$ por litro), na ordem de
+# `TIPOS_COMBUSTIVEL`. S10 é ligeiramente mais caro que S500
+PRECO_DIESEL = np.array([
+    (6.20, 6.80),
+    (6.00, 6.60)
+])
+
+def _duracao_viagem(lote, dias_previsao):
+    """70% de chance de entregar no prazo ou antes (1 até a previsão),
+    30% de atrasar (1 a 5 dias além da previsão)"""
+    no_prazo = lote.aleatorio() < 0.7
+    return np.where(
+        no_prazo,
+        lote.inteiros(1, dias_previsao + 1),
+        dias_previsao + lote.inteiros(1, 6)
+    )
+
+def _termino(lote, data_inicio, dias_duracao):
+    """Data de término, em branco se ainda estiver no futuro"""
+    data_termino = data_inicio + dias_duracao
+    data_termino_display = lote.datas(data_termino.copy())
+    data_termino_display[data_termino > np.datetime64(lote.hoje, 'D')] = None
+    return data_termino_display
+
+def _frota(campo):
+    # Frota fixa de 15 veículos, a mesma em todos os blocos da geração
+    return lambda lote, idx: lote.indexar(np.array([v[campo] for v in lote.contexto['frota']], dtype=object), idx)
+
+def _consumo_medio(lote, distancia_km):
+    """Consumo médio de caminhão: 2.5 a 4 km/litro. Quanto maior a distância,
+    melhor a média (viagens longas em rodovia)"""
+    consumo_min = np.select([distancia_km > 1000, distancia_km > 500], [3.2, 2.8], 2.5)
+    consumo_max = np.select([distancia_km > 1000, distancia_km > 500], [4.0, 3.5], 3.2)
+    return lote.uniforme(consumo_min, consumo_max)
+
+def _valor_litro(lote, idx_combustivel):
+    faixa_litro = PRECO_DIESEL[idx_combustivel]
+    return np.round(lote.uniforme(faixa_litro[:, 0], faixa_litro[:, 1]), 2)
+
+def _cidade(lote, idx):
+    return lote.indexar(np.array(matriz_distancias().cidades, dtype=object), idx)
+
+def _coordenada(eixo):
+    return lambda lote, idx: matriz_distancias().coords[idx, eixo]
+
+def _destino(lote, idx_origem):
+    """Destino entre as n-1 cidades diferentes da origem, deslocando o índice da origem"""
+    n_cidades = len(matriz_distancias().cidades)
+    return (idx_origem + lote.inteiros(1, n_cidades)) % n_cidades
+
+TRANSPORTE = Esquema('Logística', 'Transporte', colunas=[
+    # Data início a partir de março/2025 (`INICIO_HISTORICO`)
+    Coluna('data_inicio', lambda lote: lote.sortear_datas(*lote.janela), oculta=True),
+    Coluna('Data Início', lambda lote, data: lote.datas(data), depende=['data_inicio']),
+    # Previsão de término entre 1 e 10 dias após o início
+    Coluna('dias_previsao', lambda lote: lote.inteiros(1, 11), oculta=True),
+    Coluna('Previsão Término', lambda lote, data, dias: lote.datas(data + dias),
+           depende=['data_inicio', 'dias_previsao']),
+    # O término real pode ser antes ou depois da previsão
+    Coluna('dias_duracao', _duracao_viagem, depende=['dias_previsao'], oculta=True),
+    Coluna('Data Término', _termino, depende=['data_inicio', 'dias_duracao']),
+    # Veículo da frota (motorista e placa juntos)
+    Coluna('idx_veiculo', lambda lote: lote.inteiros(0, len(lote.contexto['frota'])), oculta=True),
+    Coluna('Motorista', _frota('motorista'), depende=['idx_veiculo']),
+    Coluna('Veículo', _frota('veiculo'), depende=['idx_veiculo']),
+    Coluna('Placa Veículo', _frota('placa'), depende=['idx_veiculo']),
+    # Cidades de origem e destino diferentes
+    Coluna('idx_origem', lambda lote: lote.inteiros(0, len(matriz_distancias().cidades)), oculta=True),
+    Coluna('idx_destino', _destino, depende=['idx_origem'], oculta=True),
+    Coluna('Cidade Origem', _cidade, depende=['idx_origem']),
+    Coluna('Latitude Origem', _coordenada(0), depende=['idx_origem']),
+    Coluna('Longitude Origem', _coordenada(1), depende=['idx_origem']),
+    Coluna('Cidade Destino', _cidade, depende=['idx_destino']),
+    Coluna('Latitude Destino', _coordenada(0), depende=['idx_destino']),
+    Coluna('Longitude Destino', _coordenada(1), depende=['idx_destino']),
+    # Distância real entre as cidades, consultada na matriz pré-calculada
+    Coluna('Distância (KM)', lambda lote, origem, destino: matriz_distancias().distancias(origem, destino),
+           depende=['idx_origem', 'idx_destino']),
+    Coluna('consumo_medio', _consumo_medio, depende=['Distância (KM)'], oculta=True),
+    # Litros necessários, com margem de 5-15% para abastecimentos extras
+    Coluna('Litros', lambda lote, distancia, consumo: np.round(distancia / consumo * lote.uniforme(1.05, 1.15), 2),
+           depende=['Distância (KM)', 'consumo_medio']),
+    # Tipo de combustível (95% S10, 5% S500 para caminhões modernos)
+    Coluna('idx_combustivel', lambda lote: (lote.aleatorio() >= 0.95).astype(np.intp), oculta=True),
+    Coluna('Combustível', lambda lote, idx: lote.indexar(TIPOS_COMBUSTIVEL, idx), depende=['idx_combustivel']),
+    Coluna('Valor do Litro (R$)', _valor_litro, depende=['idx_combustivel']),
+    opcao('Tipo Transporte', ['Rodoviário', 'Aéreo', 'Marítimo']),
+    uniforme('Valor Mercadoria (R$)', 1000, 50000),
+], ordem=['Data Início', 'Previsão Término', 'Data Término', 'Motorista', 'Veículo', 'Tipo Transporte',
+          'Placa Veículo', 'Cidade Origem', 'Latitude Origem', 'Longitude Origem', 'Cidade Destino',
+          'Latitude Destino', 'Longitude Destino', 'Distância (KM)', 'Litros', 'Combustível',
+          'Valor do Litro (R$)', 'Valor Mercadoria (R$)'],
+   contexto=lambda rng, fake: {'frota': montar_frota(rng, fake)})
+
+ESTOQUE = Esquema('Logística', 'Estoque', colunas=[
+    opcao('Produto', ['Teclado', 'Mouse', 'Monitor', 'Cabo HDMI', 'Notebook']),
+    inteiros('Quantidade', 10, 501),
+    pool('Localização', 'city'),
+    datas('Data Atualização', '-3M', 'today'),
+])
+
+DISTRIBUICAO = Esquema('Logística', 'Distribuição', colunas=[
+    opcao('Centro Distribuição', ['SP', 'RJ', 'MG', 'PR', 'RS']),
+    inteiros('Pedidos Enviados', 50, 501),
+    inteiros('Pedidos Pendentes', 0, 51),
+    datas('Data', '-2M', 'today'),
+])
+
+# ÁREA: FINANCEIRO
+CONTAS_A_PAGAR = Esquema('Financeiro', 'Contas a Pagar', colunas=[
+    datas('Data Vencimento', '-1M', '+1M'),
+    pool('Fornecedor', 'company'),
+    opcao('Categoria', ['Fornecedores', 'Serviços', 'Impostos']),
+    uniforme('Valor (R$)', 500, 10000),
+    opcao('Pago', ['Sim', 'Não']),
+])
+
+CONTAS_A_RECEBER = Esquema('Financeiro', 'Contas a Receber', colunas=[
+    datas('Data Recebimento', '-1M', 'today'),
+    # Carteira fixa de 20 clientes, a mesma em todos os blocos da geração
+    Coluna('Cliente', lambda lote: lote.opcao(lote.contexto['clientes'])),
+    ids('Nota Fiscal'),
+    uniforme('Valor (R$)', 1000, 20000),
+    opcao('Status', ['Pago', 'Em Aberto', 'Atrasado']),
+], contexto=lambda rng, fake: {'clientes': [fake.company() for _ in range(20)]})
+
+FLUXO_DE_CAIXA = Esquema('Financeiro', 'Fluxo de Caixa', colunas=[
+    opcao('Tipo', ['Entrada', 'Saída']),
+    Coluna('valor', lambda lote: lote.uniforme(500, 10000), oculta=True),
+    datas('Data', '-2M', 'today'),
+    pool('Descrição', 'sentence'),
+    # Saídas com valor negativo
+    Coluna('Valor (R$)', lambda lote, tipo, valor: np.round(np.where(tipo == 'Entrada', valor, -valor), 2),
+           depende=['Tipo', 'valor']),
+], ordem=['Data', 'Tipo', 'Descrição', 'Valor (R$)'])
+
+# ÁREA: SLA DE ATENDIMENTO
+def _abertura(lote):
+    """Instante de abertura nos 30 dias antes de `hoje` (até ontem)"""
+    agora = datetime.combine(lote.hoje, time())
+    return lote.sortear_datas_horas(agora - timedelta(days=30), agora - timedelta(days=1))
+
+SUPORTE_TECNICO = Esquema('SLA de Atendimento', 'Suporte Técnico', colunas=[
+    Coluna('abertura', _abertura, oculta=True),
+    inteiros('Tempo (min)', 15, 241),
+    ids('ID Chamado'),
+    pool('Cliente', 'company'),
+    Coluna('Data Abertura', lambda lote, inicio: lote.minutos(inicio), depende=['abertura']),
+    Coluna('Data Fechamento', lambda lote, inicio, minutos: lote.minutos(inicio + minutos.astype('timedelta64[m]')),
+           depende=['abertura', 'Tempo (min)']),
+    pool('Atendente', 'first_name'),
+    opcao('Status', ['Resolvido', 'Em Andamento', 'Cancelado']),
+], ordem=['ID Chamado', 'Cliente', 'Data Abertura', 'Data Fechamento', 'Tempo (min)', 'Atendente', 'Status'])
+
+HELPDESK = Esquema('SLA de Atendimento', 'Helpdesk', colunas=[
+    ids('Ticket'),
+    pool('Usuário', 'name'),
+    opcao('Categoria', ['Hardware', 'Software', 'Rede', 'E-mail']),
+    opcao('Prioridade', ['Baixa', 'Média', 'Alta']),
+    opcao('Status', ['Fechado', 'Aberto', 'Em Análise']),
+])
+
+MANUTENCAO = Esquema('SLA de Atendimento', 'Manutenção', colunas=[
+    pool('Equipamento', 'word'),
+    opcao('Tipo', ['Preventiva', 'Corretiva']),
+    pool('Responsável', 'name'),
+    datas('Data Execução', '-3M', 'today'),
+    uniforme('Custo (R$)', 300, 8000),
+])
+
+for _esquema in (VENDAS, SAUDE, RH, FORNECEDORES, TRANSPORTE, ESTOQUE, DISTRIBUICAO, CONTAS_A_PAGAR,
+                 CONTAS_A_RECEBER, FLUXO_DE_CAIXA, SUPORTE_TECNICO, HELPDESK, MANUTENCAO):
+    ESQUEMAS.setdefault((_esquema.area, _esquema.subarea), _esquema)
+
+# FUNÇÃO PRINCIPAL
+@medido('colunas', lambda area, qtd, subarea, *_, **__: rotulo_area(area, subarea))
+def gerar_colunas(area, qtd, subarea, rng, contexto, nativo=False, compacto=False, colunas=None):
+    """Gera as colunas de `qtd` linhas da área/subárea como arrays NumPy/listas.
+
+    Executa o plano do esquema registrado da área (ver `esquemas`), só com
+    `colunas` (e o que elas exigem) se informadas. `contexto` é o estado
+    compartilhado por todos os blocos de uma geração, montado por
+    `preparar_contexto`. Com `nativo=True` datas e horários saem como
+    datetime64 em vez de objetos `date` e textos formatados. Com
+    `compacto=True`, além disso, colunas de opções fixas e de pools saem como
+    `pd.Categorical`, `Desconto` como percentual e os números em tipos estreitos
+    (ver `compacto.TIPOS_COMPACTOS`); os valores sorteados são os mesmos.
+    """
+    # `janela` restringe o histórico de Vendas/Transporte (ver `incremental`)
+    janela = contexto.get('janela') or (INICIO_HISTORICO.get((area, subarea)), 'today')
+    lote = Lote(rng, qtd, contexto, nativo, compacto, janela=janela)
+    esquema_area = esquema(area, subarea)
+    resultado = esquema_area.plano(lote, colunas).executar(lote)
+    if compacto:
+        # `TIPOS_COMPACTOS` descreve as faixas das áreas padrão, não as de `registrar_area`
+        estreitar(resultado, lote.formatos_id, esquema_area.faixas(),
+                  padrao=all(registrado is not esquema_area for registrado in registrados()))
+    return resultado
+
+# SEMENTES E CONTEXTO
+def semente_raiz(seed):
+    """SeedSequence raiz da geração; com `seed=None` usa entropia do sistema"""
+    return np.random.SeedSequence(seed)
+
+def semente_contexto(raiz):
+    """Semente do estado compartilhado (frota, clientes) derivada da raiz"""
+    return np.random.SeedSequence(raiz.entropy, spawn_key=(0,))
+
+@lru_cache(maxsize=None)
+def _faker():
+    """Instância Faker do processo, criada só quando o contexto precisa dela"""
+    from faker import Faker
+
+    return Faker('pt_BR')
+
+def geradores(semente):
+    """Gerador NumPy e instância Faker reposicionados a partir de `semente`"""
+    fake = _faker()
+    fake.seed_instance(int(semente.generate_state(1)[0]))
+    return np.random.default_rng(semente), fake
+
+@medido('contexto')
+def preparar_contexto(area, subarea, raiz, hoje=None):
+    """Sorteia o estado que deve ser o mesmo em todos os blocos da geração.
+
+    `hoje` (padrão: a data atual) fica fixo no contexto, então todos os blocos e
+    workers usam o mesmo dia nas janelas relativas.
+    """
+    rng, fake = geradores(semente_contexto(raiz))
+    contexto = {'sazonalidade': sazonalidade(area, subarea), 'formatos_id': dict(FORMATOS_ID),
+                'hoje': hoje or datetime.now().date()}
+    proprio = esquema(area, subarea).contexto
+    if proprio is not None:
+        contexto.update(proprio(rng, fake))
+    return contexto
+
+def limite_linhas(area, subarea=None):
+    """Máximo de linhas de um conjunto da área/subárea (None = sem limite).
+
+    Vem das colunas sem repetição (CNPJ, `ID Chamado`, `Ticket`, `Nota Fiscal`),
+    com os formatos atuais de `ids.definir_formato_id`.
+    """
+    return esquema(area, subarea).limite_linhas({'formatos_id': FORMATOS_ID})
+
+def gerar_bloco(area, inicio, qtd, subarea, raiz, contexto, nativo=False, compacto=False, colunas=None):
+    """Gera o DataFrame das linhas [inicio, inicio + qtd).
+
+    Cada linha é função só de (seed, área, subárea, número da linha), então
+    qualquer faixa pode ser gerada isoladamente. As colunas só de data ficam
+    listadas em `df.attrs['colunas_data']`, já que o pandas guarda datetime64[D]
+    com resolução de segundos. Com `qtd=0`, o DataFrame vazio tem as colunas e
+    os tipos de um bloco com linhas (para Parquet/Feather gravarem o esquema).
+    """
+    if qtd == 0:
+        # Colunas de texto vazias viriam como object, sem tipo para o Arrow
+        vazio = gerar_bloco(area, 0, 1, subarea, raiz, contexto, nativo, compacto, colunas).iloc[:0]
+        vazio.index = pd.RangeIndex(inicio, inicio)
+        return vazio
+    with medir_alocacoes(rotulo_area(area, subarea)):
+        rng = GeradorContador(chave_linhas(raiz, area, subarea), inicio, qtd)
+        valores = gerar_colunas(area, qtd, subarea, rng, contexto, nativo, compacto, colunas)
+        df = montar_dataframe(valores, inicio, qtd)
+    return df
+
+@medido('dataframe')
+def montar_dataframe(colunas, inicio, qtd):
+    """DataFrame das colunas geradas, indexado pelo número da linha"""
+    df = pd.DataFrame(colunas, index=pd.RangeIndex(inicio, inicio + qtd))
+    df.attrs['colunas_data'] = [
+        nome for nome, valores in colunas.items()
+        if getattr(valores, 'dtype', None) == np.dtype('datetime64[D]')
+    ]
+    return df
+
+def gerar_dados(area, qtd, subarea=None, seed=None, nativo=False, compacto=False, colunas=None, hoje=None):
+    """Gera `qtd` linhas da área/subárea, sorteando cada coluna de uma vez com NumPy.
+
+    Com `compacto=True` usa categorias, datas nativas e tipos numéricos
+    estreitos (ver `gerador_dados.compacto`). Com `colunas`, gera só essas
+    colunas (e as de que dependem), com os mesmos valores da geração completa.
+    `hoje` fixa o dia das janelas relativas ('today', '-6M'; padrão: a data atual).
+    """
+    return gerar_linhas(area, 0, qtd, subarea, seed, nativo, compacto, colunas, hoje)
+
+def gerar_linhas(area, inicio, fim, subarea=None, seed=None, nativo=False, compacto=False, colunas=None,
+                 hoje=None):
+    """Gera só as linhas [inicio, fim) do conjunto de (seed, área, subárea).
+
+    Custa O(fim - inicio): a página 40.000 de um conjunto virtual de 10 milhões
+    de linhas é idêntica à mesma fatia de `gerar_dados(..., 10_000_000)`. O
+    índice do DataFrame é o número da linha.
+    """
+    raiz = semente_raiz(seed)
+    contexto = preparar_contexto(area, subarea, raiz, hoje)
+    return gerar_bloco(area, inicio, fim - inicio, subarea, raiz, contexto, nativo, compacto, colunas)
+
+def gerar_em_blocos(area, qtd, subarea=None, seed=None, tamanho_bloco=100_000, nativo=False,
+                    compacto=False, colunas=None, hoje=None):
+    """Gera `qtd` linhas em DataFrames de até `tamanho_bloco` linhas.
+
+    Só um bloco fica em memória por vez, então o pico de memória depende de
+    `tamanho_bloco` e não de `qtd`. As linhas não dependem da divisão em blocos:
+    o resultado concatenado é o mesmo de `gerar_dados` e de
+    `gerar_em_blocos_paralelo` com a mesma `seed`. Com `qtd=0` sai um único
+    bloco vazio, que leva as colunas e os tipos ao arquivo gravado.
+    """
+    raiz = semente_raiz(seed)
+    contexto = preparar_contexto(area, subarea, raiz, hoje)
+    for inicio in range(0, qtd or 1, tamanho_bloco):
+        n = min(tamanho_bloco, qtd - inicio)
+        yield gerar_bloco(area, inicio, n, subarea, raiz, contexto, nativo, compacto, colunas)
@@ -0,0 +1,114 @@
+"""Geração em paralelo: blocos distribuídos num pool de processos"""
+import os
+import pickle
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .motor import gerar_bloco, preparar_contexto, semente_raiz
+
+# CONFIGURAÇÃO DOS WORKERS
+# Sazonalidade e formatos de ID seguem no `contexto` de cada geração; o que muda
+# as linhas mas vive em variáveis do módulo (áreas registradas, cidades, tamanhos
+# dos pools) é reproduzido em cada worker ao iniciar o pool. Sem isso, com o
+# método 'spawn' (padrão no macOS e no Windows) os workers só veriam os padrões.
+def configuracao_workers():
+    """Áreas de `registrar_area`, cidades de `adicionar_cidade` e tamanhos de `definir_tamanho_pool`.
+
+    Esquemas que não podem ser serializados ficam de fora (ver `verificar_envio`).
+    """
+    from .cidades import CIDADES_COORDS
+    from .esquemas import registrados
+    from .pools import TAMANHOS_POOL
+
+    esquemas = [esquema for esquema in registrados() if _erro_envio(esquema) is None]
+    return {'esquemas': esquemas, 'cidades': dict(CIDADES_COORDS), 'tamanhos_pool': dict(TAMANHOS_POOL)}
+
+def verificar_envio(area, subarea=None):
+    """Erro claro se a área foi registrada com um esquema que não chega aos workers"""
+    from .esquemas import registrados
+
+    for esquema in registrados():
+        if (esquema.area, esquema.subarea) == (area, subarea):
+            erro = _erro_envio(esquema)
+            if erro is not None:
+                raise ValueError(
+                    f'O esquema de {esquema.rotulo} não pode ser enviado aos workers ({erro}); '
+                    'use funções do nível do módulo nas colunas, em vez de lambdas ou funções locais'
+                ) from erro
+
+def _erro_envio(esquema):
+    try:
+        pickle.dumps(esquema)
+    except (pickle.PicklingError, AttributeError, TypeError) as erro:
+        return erro
+    return None
+
+def configurar_worker(configuracao):
+    """`initializer` dos pools de processos: aplica `configuracao_workers()` do processo principal"""
+    from .cidades import CIDADES_COORDS, matriz_distancias
+    from .esquemas import registrar_area
+    from .pools import TAMANHOS_POOL, definir_tamanho_pool
+
+    for esquema in configuracao['esquemas']:
+        registrar_area(esquema)
+    # Cidades novas na mesma ordem do processo principal, que é a dos índices da matriz
+    novas = {nome: coords for nome, coords in configuracao['cidades'].items() if nome not in CIDADES_COORDS}
+    if novas:
+        CIDADES_COORDS.update(novas)
+        if matriz_distancias.cache_info().currsize:
+            matriz_distancias().adicionar_cidades(novas)
+    for provedor, tamanho in configuracao['tamanhos_pool'].items():
+        if TAMANHOS_POOL.get(provedor) != tamanho:
+            definir_tamanho_pool(provedor, tamanho)
+
+def pool_processos(workers, configuracao=None, **opcoes):
+    """`ProcessPoolExecutor` cujos workers geram as mesmas linhas que este processo"""
+    return ProcessPoolExecutor(max_workers=workers, initializer=configurar_worker,
+                               initargs=(configuracao or configuracao_workers(),), **opcoes)
+
+# GERAÇÃO
+def gerar_em_blocos_paralelo(area, qtd, subarea=None, seed=None, tamanho_bloco=100_000,
+                             workers=None, nativo=False, compacto=False, hoje=None):
+    """Gera os mesmos blocos de `gerar_em_blocos`, distribuídos em `workers` processos.
+
+    Cada linha depende só de `seed` e do seu número (ver `gerar_linhas`), então
+    os workers geram faixas disjuntas sem coordenação e a saída é idêntica byte
+    a byte à de `gerar_em_blocos`, qualquer que seja o número de workers ou o
+    tamanho dos blocos. Os blocos são devolvidos em ordem e no máximo
+    `2 * workers` ficam em andamento ao mesmo tempo.
+    """
+    verificar_envio(area, subarea)
+    workers = workers or os.cpu_count() or 1
+    raiz = semente_raiz(seed)
+    contexto = preparar_contexto(area, subarea, raiz, hoje)
+    tarefas = (
+        (area, inicio, min(tamanho_bloco, qtd - inicio), subarea, raiz, contexto, nativo, compacto)
+        # Com qtd=0, um bloco vazio, como em `gerar_em_blocos`
+        for inicio in range(0, qtd or 1, tamanho_bloco)
+    )
+
+    with pool_processos(workers) as pool:
+        pendentes = deque()
+        for tarefa in tarefas:
+            pendentes.append(pool.submit(gerar_bloco, *tarefa))
+            if len(pendentes) >= 2 * workers:
+                yield pendentes.popleft().result()
+        while pendentes:
+            yield pendentes.popleft().result()
+
+def gerar_dados_paralelo(area, qtd, subarea=None, seed=None, workers=None, tamanho_bloco=None,
+                         nativo=False, compacto=False, hoje=None):
+    """Versão paralela de `gerar_dados`, que junta os blocos num único DataFrame.
+
+    Sem `tamanho_bloco`, o tamanho é escolhido a partir de `workers`; a saída é a
+    mesma de `gerar_dados` com a mesma `seed`.
+    """
+    workers = workers or os.cpu_count() or 1
+    if tamanho_bloco is None:
+        # Blocos suficientes para manter todos os workers ocupados
+        tamanho_bloco = max(10_000, -(-qtd // (4 * workers)))
+    blocos = list(gerar_em_blocos_paralelo(area, qtd, subarea, seed, tamanho_bloco, workers,
+                                           nativo, compacto, hoje))
+    return pd.concat(blocos, ignore_index=True)
@@ -0,0 +1,164 @@
+"""Instrumentação opcional da geração: tempo e chamadas por etapa/provedor.
+
+Sem perfil ativo, as funções decoradas com `medido` só fazem uma leitura
+de `ContextVar` antes de chamar a função original, e as chamadas
+acontecem por coluna/bloco (nunca por linha), então o custo é desprezível.
+
+    with perfilar(memoria=True) as perfil:
+        gerar_dados('Logística', 1_000_000, 'Transporte')
+    print(perfil.texto())
+
+O perfil cobre só a thread (ou tarefa asyncio) que abriu o `perfilar`: cada
+sessão da interface e cada tarefa em segundo plano tem o seu, e blocos
+`perfilar` sobrepostos em threads diferentes não se misturam. O trabalho
+feito em outras threads e nos processos do pool (`workers` > 1) não aparece.
+"""
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Perfil em coleta no contexto atual (None = instrumentação desligada)
+_ativo = ContextVar('gerador_dados_perfil', default=None)
+
+# Perfis com `memoria=True` em andamento; o tracemalloc (global no processo)
+# fica ligado até o último terminar
+_usando_tracemalloc = 0
+_lock_tracemalloc = threading.Lock()
+_iniciado_aqui = False
+
+class Perfil:
+    """Tempos e contagens coletados durante um `perfilar`.
+
+    Os tempos são inclusivos: o de `colunas:Vendas` inclui os de `pool:name`,
+    `sortear_datas` etc. chamados dentro dele.
+    """
+
+    def __init__(self, memoria=False):
+        self.memoria = memoria
+        self.chamadas = {}
+        self.alocacoes = {}
+        self.inicio = time.perf_counter()
+        self.fim = None
+
+    def registrar(self, rotulo, segundos):
+        chamadas, total = self.chamadas.get(rotulo, (0, 0.0))
+        self.chamadas[rotulo] = (chamadas + 1, total + segundos)
+
+    def registrar_alocacoes(self, rotulo, pico_bytes, blocos):
+        atual = self.alocacoes.setdefault(rotulo, {'blocos': 0, 'pico_bytes': 0, 'chamadas': 0})
+        atual['blocos'] += blocos
+        atual['pico_bytes'] = max(atual['pico_bytes'], pico_bytes)
+        atual['chamadas'] += 1
+
+    def relatorio(self):
+        """Relatório estruturado (dicionário serializável em JSON)"""
+        fim = self.fim if self.fim is not None else time.perf_counter()
+        chamadas = [
+            {
+                'nome': rotulo,
+                'chamadas': n,
+                'segundos': round(total, 6),
+                'segundos_por_chamada': round(total / n, 9),
+            }
+            for rotulo, (n, total) in self.chamadas.items()
+        ]
+        chamadas.sort(key=lambda item: item['segundos'], reverse=True)
+        return {
+            'segundos_total': round(fim - self.inicio, 6),
+            'chamadas': chamadas,
+            'alocacoes': self.alocacoes,
+        }
+
+    def texto(self, limite=25):
+        """Tabela legível com as etapas mais custosas"""
+        relatorio = self.relatorio()
+        linhas = [f"Tempo total: {relatorio['segundos_total']:.3f}s",
+                  f"{'etapa/provedor':<40} {'chamadas':>9} {'segundos':>10}"]
+        for item in relatorio['chamadas'][:limite]:
+            linhas.append(f"{item['nome']:<40} {item['chamadas']:>9} {item['segundos']:>10.4f}")
+        for rotulo, alocacao in relatorio['alocacoes'].items():
+            linhas.append(f"alocações {rotulo}: {alocacao['blocos']} blocos retidos, "
+                          f"pico {alocacao['pico_bytes'] / 2**20:.1f} MiB")
+        return '\n'.join(linhas)
+
+@contextmanager
+def perfilar(memoria=False):
+    """Ativa a coleta de um `Perfil` no bloco `with`.
+
+    Com `memoria=True`, usa `tracemalloc` para registrar, por área/subárea, o
+    pico de memória e os blocos de memória retidos por bloco gerado (isso
+    deixa a geração bem mais lenta).
+    """
+    perfil = Perfil(memoria)
+    if memoria:
+        _ligar_tracemalloc()
+    token = _ativo.set(perfil)
+    try:
+        yield perfil
+    finally:
+        _ativo.reset(token)
+        perfil.fim = time.perf_counter()
+        if memoria:
+            _desligar_tracemalloc()
+
+def _ligar_tracemalloc():
+    global _usando_tracemalloc, _iniciado_aqui
+    import tracemalloc
+
+    with _lock_tracemalloc:
+        if _usando_tracemalloc == 0:
+            # Se já estava ligado por quem chamou, não é desligado no fim
+            _iniciado_aqui = not tracemalloc.is_tracing()
+            if _iniciado_aqui:
+                tracemalloc.start()
+        _usando_tracemalloc += 1
+
+def _desligar_tracemalloc():
+    global _usando_tracemalloc
+    import tracemalloc
+
+    with _lock_tracemalloc:
+        _usando_tracemalloc -= 1
+        if _usando_tracemalloc == 0 and _iniciado_aqui:
+            tracemalloc.stop()
+
+def medido(nome, detalhe=None):
+    """Decorador que registra tempo e chamadas de uma função no perfil ativo.
+
+    `detalhe(*args, **kwargs)` pode complementar o rótulo (ex.: o provedor em
+    `pool:name`).
+    """
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            perfil = _ativo.get()
+            if perfil is None:
+                return funcao(*args, **kwargs)
+            rotulo = nome if detalhe is None else f'{nome}:{detalhe(*args, **kwargs)}'
+            inicio = time.perf_counter()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                perfil.registrar(rotulo, time.perf_counter() - inicio)
+        return envoltorio
+    return decorador
+
+@contextmanager
+def medir_alocacoes(rotulo):
+    """Registra pico de memória e blocos retidos no bloco `with` (só com `memoria=True`)"""
+    perfil = _ativo.get()
+    if perfil is None or not perfil.memoria:
+        yield
+        return
+
+    import tracemalloc
+
+    antes = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    yield
+    pico = tracemalloc.get_traced_memory()[1]
+    depois = tracemalloc.take_snapshot()
+    blocos = sum(max(d.count_diff, 0) for d in depois.compare_to(antes, 'filename'))
+    perfil.registrar_alocacoes(rotulo, pico, blocos)
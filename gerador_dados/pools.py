@@ -0,0 +1,164 @@
+"""Pools de valores do Faker pré-gerados e amostrados por índices NumPy.
+
+Em vez de chamar o Faker a cada linha, cada provedor (`name`, `company`,
+`cnpj`, ...) gera uma única vez um pool de valores, guardado em cache no
+processo. As colunas são preenchidas sorteando índices nesse pool.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from .perfil import medido
+
+# Tamanho padrão dos pools e ajustes por provedor
+TAMANHO_POOL = 10_000
+TAMANHOS_POOL = {
+    'company_suffix': 100,
+    'state_abbr': 100,
+}
+
+# Semente fixa: o pool de um provedor é o mesmo em todos os processos
+SEMENTE_POOL = 20_250_101
+
+# Argumentos repassados ao Faker por provedor
+ARGUMENTOS_PROVEDOR = {
+    'sentence': {'nb_words': 4},
+}
+
+def definir_tamanho_pool(provedor, tamanho):
+    """Altera o tamanho do pool de `provedor` (e descarta os pools já gerados)"""
+    TAMANHOS_POOL[provedor] = tamanho
+    _gerar_pool.cache_clear()
+    _pool_distinto.cache_clear()
+    _pool_categorico.cache_clear()
+
+def tamanho_pool(provedor):
+    return TAMANHOS_POOL.get(provedor, TAMANHO_POOL)
+
+def pool(provedor, tamanho=None):
+    """Array (dtype object) com `tamanho` valores do provedor do Faker"""
+    return _gerar_pool(provedor, tamanho or tamanho_pool(provedor))
+
+@lru_cache(maxsize=None)
+@medido('pool_criacao', lambda provedor, tamanho: provedor)
+def _gerar_pool(provedor, tamanho):
+    if provedor in _GERADORES_VETORIZADOS:
+        rng = np.random.default_rng([SEMENTE_POOL, tamanho])
+        return _GERADORES_VETORIZADOS[provedor](rng, tamanho)
+
+    from faker import Faker
+
+    fake = Faker('pt_BR')
+    fake.seed_instance(SEMENTE_POOL)
+    gerar = getattr(fake, provedor)
+    argumentos = ARGUMENTOS_PROVEDOR.get(provedor, {})
+    return np.array([gerar(**argumentos) for _ in range(tamanho)], dtype=object)
+
+@medido('pool', lambda rng, provedor, *_, **__: provedor)
+def amostrar(rng, provedor, qtd, unico=False):
+    """Sorteia `qtd` valores do pool de `provedor`.
+
+    Com `unico=True` os valores não se repetem em todo o conjunto gerado (não só
+    no bloco): cada linha recebe um índice distinto via `rng.indices_unicos`.
+    Provedores vetorizados (CNPJ) sorteiam no universo inteiro de valores; os
+    demais, num pool de `tamanho_pool(provedor)` valores distintos.
+    """
+    if not unico:
+        valores = pool(provedor)
+        return valores[rng.integers(0, len(valores), qtd)]
+
+    if provedor in _UNIVERSOS_VETORIZADOS:
+        universo, formatar = _UNIVERSOS_VETORIZADOS[provedor]
+        return formatar(rng.indices_unicos(universo))
+    valores = _pool_distinto(provedor, tamanho_pool(provedor))
+    return valores[rng.indices_unicos(len(valores))]
+
+def universo_unico(provedor):
+    """Quantidade de valores distintos de `amostrar(..., unico=True)`, o máximo de linhas do conjunto"""
+    if provedor in _UNIVERSOS_VETORIZADOS:
+        return _UNIVERSOS_VETORIZADOS[provedor][0]
+    return tamanho_pool(provedor)
+
+@medido('pool_categoria', lambda rng, provedor, *_, **__: provedor)
+def amostrar_categoria(rng, provedor, qtd):
+    """Como `amostrar`, mas devolve um `pd.Categorical` com os valores distintos do pool.
+
+    Sorteia os mesmos índices que `amostrar`, então os valores são idênticos.
+    """
+    import pandas as pd
+
+    codigos, tipo = _pool_categorico(provedor, tamanho_pool(provedor))
+    return pd.Categorical.from_codes(codigos[rng.integers(0, len(codigos), qtd)], dtype=tipo)
+
+@medido('combinar')
+def combinar(*partes, separador=' '):
+    """Concatena arrays de texto elemento a elemento (ex.: nome + sobrenome)"""
+    resultado = partes[0]
+    for parte in partes[1:]:
+        resultado = resultado + separador + parte
+    return resultado
+
+@lru_cache(maxsize=None)
+def _pool_distinto(provedor, tamanho):
+    valores = _distintos(_gerar_pool(provedor, tamanho))
+    extra = tamanho
+    while len(valores) < tamanho:
+        # O Faker repetiu valores: gera mais até completar o pool sem repetições
+        extra *= 2
+        anteriores = len(valores)
+        valores = _distintos(_gerar_pool(provedor, extra))
+        if len(valores) == anteriores:
+            raise ValueError(
+                f"O provedor {provedor!r} só tem {anteriores} valores distintos; "
+                f"não é possível sortear {tamanho} sem repetição"
+            )
+    return valores[:tamanho]
+
+@lru_cache(maxsize=None)
+def _pool_categorico(provedor, tamanho):
+    """Código de cada posição do pool e o `CategoricalDtype` dos valores distintos"""
+    import pandas as pd
+
+    codigos, categorias = pd.factorize(_gerar_pool(provedor, tamanho))
+    return codigos, pd.CategoricalDtype(categorias)
+
+def _distintos(valores):
+    """Valores distintos de `valores`, na ordem em que aparecem"""
+    return np.array(list(dict.fromkeys(valores)), dtype=object)
+
+# GERADORES VETORIZADOS
+def _cnpjs(rng, tamanho):
+    """CNPJs válidos e distintos no formato 'XX.XXX.XXX/0001-XX', como o Faker"""
+    return _formatar_cnpjs(rng.choice(10**8, tamanho, replace=False))
+
+def _formatar_cnpjs(raizes):
+    """CNPJ da matriz (filial 0001) de cada raiz de 8 dígitos, com dígitos verificadores"""
+    tamanho = len(raizes)
+    digitos = np.zeros((tamanho, 14), dtype=np.int64)
+    for posicao in range(8):
+        digitos[:, 7 - posicao] = raizes // 10**posicao % 10
+    digitos[:, 8:12] = [0, 0, 0, 1]
+
+    # Dígitos verificadores
+    pesos = np.array([6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+    for posicao in (12, 13):
+        resto = digitos[:, :posicao] @ pesos[13 - posicao:] % 11
+        digitos[:, posicao] = np.where(resto < 2, 0, 11 - resto)
+
+    # Monta o texto formatado byte a byte
+    texto = np.full((tamanho, 18), ord('0'), dtype=np.uint8)
+    posicoes = [0, 1, 3, 4, 5, 7, 8, 9, 11, 12, 13, 14, 16, 17]
+    texto[:, posicoes] += digitos.astype(np.uint8)
+    texto[:, [2, 6]] = ord('.')
+    texto[:, 10] = ord('/')
+    texto[:, 15] = ord('-')
+    return texto.view('S18').ravel().astype('U18').astype(object)
+
+_GERADORES_VETORIZADOS = {
+    'cnpj': _cnpjs,
+}
+
+# Provedor -> (quantidade de valores distintos, formatação a partir do índice)
+_UNIVERSOS_VETORIZADOS = {
+    'cnpj': (10**8, _formatar_cnpjs),
+}
@@ -0,0 +1,209 @@
+"""Esquema estrela: dimensões geradas uma vez e fatos com chaves estrangeiras inteiras.
+
+As dimensões (clientes, vendedores, produtos, veículos, cidades, fornecedores)
+são pequenas e têm chave substituta inteira a partir de 1. Os fatos usam as
+mesmas colunas de `gerar_colunas` no modo compacto, mas trocam os textos que
+se repetem em toda linha (cliente, produto, motorista, cidade, ...) por chaves
+das dimensões:
+
+- colunas já sorteadas de um cadastro fixo (Produto, Placa Veículo, Cidade
+  Origem, ...) viram a chave da linha correspondente na dimensão;
+- clientes, vendedores e fornecedores são sorteados direto como chaves, com
+  assimetria de Zipf configurável (`assimetria=0` é uniforme).
+
+Como nas tabelas planas, cada linha de fato depende só de (seed, fato,
+número da linha), então os fatos podem ser gerados em blocos ou em paralelo.
+
+    esquema = EsquemaEstrela(seed=42)
+    tabelas = esquema.tabelas({'fato_vendas': 1_000_000})
+"""
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .cidades import matriz_distancias
+from .contador import GeradorContador, chave_linhas
+from .motor import (PRODUTOS_PRECOS, VENDEDORES, gerar_bloco, gerar_colunas, preparar_contexto,
+                    semente_raiz)
+from .perfil import medido
+from .pools import amostrar, combinar
+
+# Fato -> área/subárea de origem e como cada dimensão é referenciada:
+# - 'mapear': coluna -> (dimensão, coluna natural na dimensão, nova chave)
+# - 'sortear': nova chave -> dimensão (chave sorteada com assimetria)
+# - 'remover': colunas que passam a viver só nas dimensões
+FATOS = {
+    'fato_vendas': {
+        'area': 'Vendas',
+        'subarea': None,
+        'mapear': {'Produto': ('dim_produto', 'Produto', 'id_produto')},
+        'sortear': {'id_cliente': 'dim_cliente', 'id_vendedor': 'dim_vendedor'},
+        'remover': ['Cliente', 'Vendedor'],
+    },
+    'fato_transporte': {
+        'area': 'Logística',
+        'subarea': 'Transporte',
+        'mapear': {
+            'Placa Veículo': ('dim_veiculo', 'Placa', 'id_veiculo'),
+            'Cidade Origem': ('dim_cidade', 'Cidade', 'id_cidade_origem'),
+            'Cidade Destino': ('dim_cidade', 'Cidade', 'id_cidade_destino'),
+        },
+        'sortear': {},
+        'remover': ['Motorista', 'Veículo', 'Latitude Origem', 'Longitude Origem',
+                    'Latitude Destino', 'Longitude Destino'],
+    },
+    'fato_contas_pagar': {
+        'area': 'Financeiro',
+        'subarea': 'Contas a Pagar',
+        'mapear': {},
+        'sortear': {'id_fornecedor': 'dim_fornecedor'},
+        'remover': ['Fornecedor'],
+    },
+    'fato_contas_receber': {
+        'area': 'Financeiro',
+        'subarea': 'Contas a Receber',
+        'mapear': {},
+        'sortear': {'id_cliente': 'dim_cliente'},
+        'remover': ['Cliente'],
+    },
+}
+
+# Assimetria de Zipf padrão por dimensão sorteada: poucos clientes e
+# fornecedores concentram boa parte das linhas
+ASSIMETRIA_PADRAO = {
+    'dim_cliente': 1.0,
+    'dim_vendedor': 0.5,
+    'dim_fornecedor': 1.1,
+}
+
+class EsquemaEstrela:
+    """Dimensões de uma `seed` e geração dos fatos que as referenciam.
+
+    - `clientes`/`fornecedores`: linhas das dimensões geradas a partir dos pools.
+    - `assimetria`: expoente de Zipf das chaves sorteadas, um número para todas
+      as dimensões ou um dicionário {dimensão: expoente}.
+    """
+
+    def __init__(self, seed=None, clientes=10_000, fornecedores=1_000, assimetria=None):
+        self.raiz = semente_raiz(seed)
+        if assimetria is None or isinstance(assimetria, dict):
+            self.assimetria = {**ASSIMETRIA_PADRAO, **(assimetria or {})}
+        else:
+            self.assimetria = dict.fromkeys(ASSIMETRIA_PADRAO, assimetria)
+        self.dimensoes = gerar_dimensoes(self.raiz, clientes, fornecedores)
+        self._chaves = {}
+
+    def gerar_fato(self, nome, inicio, qtd, contexto=None):
+        """Linhas [inicio, inicio + qtd) do fato `nome`, com as chaves das dimensões"""
+        fato = FATOS[nome]
+        area, subarea = fato['area'], fato['subarea']
+        if contexto is None:
+            contexto = preparar_contexto(area, subarea, self.raiz)
+        rng = GeradorContador(chave_linhas(self.raiz, 'fato', nome), inicio, qtd)
+        colunas = gerar_colunas(area, qtd, subarea, rng, contexto, compacto=True)
+
+        chaves = {}
+        for coluna, (dimensao, natural, chave) in fato['mapear'].items():
+            valores = colunas[coluna]
+            chaves[chave] = self._chaves_categorias(dimensao, natural, valores.categories)[valores.codes]
+        for chave, dimensao in fato['sortear'].items():
+            n = len(self.dimensoes[dimensao])
+            chaves[chave] = sortear_chaves(rng, n, qtd, self.assimetria.get(dimensao, 0.0))
+
+        restantes = {
+            coluna: valores for coluna, valores in colunas.items()
+            if coluna not in fato['mapear'] and coluna not in fato['remover']
+        }
+        df = pd.DataFrame({**chaves, **restantes}, index=pd.RangeIndex(inicio, inicio + qtd))
+        df.attrs['colunas_data'] = [
+            coluna for coluna, valores in restantes.items()
+            if getattr(valores, 'dtype', None) == np.dtype('datetime64[D]')
+        ]
+        return df
+
+    def fato_em_blocos(self, nome, qtd, tamanho_bloco=100_000):
+        """Gera `qtd` linhas do fato em DataFrames de até `tamanho_bloco` linhas (um vazio se `qtd=0`)"""
+        fato = FATOS[nome]
+        contexto = preparar_contexto(fato['area'], fato['subarea'], self.raiz)
+        for inicio in range(0, qtd or 1, tamanho_bloco):
+            yield self.gerar_fato(nome, inicio, min(tamanho_bloco, qtd - inicio), contexto)
+
+    def tabelas(self, linhas):
+        """Dimensões e fatos ({fato: quantidade de linhas}) num único dicionário"""
+        tabelas = dict(self.dimensoes)
+        for nome, qtd in linhas.items():
+            tabelas[nome] = self.gerar_fato(nome, 0, qtd)
+        return tabelas
+
+    def _chaves_categorias(self, dimensao, natural, categorias):
+        """Chave da dimensão para cada categoria (cache por dimensão e categorias)"""
+        cache = (dimensao, natural, tuple(categorias))
+        if cache not in self._chaves:
+            tabela = self.dimensoes[dimensao].drop_duplicates(natural)
+            posicoes = pd.Index(tabela[natural]).get_indexer(categorias)
+            if (posicoes < 0).any():
+                faltando = list(np.asarray(categorias)[posicoes < 0][:3])
+                raise ValueError(f'Valores sem linha em {dimensao}: {faltando}')
+            self._chaves[cache] = tabela.iloc[:, 0].to_numpy()[posicoes]
+        return self._chaves[cache]
+
+def gerar_esquema(linhas, seed=None, **opcoes):
+    """Atalho para `EsquemaEstrela(seed, **opcoes).tabelas(linhas)`"""
+    return EsquemaEstrela(seed, **opcoes).tabelas(linhas)
+
+# DIMENSÕES
+def gerar_dimensoes(raiz, clientes=10_000, fornecedores=1_000):
+    """Tabelas de dimensão da `raiz`, cada uma com chave inteira na primeira coluna"""
+    contexto_frota = preparar_contexto('Logística', 'Transporte', raiz)
+    matriz = matriz_distancias()
+
+    rng = GeradorContador(chave_linhas(raiz, 'dim', 'cliente'), 0, clientes)
+    dim_cliente = pd.DataFrame({
+        'Nome': combinar(amostrar(rng, 'first_name', clientes), amostrar(rng, 'last_name', clientes)),
+        'Cidade': amostrar(rng, 'city', clientes),
+        'Estado': amostrar(rng, 'state_abbr', clientes),
+    })
+
+    dim_fornecedor = gerar_bloco('Fornecedores', 0, fornecedores, None, raiz,
+                                 preparar_contexto('Fornecedores', None, raiz))
+
+    dimensoes = {
+        'dim_cliente': dim_cliente,
+        'dim_vendedor': pd.DataFrame({'Nome': VENDEDORES}),
+        'dim_produto': pd.DataFrame({
+            'Produto': list(PRODUTOS_PRECOS),
+            'Preço Mínimo': [faixa[0] for faixa in PRODUTOS_PRECOS.values()],
+            'Preço Máximo': [faixa[1] for faixa in PRODUTOS_PRECOS.values()],
+        }),
+        'dim_veiculo': pd.DataFrame({
+            'Placa': [v['placa'] for v in contexto_frota['frota']],
+            'Motorista': [v['motorista'] for v in contexto_frota['frota']],
+            'Veículo': [v['veiculo'] for v in contexto_frota['frota']],
+        }),
+        'dim_cidade': pd.DataFrame({
+            'Cidade': matriz.cidades,
+            'Latitude': matriz.coords[:, 0],
+            'Longitude': matriz.coords[:, 1],
+        }),
+        'dim_fornecedor': dim_fornecedor.reset_index(drop=True),
+    }
+    for nome, tabela in dimensoes.items():
+        tabela.insert(0, f"id_{nome.removeprefix('dim_')}", np.arange(1, len(tabela) + 1, dtype=np.int32))
+    return dimensoes
+
+# CHAVES ESTRANGEIRAS
+@medido('sortear_chaves')
+def sortear_chaves(rng, n, qtd, assimetria=0.0):
+    """Sorteia `qtd` chaves em [1, n] com P(k) proporcional a 1 / k**assimetria"""
+    if assimetria == 0:
+        return (rng.integers(0, n, qtd) + 1).astype(np.int32)
+    cdf = _cdf_zipf(n, assimetria)
+    return (np.searchsorted(cdf, rng.random(qtd), side='right') + 1).astype(np.int32)
+
+@lru_cache(maxsize=64)
+def _cdf_zipf(n, assimetria):
+    cdf = np.cumsum(np.arange(1, n + 1, dtype=np.float64) ** -assimetria)
+    cdf /= cdf[-1]
+    cdf[-1] = 1.0
+    return cdf
@@ -0,0 +1,480 @@
+"""Serviço HTTP local de geração: python -m gerador_dados.servico [--porta 8000] [--workers N]
+
+Só usa a biblioteca padrão (asyncio) e atende, em localhost por padrão:
+
+    GET /dados?area=Vendas&linhas=1000000&seed=42&formato=csv&compressao=gzip
+    GET /dados?area=Logística&subarea=Transporte&linhas=50000&formato=parquet
+    GET /areas
+    GET /metricas
+
+`/dados` responde em `Transfer-Encoding: chunked` à medida que os blocos
+ficam prontos (CSV, NDJSON ou Parquet), então o primeiro byte sai depois do
+primeiro bloco e não da geração inteira. Sem `seed`, uma é sorteada e
+devolvida no cabeçalho `X-Seed`, para repetir o conjunto.
+
+- Os blocos são gerados (e, em CSV/NDJSON, convertidos em texto) num pool de
+  `workers` processos compartilhado por todas as requisições; compressão e
+  gravação do Parquet rodam em threads, fora do laço de eventos.
+- Contrapressão: cada resposta tem no máximo `EM_VOO` blocos em andamento e só
+  pede o próximo depois que o cliente consumiu o anterior (`drain`), então um
+  cliente lento não acumula dados no servidor. Até `max_requisicoes` respostas
+  são geradas ao mesmo tempo; as seguintes esperam numa fila de até
+  `fila_maxima` e, com a fila cheia, recebem 503 com `Retry-After`.
+- `/metricas` devolve contadores, latência (primeiro byte e total, p50/p95/p99
+  das últimas requisições) e vazão em linhas e bytes por segundo.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from .areas import AREAS
+
+HOST = '127.0.0.1'
+PORTA = 8000
+
+# Linhas por bloco gerado num worker (e por pedaço da resposta)
+TAMANHO_BLOCO = 20_000
+# Blocos de uma mesma resposta em andamento ao mesmo tempo
+EM_VOO = 2
+# Maior `linhas` aceito por requisição
+MAX_LINHAS = 100_000_000
+# Requisições consideradas nos percentis de latência e na vazão recente
+JANELA_METRICAS = 1000
+# Segundos para o cliente enviar a linha de requisição e os cabeçalhos
+TEMPO_LEITURA = 10
+
+TIPOS_CONTEUDO = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+TIPOS_COMPRESSAO = {
+    'gzip': ('application/gzip', '.gz'),
+    'bz2': ('application/x-bzip2', '.bz2'),
+    'xz': ('application/x-xz', '.xz'),
+    'zstd': ('application/zstd', '.zst'),
+    'zip': ('application/zip', '.zip'),
+}
+COMPRESSOES_PARQUET = ('snappy', 'zstd', 'gzip', 'brotli', 'lz4', 'none')
+
+_MOTIVOS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    500: 'Internal Server Error', 503: 'Service Unavailable',
+}
+
+class ParametroInvalido(ValueError):
+    """Parâmetro de `/dados` ausente ou inválido (resposta 400)"""
+
+class RequisicaoMalformada(ValueError):
+    """Linha de requisição que não é `MÉTODO ALVO VERSÃO` (a conexão é fechada sem resposta)"""
+
+# MÉTRICAS
+class Metricas:
+    """Contadores do serviço e latência/vazão das últimas `janela` respostas de `/dados`"""
+
+    def __init__(self, janela=JANELA_METRICAS):
+        self.inicio = time.monotonic()
+        self.requisicoes = 0
+        self.em_andamento = 0
+        self.aguardando = 0
+        self.rejeitadas = 0
+        self.por_status = Counter()
+        self.linhas = 0
+        self.bytes = 0
+        self._recentes = deque(maxlen=janela)
+
+    def concluir(self, primeiro_byte, duracao, linhas, tamanho):
+        """Registra uma resposta de `/dados` (tempos em segundos)"""
+        self._recentes.append((primeiro_byte, duracao, linhas, tamanho))
+
+    def resumo(self):
+        recentes = list(self._recentes)
+        segundos = sum(duracao for _, duracao, _, _ in recentes)
+        ativo = time.monotonic() - self.inicio
+        return {
+            'segundos_ativo': ativo,
+            'requisicoes': self.requisicoes,
+            'em_andamento': self.em_andamento,
+            'aguardando': self.aguardando,
+            'rejeitadas': self.rejeitadas,
+            'por_status': {str(status): total for status, total in sorted(self.por_status.items())},
+            'linhas': self.linhas,
+            'bytes': self.bytes,
+            'linhas_por_segundo': self.linhas / ativo if ativo > 0 else 0.0,
+            'bytes_por_segundo': self.bytes / ativo if ativo > 0 else 0.0,
+            'recentes': {
+                'respostas': len(recentes),
+                'primeiro_byte': _percentis([primeiro for primeiro, _, _, _ in recentes if primeiro is not None]),
+                'total': _percentis([duracao for _, duracao, _, _ in recentes]),
+                # Vazão de cada resposta, média ponderada pela duração
+                'linhas_por_segundo': sum(linhas for _, _, linhas, _ in recentes) / segundos if segundos else 0.0,
+                'bytes_por_segundo': sum(tamanho for _, _, _, tamanho in recentes) / segundos if segundos else 0.0,
+            },
+        }
+
+def _percentis(valores):
+    if not valores:
+        return None
+    valores = sorted(valores)
+    def percentil(p):
+        return valores[min(len(valores) - 1, int(p / 100 * len(valores)))]
+    return {'p50': percentil(50), 'p95': percentil(95), 'p99': percentil(99), 'max': valores[-1]}
+
+# GERAÇÃO NOS WORKERS
+def _gerar_parte(area, inicio, qtd, subarea, raiz, contexto, formato, cabecalho):
+    """Bloco [inicio, inicio + qtd) já em bytes (CSV/NDJSON) ou como DataFrame nativo (Parquet)"""
+    from .exportacao import _csv_bytes, _ndjson_bytes
+    from .motor import gerar_bloco
+
+    bloco = gerar_bloco(area, inicio, qtd, subarea, raiz, contexto, nativo=formato != 'csv')
+    if formato == 'csv':
+        return _csv_bytes(bloco, cabecalho)
+    if formato == 'ndjson':
+        return _ndjson_bytes(bloco)
+    return bloco
+
+class _Codificador:
+    """Alimenta, um item por vez, um gerador que devolve bytes para cada item recebido.
+
+    `etapas(fonte)` deve produzir um pedaço (talvez vazio) por item de `fonte`
+    e, quando ela se esgota, o que restar (rodapé do Parquet, fim do gzip).
+    Permite usar escritores síncronos em fluxo, chamando `codificar` numa thread.
+    """
+
+    def __init__(self, etapas):
+        self._fila = deque()
+        self._etapas = etapas(self._fonte())
+
+    def _fonte(self):
+        while self._fila:
+            yield self._fila.popleft()
+
+    def codificar(self, item):
+        self._fila.append(item)
+        return next(self._etapas)
+
+    def finalizar(self):
+        return b''.join(self._etapas)
+
+def _etapas_compressao(compressao, nome_membro):
+    from .exportacao import _comprimir, _Vazao
+
+    def etapas(partes):
+        vazao = _Vazao()
+        with _comprimir(vazao, compressao, None, nome_membro) as saida:
+            for parte in partes:
+                saida.write(parte)
+                yield b''.join(vazao.drenar())
+        yield b''.join(vazao.drenar())
+    return etapas
+
+def _etapas_parquet(compressao):
+    from .exportacao import _escrever_arrow, _Vazao
+
+    def etapas(blocos):
+        vazao = _Vazao()
+        for _ in _escrever_arrow(blocos, vazao, 'parquet', compressao, None, None, None):
+            yield b''.join(vazao.drenar())
+        yield b''.join(vazao.drenar())
+    return etapas
+
+# SERVIDOR
+class Servico:
+    """Servidor HTTP assíncrono de geração (ver o docstring do módulo)"""
+
+    def __init__(self, host=HOST, porta=PORTA, workers=None, max_requisicoes=None, fila_maxima=None,
+                 tamanho_bloco=TAMANHO_BLOCO, max_linhas=MAX_LINHAS):
+        self.host = host
+        self.porta = porta
+        self.workers = workers or os.cpu_count() or 1
+        self.max_requisicoes = max_requisicoes or 2 * self.workers
+        self.fila_maxima = self.max_requisicoes * 4 if fila_maxima is None else fila_maxima
+        self.tamanho_bloco = tamanho_bloco
+        self.max_linhas = max_linhas
+        self.metricas = Metricas()
+        self._servidor = None
+        self._processos = None
+        self._threads = None
+        self._vagas = None
+        self._areas_workers = set()
+
+    async def iniciar(self):
+        """Abre os pools e o socket; com `porta=0`, `self.porta` recebe a porta escolhida"""
+        from .esquemas import registrados
+        from .paralelo import configuracao_workers, pool_processos
+
+        # Áreas, cidades e pools personalizados até aqui valem também nos workers;
+        # as registradas depois, ou com esquemas que não podem ser enviados, não
+        configuracao = configuracao_workers()
+        self._processos = pool_processos(self.workers, configuracao)
+        fora = ({(esquema.area, esquema.subarea) for esquema in registrados()}
+                - {(esquema.area, esquema.subarea) for esquema in configuracao['esquemas']})
+        self._areas_workers = {(area, subarea) for area, subareas in AREAS.items()
+                               for subarea in subareas or [None]} - fora
+        self._threads = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='gerador_dados-servico')
+        self._vagas = asyncio.Semaphore(self.max_requisicoes)
+        self._servidor = await asyncio.start_server(self._atender, self.host, self.porta)
+        self.porta = self._servidor.sockets[0].getsockname()[1]
+        return self
+
+    async def encerrar(self):
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        for pool in (self._processos, self._threads):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    async def servir(self):
+        """Atende até ser cancelado (Ctrl+C em `servir`)"""
+        await self.iniciar()
+        try:
+            await self._servidor.serve_forever()
+        finally:
+            await self.encerrar()
+
+    async def _atender(self, leitor, escritor):
+        self.metricas.requisicoes += 1
+        status = None
+        try:
+            metodo, alvo = await asyncio.wait_for(_ler_requisicao(leitor), TEMPO_LEITURA)
+            url = urlsplit(alvo)
+            if url.path not in ('/dados', '/areas', '/metricas'):
+                status = await _responder_json(escritor, 404, {'erro': f'caminho desconhecido: {url.path}'})
+            elif metodo != 'GET':
+                status = await _responder_json(escritor, 405, {'erro': 'use GET'}, {'Allow': 'GET'})
+            elif url.path == '/areas':
+                status = await _responder_json(escritor, 200, AREAS)
+            elif url.path == '/metricas':
+                status = await _responder_json(escritor, 200, self.metricas.resumo())
+            else:
+                status = await self._dados(escritor, parse_qs(url.query))
+        except ParametroInvalido as erro:
+            status = await _responder_json(escritor, 400, {'erro': str(erro)})
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError,
+                RequisicaoMalformada):
+            # Cliente desconectou ou mandou uma requisição malformada
+            pass
+        except Exception as erro:
+            # Falha do servidor antes de qualquer resposta: 500, contada em `por_status`
+            status = await _responder_falha(escritor, erro)
+        finally:
+            if status is not None:
+                self.metricas.por_status[status] += 1
+            escritor.close()
+            try:
+                await escritor.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _dados(self, escritor, consulta):
+        parametros = self._parametros(consulta)
+        if self.metricas.aguardando >= self.fila_maxima and self._vagas.locked():
+            self.metricas.rejeitadas += 1
+            return await _responder_json(escritor, 503, {'erro': 'serviço ocupado, tente de novo'},
+                                         {'Retry-After': '1'})
+        inicio = time.monotonic()
+        self.metricas.aguardando += 1
+        try:
+            await self._vagas.acquire()
+        finally:
+            self.metricas.aguardando -= 1
+        self.metricas.em_andamento += 1
+        progresso = {'cabecalhos': False, 'primeiro_byte': None, 'linhas': 0, 'bytes': 0}
+        status = 200
+        try:
+            await self._transmitir(escritor, parametros, progresso, inicio)
+        except (ConnectionError, asyncio.CancelledError):
+            status = 499
+            raise
+        except Exception as erro:
+            status = 500
+            if not progresso['cabecalhos']:
+                await _responder_falha(escritor, erro)
+            # Com os cabeçalhos já enviados, a conexão é fechada sem o pedaço
+            # final, e o cliente vê a transferência incompleta
+        finally:
+            self._vagas.release()
+            self.metricas.em_andamento -= 1
+            self.metricas.concluir(progresso['primeiro_byte'], time.monotonic() - inicio,
+                                   progresso['linhas'], progresso['bytes'])
+            self.metricas.por_status[status] += 1
+        return None
+
+    def _parametros(self, consulta):
+        from .motor import limite_linhas
+
+        def valor(nome, padrao=None):
+            return consulta.get(nome, [padrao])[-1]
+
+        area = valor('area')
+        if area not in AREAS:
+            raise ParametroInvalido(f"área inválida: {area!r} (opções: {', '.join(AREAS)})")
+        subarea = valor('subarea')
+        subareas = AREAS[area]
+        if subareas and subarea not in subareas:
+            raise ParametroInvalido(f"a área {area!r} exige subarea entre: {', '.join(subareas)}")
+        if not subareas and subarea is not None:
+            raise ParametroInvalido(f'a área {area!r} não tem subáreas')
+        if (area, subarea) not in self._areas_workers:
+            raise ParametroInvalido(f'a área {area!r} foi registrada depois de iniciar o serviço '
+                                    'ou não pode ser enviada aos workers')
+        try:
+            linhas = int(valor('linhas', '1000'))
+            seed = valor('seed')
+            seed = random.randrange(2 ** 32) if seed is None else int(seed)
+        except ValueError:
+            raise ParametroInvalido('linhas e seed devem ser inteiros') from None
+        if not 0 <= linhas <= self.max_linhas:
+            raise ParametroInvalido(f'linhas deve estar entre 0 e {self.max_linhas}')
+        limite = limite_linhas(area, subarea)
+        if limite is not None and linhas > limite:
+            raise ParametroInvalido(f'a área {area!r} gera no máximo {limite} linhas sem repetir as chaves únicas')
+        formato = valor('formato', 'csv')
+        if formato not in TIPOS_CONTEUDO:
+            raise ParametroInvalido(f"formato inválido: {formato!r} (opções: {', '.join(TIPOS_CONTEUDO)})")
+        compressao = valor('compressao')
+        opcoes = COMPRESSOES_PARQUET if formato == 'parquet' else tuple(TIPOS_COMPRESSAO)
+        if compressao is not None and compressao not in opcoes:
+            raise ParametroInvalido(f"compressão inválida para {formato}: {compressao!r} (opções: {', '.join(opcoes)})")
+        return {'area': area, 'subarea': subarea, 'linhas': linhas, 'seed': seed,
+                'formato': formato, 'compressao': compressao}
+
+    async def _transmitir(self, escritor, parametros, progresso, inicio):
+        from .bancos import nome_tabela
+        from .motor import preparar_contexto, semente_raiz
+
+        area, subarea, linhas = parametros['area'], parametros['subarea'], parametros['linhas']
+        formato, compressao = parametros['formato'], parametros['compressao']
+        loop = asyncio.get_running_loop()
+        raiz = semente_raiz(parametros['seed'])
+        contexto = await loop.run_in_executor(self._threads, preparar_contexto, area, subarea, raiz)
+
+        nome = f'{nome_tabela(area, subarea)}.{formato}'
+        tipo = TIPOS_CONTEUDO[formato]
+        codificador = None
+        if formato == 'parquet':
+            codificador = _Codificador(_etapas_parquet(compressao))
+        elif compressao is not None:
+            tipo, extensao = TIPOS_COMPRESSAO[compressao]
+            codificador = _Codificador(_etapas_compressao(compressao, nome))
+            nome += extensao
+        await _escrever_cabecalhos(escritor, 200, {
+            'Content-Type': tipo,
+            'Content-Disposition': f'attachment; filename="{nome}"',
+            'Transfer-Encoding': 'chunked',
+            'X-Seed': str(parametros['seed']),
+            'X-Linhas': str(linhas),
+        })
+        progresso['cabecalhos'] = True
+
+        async def enviar(dados):
+            if dados:
+                escritor.write(b'%x\r\n%s\r\n' % (len(dados), dados))
+                await escritor.drain()
+                if progresso['primeiro_byte'] is None:
+                    progresso['primeiro_byte'] = time.monotonic() - inicio
+                progresso['bytes'] += len(dados)
+                self.metricas.bytes += len(dados)
+
+        # Com linhas=0, uma parte vazia leva o cabeçalho do CSV e o esquema do Parquet
+        faixas = ((comeco, min(self.tamanho_bloco, linhas - comeco))
+                  for comeco in range(0, linhas or 1, self.tamanho_bloco))
+        pendentes = deque()
+        try:
+            for comeco, qtd in faixas:
+                pendentes.append((qtd, loop.run_in_executor(
+                    self._processos, _gerar_parte, area, comeco, qtd, subarea, raiz, contexto, formato, comeco == 0
+                )))
+                if len(pendentes) >= EM_VOO:
+                    await self._enviar_parte(pendentes.popleft(), codificador, enviar, progresso)
+            while pendentes:
+                await self._enviar_parte(pendentes.popleft(), codificador, enviar, progresso)
+            if codificador is not None:
+                await enviar(await loop.run_in_executor(self._threads, codificador.finalizar))
+        finally:
+            for _, futuro in pendentes:
+                futuro.cancel()
+        escritor.write(b'0\r\n\r\n')
+        await escritor.drain()
+
+    async def _enviar_parte(self, pendente, codificador, enviar, progresso):
+        qtd, futuro = pendente
+        parte = await futuro
+        if codificador is not None:
+            parte = await asyncio.get_running_loop().run_in_executor(self._threads, codificador.codificar, parte)
+        await enviar(parte)
+        progresso['linhas'] += qtd
+        self.metricas.linhas += qtd
+
+# HTTP
+async def _ler_requisicao(leitor):
+    """Método e alvo da linha de requisição; os cabeçalhos são lidos e ignorados"""
+    linha = await leitor.readuntil(b'\r\n')
+    partes = linha.decode('latin-1').split(' ', 2)
+    if len(partes) != 3:
+        raise RequisicaoMalformada(linha)
+    metodo, alvo, _ = partes
+    while await leitor.readuntil(b'\r\n') != b'\r\n':
+        pass
+    return metodo, alvo
+
+async def _escrever_cabecalhos(escritor, status, cabecalhos):
+    linhas = [f'HTTP/1.1 {status} {_MOTIVOS[status]}', 'Connection: close']
+    linhas += [f'{nome}: {valor}' for nome, valor in cabecalhos.items()]
+    escritor.write(('\r\n'.join(linhas) + '\r\n\r\n').encode('latin-1', 'replace'))
+    await escritor.drain()
+
+async def _responder_json(escritor, status, corpo, cabecalhos=None):
+    dados = json.dumps(corpo, ensure_ascii=False).encode('utf-8')
+    await _escrever_cabecalhos(escritor, status, {
+        'Content-Type': 'application/json; charset=utf-8',
+        'Content-Length': str(len(dados)),
+        **(cabecalhos or {}),
+    })
+    escritor.write(dados)
+    await escritor.drain()
+    return status
+
+async def _responder_falha(escritor, erro):
+    """Resposta 500 com o tipo e a mensagem da exceção; o status é devolvido mesmo se o cliente já saiu"""
+    try:
+        await _responder_json(escritor, 500, {'erro': f'falha interna: {type(erro).__name__}: {erro}'})
+    except ConnectionError:
+        pass
+    return 500
+
+def servir(host=HOST, porta=PORTA, **opcoes):
+    """Sobe o serviço e atende até Ctrl+C (opções: workers, max_requisicoes, fila_maxima, tamanho_bloco)"""
+    try:
+        asyncio.run(Servico(host, porta, **opcoes).servir())
+    except KeyboardInterrupt:
+        pass
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m gerador_dados.servico', description=__doc__.split('\n')[0])
+    parser.add_argument('--host', default=HOST, help=f'endereço de escuta (padrão: {HOST})')
+    parser.add_argument('--porta', type=int, default=PORTA, help=f'porta (padrão: {PORTA})')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='processos de geração; 0 usa todos os núcleos (padrão: 0)')
+    parser.add_argument('--max-requisicoes', type=int,
+                        help='respostas geradas ao mesmo tempo (padrão: 2 por worker)')
+    parser.add_argument('--fila', type=int, help='requisições em espera antes de responder 503 (padrão: 4x o máximo)')
+    parser.add_argument('--bloco', type=int, default=TAMANHO_BLOCO,
+                        help=f'linhas por bloco (padrão: {TAMANHO_BLOCO})')
+    args = parser.parse_args(argv)
+    if args.bloco <= 0:
+        parser.error('--bloco deve ser > 0')
+    print(f'Servindo em http://{args.host}:{args.porta} (Ctrl+C para parar)', flush=True)
+    servir(args.host, args.porta, workers=args.workers or None, max_requisicoes=args.max_requisicoes,
+           fila_maxima=args.fila, tamanho_bloco=args.bloco)
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
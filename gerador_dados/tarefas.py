@@ -0,0 +1,170 @@
+"""Geração em segundo plano, com progresso e cancelamento.
+
+`iniciar_tarefa` gera e grava o arquivo numa thread (os blocos podem vir de
+um pool de processos com `workers`), e quem chamou continua livre para
+consultar o progresso (linhas gravadas, linhas/s, tempo restante) ou cancelar.
+O cancelamento vale a partir do próximo bloco, e o arquivo parcial é apagado.
+
+O arquivo de uma tarefa concluída é apagado por `descartar`, quando a tarefa
+deixa de ser referenciada (ex.: fim da sessão na interface) ou, se o processo
+terminar sem isso, por `limpar_antigas` depois de `TEMPO_VIDA` sem uso.
+
+    tarefa = iniciar_tarefa('Vendas', 10_000_000, seed=42, formato='parquet')
+    tarefa.progresso()   # {'estado': 'executando', 'linhas': 1200000, ...}
+    tarefa.cancelar()
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+
+from .exportacao import FORMATOS_NATIVOS, gravar_blocos
+
+# Segundos sem gravação após os quais `limpar_antigas` apaga o diretório de uma tarefa
+TEMPO_VIDA = 3600
+
+# Prefixo dos diretórios temporários das tarefas (não confundir com o do cache em disco)
+_PREFIXO = 'gerador_dados_tarefa_'
+
+# Tarefas deste processo, para `limpar_antigas` não apagar as que estão em execução
+_TAREFAS = weakref.WeakSet()
+
+class TarefaCancelada(Exception):
+    """Interrompe a gravação de uma tarefa cancelada"""
+
+class Tarefa:
+    """Geração de `qtd` linhas da área/subárea para um arquivo temporário.
+
+    `estado` vai de 'executando' para 'concluida', 'cancelada' ou 'erro' (com
+    a exceção em `erro`). O arquivo fica em `caminho` até `descartar` ou até a
+    tarefa ser coletada pelo garbage collector.
+    """
+
+    def __init__(self, area, qtd, subarea=None, seed=None, formato='csv', compressao=None,
+                 nome_arquivo=None, tamanho_bloco=100_000, workers=1):
+        self.area = area
+        self.subarea = subarea
+        self.qtd = qtd
+        self.seed = seed
+        self.formato = formato
+        self.compressao = compressao
+        self.tamanho_bloco = tamanho_bloco
+        self.workers = workers
+        self.diretorio = tempfile.mkdtemp(prefix=_PREFIXO)
+        # Apaga o diretório quando a tarefa deixa de existir (ou ao sair do interpretador)
+        self._apagar = weakref.finalize(self, shutil.rmtree, self.diretorio, ignore_errors=True)
+        self.caminho = os.path.join(self.diretorio, nome_arquivo or f'dados.{formato}')
+        self.estado = 'executando'
+        self.erro = None
+        self.linhas = 0
+        self.inicio = None
+        self.fim = None
+        self._cancelar = threading.Event()
+        self._thread = threading.Thread(target=self._executar, name='gerador_dados-tarefa', daemon=True)
+
+    def iniciar(self):
+        self.inicio = time.monotonic()
+        _TAREFAS.add(self)
+        self._thread.start()
+        return self
+
+    def cancelar(self):
+        """Pede o cancelamento; a tarefa para antes de gravar o próximo bloco"""
+        self._cancelar.set()
+
+    def aguardar(self, timeout=None):
+        """Espera a tarefa terminar e devolve o estado final (ou 'executando' após `timeout`)"""
+        self._thread.join(timeout)
+        return self.estado
+
+    @property
+    def ativa(self):
+        return self.estado == 'executando'
+
+    def progresso(self):
+        """Estado, linhas gravadas, fração concluída, linhas/s e segundos decorridos/restantes"""
+        segundos = ((self.fim or time.monotonic()) - self.inicio) if self.inicio else 0.0
+        taxa = self.linhas / segundos if segundos > 0 else 0.0
+        restantes = (self.qtd - self.linhas) / taxa if taxa > 0 and self.ativa else None
+        return {
+            'estado': self.estado,
+            'linhas': self.linhas,
+            'total': self.qtd,
+            'fracao': self.linhas / self.qtd if self.qtd else 1.0,
+            'linhas_por_segundo': taxa,
+            'segundos': segundos,
+            'segundos_restantes': restantes,
+        }
+
+    def descartar(self):
+        """Cancela, se ainda em execução, e apaga o arquivo gerado"""
+        self.cancelar()
+        if self._thread.is_alive():
+            self._thread.join()
+        self._apagar()
+
+    def _executar(self):
+        blocos = self._gerar_blocos()
+        try:
+            gravar_blocos(self._acompanhar(blocos), self.caminho, self.formato, compressao=self.compressao)
+            self.estado = 'concluida'
+        except TarefaCancelada:
+            self.estado = 'cancelada'
+        except Exception as erro:
+            self.erro = erro
+            self.estado = 'erro'
+        finally:
+            blocos.close()
+            self.fim = time.monotonic()
+            if self.estado != 'concluida':
+                shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def _gerar_blocos(self):
+        nativo = self.formato in FORMATOS_NATIVOS
+        if self.workers == 1:
+            from .motor import gerar_em_blocos
+
+            return gerar_em_blocos(self.area, self.qtd, self.subarea, self.seed, self.tamanho_bloco,
+                                   nativo=nativo)
+        from .paralelo import gerar_em_blocos_paralelo
+
+        return gerar_em_blocos_paralelo(self.area, self.qtd, self.subarea, self.seed, self.tamanho_bloco,
+                                        self.workers, nativo=nativo)
+
+    def _acompanhar(self, blocos):
+        """Repassa os blocos, contando as linhas gravadas e parando se cancelada"""
+        for bloco in blocos:
+            if self._cancelar.is_set():
+                raise TarefaCancelada
+            yield bloco
+            self.linhas += len(bloco)
+
+def iniciar_tarefa(area, qtd, subarea=None, seed=None, formato='csv', **opcoes):
+    """Cria e inicia uma `Tarefa` (opções: compressao, nome_arquivo, tamanho_bloco, workers).
+
+    Antes, apaga os arquivos de tarefas abandonadas (`limpar_antigas`).
+    """
+    limpar_antigas()
+    return Tarefa(area, qtd, subarea, seed, formato, **opcoes).iniciar()
+
+def limpar_antigas(tempo_vida=TEMPO_VIDA):
+    """Apaga os diretórios de tarefas (deste ou de outros processos) sem gravação há `tempo_vida` s"""
+    limite = time.time() - tempo_vida
+    ativas = {tarefa.diretorio for tarefa in list(_TAREFAS) if tarefa.ativa}
+    with os.scandir(tempfile.gettempdir()) as entradas:
+        for entrada in entradas:
+            if not entrada.name.startswith(_PREFIXO) or entrada.path in ativas:
+                continue
+            try:
+                if entrada.is_dir() and _ultima_gravacao(entrada.path) < limite:
+                    shutil.rmtree(entrada.path, ignore_errors=True)
+            except OSError:
+                # Apagado por outro processo enquanto víamos
+                continue
+
+def _ultima_gravacao(diretorio):
+    """Maior data de modificação entre o diretório e seus arquivos"""
+    with os.scandir(diretorio) as entradas:
+        return max([os.stat(diretorio).st_mtime, *(entrada.stat().st_mtime for entrada in entradas)])
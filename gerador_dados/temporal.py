@@ -0,0 +1,169 @@
+"""Sorteio vetorizado de datas e instantes, com sazonalidade opcional.
+
+As janelas ('-6M'..'today', date(2025, 1, 1)..'today', ...) são resolvidas uma
+vez por dia e, quando há pesos, a CDF da janela (por dia ou por hora) é
+calculada uma vez e reaproveitada: cada linha custa um sorteio uniforme e uma
+busca binária, com ou sem sazonalidade.
+
+Sem sazonalidade cadastrada para a área (o padrão), o sorteio é uniforme e
+idêntico ao das versões anteriores.
+"""
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+import numpy as np
+
+from .perfil import medido
+
+# Unidades aceitas nos deslocamentos relativos, com as mesmas conversões do Faker
+_UNIDADES_DESLOCAMENTO = {'y': 365.24, 'M': 30.42, 'w': 7, 'd': 1}
+
+# 1970-01-01 (dia 0 do datetime64) foi uma quinta-feira; segunda = 0
+_DESLOCAMENTO_SEGUNDA = 3
+
+class Sazonalidade:
+    """Pesos relativos por dia da semana (seg..dom), hora do dia (0..23) e mês (jan..dez).
+
+    Pesos omitidos valem 1 para todos; só as proporções importam.
+    """
+
+    def __init__(self, dia_semana=None, hora=None, mes=None):
+        self.dia_semana = _pesos(dia_semana, 7, 'dia_semana')
+        self.hora = _pesos(hora, 24, 'hora')
+        self.mes = _pesos(mes, 12, 'mes')
+
+    @property
+    def por_dia(self):
+        """Se há pesos que variam de um dia para outro"""
+        return self.dia_semana is not None or self.mes is not None
+
+    def _chave(self):
+        return (self.dia_semana, self.hora, self.mes)
+
+    def __eq__(self, outra):
+        return isinstance(outra, Sazonalidade) and self._chave() == outra._chave()
+
+    def __hash__(self):
+        return hash(self._chave())
+
+    def __repr__(self):
+        return f'Sazonalidade(dia_semana={self.dia_semana}, hora={self.hora}, mes={self.mes})'
+
+    def pesos_dias(self, dias):
+        """Peso de cada data de um array datetime64[D]"""
+        pesos = np.ones(len(dias))
+        numeros = dias.astype(np.int64)
+        if self.dia_semana is not None:
+            pesos *= np.array(self.dia_semana)[(numeros + _DESLOCAMENTO_SEGUNDA) % 7]
+        if self.mes is not None:
+            pesos *= np.array(self.mes)[dias.astype('datetime64[M]').astype(np.int64) % 12]
+        return pesos
+
+def _pesos(valores, tamanho, nome):
+    if valores is None:
+        return None
+    valores = tuple(float(v) for v in valores)
+    if len(valores) != tamanho or min(valores) < 0 or sum(valores) <= 0:
+        raise ValueError(f'{nome} deve ter {tamanho} pesos não negativos, com soma positiva')
+    return valores
+
+# Perfis prontos para `definir_sazonalidade`
+# Comércio: mais vendas de segunda a sexta e no fim do ano
+SAZONALIDADE_COMERCIO = Sazonalidade(
+    dia_semana=[1.0, 1.0, 1.0, 1.0, 1.2, 0.8, 0.4],
+    mes=[0.8, 0.8, 0.9, 0.9, 1.0, 0.9, 0.9, 1.0, 1.0, 1.0, 1.3, 1.6],
+)
+# Atendimento: horário comercial em dias úteis, pouco movimento à noite e no fim de semana
+SAZONALIDADE_HORARIO_COMERCIAL = Sazonalidade(
+    dia_semana=[1.0, 1.0, 1.0, 1.0, 1.0, 0.3, 0.1],
+    hora=[0.05] * 7 + [0.5] + [1.0] * 10 + [0.5, 0.2] + [0.05] * 4,
+)
+
+# (área, subárea) -> Sazonalidade; áreas ausentes sorteiam datas uniformes
+SAZONALIDADES = {}
+
+def definir_sazonalidade(area, subarea=None, sazonalidade=None):
+    """Cadastra (ou, com `sazonalidade=None`, remove) os pesos temporais da área/subárea"""
+    if sazonalidade is None:
+        SAZONALIDADES.pop((area, subarea), None)
+    else:
+        SAZONALIDADES[(area, subarea)] = sazonalidade
+
+def sazonalidade(area, subarea=None):
+    return SAZONALIDADES.get((area, subarea))
+
+# JANELAS
+def resolver_data(valor, hoje):
+    """Converte 'today', deslocamentos como '-6M'/'+1M'/'-30d' ou um `date` em `date`"""
+    if isinstance(valor, date):
+        return valor
+    if valor == 'today':
+        return hoje
+    dias = int(valor[:-1]) * _UNIDADES_DESLOCAMENTO[valor[-1]]
+    return hoje + timedelta(days=int(dias))
+
+@lru_cache(maxsize=256)
+def resolver_janela(inicio, fim, hoje):
+    """Janela de datas como (primeiro dia datetime64[D], número de dias)"""
+    inicio = np.datetime64(resolver_data(inicio, hoje), 'D')
+    fim = np.datetime64(resolver_data(fim, hoje), 'D')
+    return inicio, int((fim - inicio).astype(np.int64)) + 1
+
+@lru_cache(maxsize=256)
+def _cdf_dias(inicio, dias, sazonalidade):
+    return _cdf(sazonalidade.pesos_dias(inicio + np.arange(dias)))
+
+@lru_cache(maxsize=64)
+def _cdf_horas(inicio, fim, sazonalidade):
+    """Início, duração (s) e CDF de cada hora da janela de instantes [inicio, fim]"""
+    primeira = inicio.astype('datetime64[h]')
+    horas = primeira + np.arange(int((fim.astype('datetime64[h]') - primeira).astype(np.int64)) + 1)
+    comeco = np.maximum(horas.astype('datetime64[s]'), inicio)
+    final = np.minimum((horas + 1).astype('datetime64[s]'), fim + np.timedelta64(1, 's'))
+    duracao = (final - comeco).astype(np.int64)
+
+    pesos = duracao * sazonalidade.pesos_dias(horas.astype('datetime64[D]'))
+    if sazonalidade.hora is not None:
+        pesos = pesos * np.array(sazonalidade.hora)[horas.astype(np.int64) % 24]
+    return comeco, duracao, _cdf(pesos)
+
+def _cdf(pesos):
+    cdf = np.cumsum(pesos, dtype=np.float64)
+    cdf /= cdf[-1]
+    cdf[-1] = 1.0
+    return cdf
+
+# SORTEIO
+@medido('sortear_datas')
+def sortear_datas(rng, inicio, fim, qtd, sazonalidade=None, hoje=None):
+    """Sorteia `qtd` datas (datetime64[D]) entre `inicio` e `fim`, inclusive.
+
+    Uniforme, ou proporcional aos pesos diários de `sazonalidade`. Janelas
+    relativas ('today', '-6M') partem de `hoje` (padrão: a data atual).
+    """
+    primeiro, dias = resolver_janela(inicio, fim, hoje or datetime.now().date())
+    if sazonalidade is None or not sazonalidade.por_dia:
+        return primeiro + rng.integers(0, dias, qtd)
+    cdf = _cdf_dias(primeiro, dias, sazonalidade)
+    return primeiro + np.searchsorted(cdf, rng.random(qtd), side='right')
+
+@medido('sortear_datas_horas')
+def sortear_datas_horas(rng, inicio, fim, qtd, sazonalidade=None):
+    """Sorteia `qtd` instantes (datetime64[s]) entre `inicio` e `fim`.
+
+    Com `sazonalidade`, sorteia a hora pela CDF horária e a posição dentro da
+    hora com o mesmo número uniforme, então custa um único sorteio por linha.
+    """
+    inicio = np.datetime64(inicio, 's')
+    fim = np.datetime64(fim, 's')
+    if sazonalidade is None:
+        segundos = (fim - inicio).astype(np.int64)
+        return inicio + rng.integers(0, segundos + 1, qtd)
+
+    comeco, duracao, cdf = _cdf_horas(inicio, fim, sazonalidade)
+    sorteio = rng.random(qtd)
+    hora = np.searchsorted(cdf, sorteio, side='right')
+    anterior = np.where(hora > 0, cdf[hora - 1], 0.0)
+    fracao = (sorteio - anterior) / (cdf[hora] - anterior)
+    deslocamento = np.minimum((fracao * duracao[hora]).astype(np.int64), duracao[hora] - 1)
+    return comeco[hora] + deslocamento
@@ -0,0 +1,17 @@
+import pytest
+
+from gerador_dados.areas import AREAS
+from gerador_dados.esquemas import ESQUEMAS, _REGISTRADOS, registrar_area
+
+@pytest.fixture
+def registrar():
+    """`registrar_area` que desfaz os registros (e as áreas novas em `AREAS`) ao fim do teste"""
+    esquemas, registrados = dict(ESQUEMAS), dict(_REGISTRADOS)
+    areas = {area: list(subareas) for area, subareas in AREAS.items()}
+    yield registrar_area
+    ESQUEMAS.clear()
+    ESQUEMAS.update(esquemas)
+    _REGISTRADOS.clear()
+    _REGISTRADOS.update(registrados)
+    AREAS.clear()
+    AREAS.update(areas)
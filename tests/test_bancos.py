@@ -0,0 +1,175 @@
+"""Carga em SQLite, DuckDB e script `COPY`: DDL, transações, índices, escapes e upsert"""
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gerador_dados import bancos
+from gerador_dados.bancos import ddl, ddl_indices, gravar_copy, gravar_duckdb, gravar_sqlite, nome_tabela
+from gerador_dados.motor import gerar_em_blocos
+
+duckdb = pytest.importorskip('duckdb')
+
+def _blocos(qtd=1_000, tamanho_bloco=100, **opcoes):
+    return gerar_em_blocos('Vendas', qtd, seed=3, tamanho_bloco=tamanho_bloco, nativo=True, **opcoes)
+
+def _com_linha(bloco):
+    bloco.insert(0, 'Linha', bloco.index.to_numpy(np.int64))
+    return bloco
+
+def _rastrear_sqlite(monkeypatch):
+    """Comandos SQL executados pelas conexões SQLite abertas em `bancos`"""
+    comandos = []
+    conectar = sqlite3.connect
+
+    def conectar_rastreado(*args, **kwargs):
+        conexao = conectar(*args, **kwargs)
+        conexao.set_trace_callback(comandos.append)
+        return conexao
+    monkeypatch.setattr(sqlite3, 'connect', conectar_rastreado)
+    return comandos
+
+# DDL
+def test_nome_tabela():
+    assert nome_tabela('Logística', 'Distribuição') == 'logistica_distribuicao'
+    assert nome_tabela('SLA de Atendimento', 'Suporte Técnico') == 'sla_de_atendimento_suporte_tecnico'
+
+def test_ddl_e_tipos():
+    bloco = next(_blocos(10, compacto=True))
+    comando = ddl(bloco, 'vendas')
+    assert comando.startswith('CREATE TABLE "vendas" (')
+    tipos = dict(linha.strip().rstrip(',').rsplit(' ', 1) for linha in comando.splitlines()[1:-1])
+    assert tipos == {
+        '"Data"': 'DATE', '"Cliente"': 'TEXT', '"Produto"': 'TEXT', '"Quantidade"': 'SMALLINT',
+        '"Valor"': 'REAL', '"Desconto"': 'SMALLINT', '"Forma de Pagamento"': 'TEXT',
+        '"Nº Vezes"': 'SMALLINT', '"Data Vencimento"': 'DATE', '"Status"': 'TEXT', '"Vendedor"': 'TEXT',
+    }
+    tipos = {coluna: bancos.tipo_sql(pd.Series(valores, name=coluna)) for coluna, valores in {
+        'inteiro': np.array([1], np.int64), 'int32': np.array([1], np.int32), 'bool': [True],
+        'double': [1.5], 'instante': pd.to_datetime(['2025-01-01 10:00']), 'texto': ['a'],
+    }.items()}
+    assert tipos == {'inteiro': 'BIGINT', 'int32': 'INTEGER', 'bool': 'BOOLEAN', 'double': 'DOUBLE PRECISION',
+                     'instante': 'TIMESTAMP', 'texto': 'TEXT'}
+
+def test_ddl_indices():
+    assert ddl_indices('vendas', ['Cliente', ('Data', 'Nº Vezes')]) == [
+        'CREATE INDEX "ix_vendas_cliente" ON "vendas" ("Cliente")',
+        'CREATE INDEX "ix_vendas_data_no_vezes" ON "vendas" ("Data", "Nº Vezes")',
+    ]
+    assert ddl_indices('t', ['Linha'], unico=True) == ['CREATE UNIQUE INDEX "ix_t_linha" ON "t" ("Linha")']
+
+def test_sqlite_tipos_e_valores(tmp_path):
+    caminho = tmp_path / 'vendas.sqlite'
+    assert gravar_sqlite(_blocos(), caminho, 'vendas') == 1_000
+    conexao = sqlite3.connect(caminho)
+    tipos = {nome: tipo for _, nome, tipo, *_ in conexao.execute('PRAGMA table_info("vendas")')}
+    assert tipos['Data'] == 'DATE' and tipos['Quantidade'] == 'BIGINT' and tipos['Cliente'] == 'TEXT'
+    lido = pd.read_sql('SELECT * FROM vendas', conexao)
+    esperado = pd.concat(list(_blocos()), ignore_index=True)
+    assert lido['Data'].tolist() == esperado['Data'].dt.strftime('%Y-%m-%d').tolist()
+    pd.testing.assert_series_equal(lido['Valor'], esperado['Valor'])
+    assert lido['Cliente'].tolist() == esperado['Cliente'].tolist()
+
+def test_duckdb_tipos_e_valores(tmp_path):
+    caminho = tmp_path / 'vendas.duckdb'
+    assert gravar_duckdb(_blocos(compacto=True), caminho, 'vendas') == 1_000
+    conexao = duckdb.connect(str(caminho))
+    tipos = dict(conexao.execute('SELECT column_name, column_type FROM (DESCRIBE vendas)').fetchall())
+    assert (tipos['Data'], tipos['Quantidade'], tipos['Valor'], tipos['Status']) == ('DATE', 'SMALLINT', 'FLOAT', 'VARCHAR')
+    assert conexao.execute('SELECT sum("Quantidade") FROM vendas').fetchone()[0] == int(
+        sum(bloco['Quantidade'].sum() for bloco in _blocos(compacto=True)))
+
+# TRANSAÇÕES
+def test_sqlite_transacoes_em_lotes(tmp_path, monkeypatch):
+    comandos = _rastrear_sqlite(monkeypatch)
+    gravar_sqlite(_blocos(), tmp_path / 'v.sqlite', 'vendas', linhas_por_transacao=250)
+    # Blocos de 100 linhas: COMMIT a cada 300 linhas (3 blocos) e um no fim
+    assert comandos.count('COMMIT') == 4
+    assert comandos.count('BEGIN') == 4
+    assert comandos.index('COMMIT') > comandos.index(next(c for c in comandos if c.startswith('CREATE TABLE')))
+
+def test_copy_transacoes_em_lotes(tmp_path):
+    caminho = tmp_path / 'vendas.sql'
+    assert gravar_copy(_blocos(), caminho, 'vendas', indices=['Cliente'], linhas_por_transacao=250) == 1_000
+    script = caminho.read_text(encoding='utf-8')
+    assert script.startswith('DROP TABLE IF EXISTS "vendas";\nCREATE TABLE "vendas" (')
+    assert script.count('COPY "vendas"') == script.count('COMMIT;') == 4
+    assert script.rstrip().endswith('CREATE INDEX "ix_vendas_cliente" ON "vendas" ("Cliente");')
+    linhas_dados = [linha for linha in script.splitlines() if linha.count('\t') == 10]
+    assert len(linhas_dados) == 1_000
+
+# ÍNDICES
+def test_sqlite_indices_removidos_e_recriados(tmp_path, monkeypatch):
+    caminho = tmp_path / 'v.sqlite'
+    gravar_sqlite(_blocos(200), caminho, 'vendas', indices=['Cliente', ('Data', 'Status')])
+    comandos = _rastrear_sqlite(monkeypatch)
+    gravar_sqlite(_blocos(300), caminho, 'vendas', substituir=False)
+
+    drops = [i for i, c in enumerate(comandos) if c.startswith('DROP INDEX')]
+    inserts = [i for i, c in enumerate(comandos) if c.startswith('INSERT')]
+    creates = [i for i, c in enumerate(comandos) if c.startswith('CREATE INDEX')]
+    assert len(drops) == len(creates) == 2
+    assert max(drops) < min(inserts) and max(inserts) < min(creates)
+    conexao = sqlite3.connect(caminho)
+    assert sorted(nome for nome, _ in bancos._indices_sqlite(conexao, 'vendas')) == [
+        'ix_vendas_cliente', 'ix_vendas_data_status']
+    assert conexao.execute('SELECT count(*) FROM vendas').fetchone()[0] == 500
+
+def test_duckdb_indices_recriados(tmp_path):
+    caminho = tmp_path / 'v.duckdb'
+    gravar_duckdb(_blocos(200), caminho, 'vendas', indices=['Cliente'])
+    gravar_duckdb(_blocos(300), caminho, 'vendas', substituir=False)
+    conexao = duckdb.connect(str(caminho))
+    assert conexao.execute("SELECT index_name FROM duckdb_indexes() WHERE table_name = 'vendas'").fetchall() == [
+        ('ix_vendas_cliente',)]
+    assert conexao.execute('SELECT count(*) FROM vendas').fetchone()[0] == 500
+
+# COPY: ESCAPES E NULOS
+def test_copy_escapes_e_nulos(tmp_path):
+    bloco = pd.DataFrame({
+        'Texto': ['tab\taqui', 'linha\nnova', 'barra \\ invertida', None, 'retorno\r'],
+        'Valor': [1.5, np.nan, 3.0, 4.25, 5.0],
+        'Data': pd.to_datetime(['2025-01-02', None, '2025-03-04', '2025-05-06', '2025-07-08']),
+        'Instante': pd.to_datetime(['2025-01-02 10:30', '2025-01-02 11:00', None, '2025-01-03 00:00', None]),
+        'Ativo': [True, False, True, False, True],
+    })
+    bloco.attrs['colunas_data'] = ['Data']
+    caminho = tmp_path / 'escapes.sql'
+    gravar_copy([bloco], caminho, 'escapes')
+    script = caminho.read_text(encoding='utf-8')
+    assert '"Data" DATE' in script and '"Instante" TIMESTAMP' in script and '"Ativo" BOOLEAN' in script
+    dados = script.split('FROM stdin;\n', 1)[1].split('\\.\n', 1)[0].splitlines()
+    assert dados == [
+        'tab\\taqui\t1.5\t2025-01-02\t2025-01-02 10:30:00\tt',
+        'linha\\nnova\t\\N\t\\N\t2025-01-02 11:00:00\tf',
+        'barra \\\\ invertida\t3.0\t2025-03-04\t\\N\tt',
+        '\\N\t4.25\t2025-05-06\t2025-01-03 00:00:00\tf',
+        'retorno\\r\t5.0\t2025-07-08\t\\N\tt',
+    ]
+
+def test_copy_sem_linhas_fecha_o_copy(tmp_path):
+    caminho = tmp_path / 'vazio.sql'
+    assert gravar_copy(_blocos(0), caminho, 'vendas') == 0
+    script = caminho.read_text(encoding='utf-8')
+    assert 'CREATE TABLE "vendas"' in script and script.endswith('FROM stdin;\n\\.\nCOMMIT;\n')
+
+# ANEXAR E UPSERT
+@pytest.mark.parametrize('gravar, contar', [
+    (gravar_sqlite, lambda caminho, sql: sqlite3.connect(caminho).execute(sql).fetchone()[0]),
+    (gravar_duckdb, lambda caminho, sql: duckdb.connect(str(caminho)).execute(sql).fetchone()[0]),
+], ids=['sqlite', 'duckdb'])
+def test_anexar_e_upsert(tmp_path, gravar, contar):
+    sem_chave, com_chave = tmp_path / 'sem_chave', tmp_path / 'com_chave'
+    gravar((_com_linha(b) for b in _blocos(300)), sem_chave, 'vendas')
+    gravar((_com_linha(b) for b in _blocos(300)), com_chave, 'vendas', chave='Linha')
+
+    # Repete as linhas 200-299 (carga interrompida) e acrescenta 300-499
+    repetidas = [_com_linha(b) for b in _blocos(500)][2:]
+    gravar(iter(repetidas), sem_chave, 'vendas', substituir=False)
+    gravar(iter(repetidas), com_chave, 'vendas', substituir=False, chave='Linha')
+
+    assert contar(sem_chave, 'SELECT count(*) FROM vendas') == 600
+    assert contar(com_chave, 'SELECT count(*) FROM vendas') == 500
+    assert contar(com_chave, 'SELECT count(DISTINCT "Linha") FROM vendas') == 500
+    assert contar(com_chave, 'SELECT max("Linha") FROM vendas') == 499
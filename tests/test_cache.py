@@ -0,0 +1,122 @@
+"""Cache em disco: a chave acompanha tudo que muda os valores, despejo LRU e ida e volta"""
+import os
+
+import pandas as pd
+import pytest
+
+from gerador_dados.cache import CacheDados
+from gerador_dados.cidades import CIDADES_COORDS
+from gerador_dados.esquemas import Coluna, Esquema, inteiros
+from gerador_dados.ids import FORMATOS_ID, FormatoId
+from gerador_dados.motor import gerar_dados
+from gerador_dados.pools import TAMANHOS_POOL
+from gerador_dados.temporal import SAZONALIDADES, Sazonalidade
+
+pytest.importorskip('pyarrow')
+
+@pytest.fixture
+def cache(tmp_path):
+    return CacheDados(str(tmp_path))
+
+def _dobro(lote):
+    return lote.inteiros(0, 10) * 2
+
+def _triplo(lote):
+    return lote.inteiros(0, 10) * 3
+
+def test_chave_muda_com_o_esquema_registrado(cache, registrar):
+    registrar(Esquema('Estoque Central', colunas=[inteiros('Itens', 0, 10)]))
+    original = cache.chave('Estoque Central', 100, seed=1)
+    assert cache.chave('Estoque Central', 100, seed=1) == original
+
+    registrar(Esquema('Estoque Central', colunas=[inteiros('Itens', 0, 20)]))
+    faixa = cache.chave('Estoque Central', 100, seed=1)
+    registrar(Esquema('Estoque Central', colunas=[Coluna('Itens', _dobro)]))
+    dobro = cache.chave('Estoque Central', 100, seed=1)
+    registrar(Esquema('Estoque Central', colunas=[Coluna('Itens', _triplo)]))
+    triplo = cache.chave('Estoque Central', 100, seed=1)
+    assert len({original, faixa, dobro, triplo}) == 4
+
+def test_chave_muda_com_a_sazonalidade(cache, monkeypatch):
+    original = cache.chave('Vendas', 100, seed=1)
+    monkeypatch.setitem(SAZONALIDADES, ('Vendas', None), Sazonalidade(hora=[1] * 12 + [5] * 12))
+    sazonal = cache.chave('Vendas', 100, seed=1)
+    monkeypatch.setitem(SAZONALIDADES, ('Vendas', None), Sazonalidade(hora=[5] * 12 + [1] * 12))
+    assert len({original, sazonal, cache.chave('Vendas', 100, seed=1)}) == 3
+
+def test_chave_muda_com_o_formato_de_id(cache, monkeypatch):
+    original = cache.chave('SLA de Atendimento', 100, 'Helpdesk', seed=1)
+    monkeypatch.setitem(FORMATOS_ID, 'Ticket', FormatoId(largura=10, base=36, prefixo='TK-'))
+    assert cache.chave('SLA de Atendimento', 100, 'Helpdesk', seed=1) != original
+
+def test_chave_muda_com_as_cidades(cache, monkeypatch):
+    original = cache.chave('Logística', 100, 'Transporte', seed=1)
+    monkeypatch.setitem(CIDADES_COORDS, 'Palmas', (-10.18, -48.33))
+    assert cache.chave('Logística', 100, 'Transporte', seed=1) != original
+
+def test_chave_muda_com_o_tamanho_dos_pools(cache, monkeypatch):
+    original = cache.chave('Vendas', 100, seed=1)
+    monkeypatch.setitem(TAMANHOS_POOL, 'name', 500)
+    assert cache.chave('Vendas', 100, seed=1) != original
+
+def test_chave_muda_com_os_parametros(cache):
+    chaves = {
+        cache.chave('Vendas', 100, seed=1),
+        cache.chave('Vendas', 101, seed=1),
+        cache.chave('Vendas', 100, seed=2),
+        cache.chave('Vendas', 100, seed=1, nativo=True),
+        cache.chave('Vendas', 100, seed=1, compacto=True),
+        cache.chave('Logística', 100, 'Estoque', seed=1),
+        cache.chave('Logística', 100, 'Transporte', seed=1),
+    }
+    assert len(chaves) == 7
+
+def _gravar_com_uso(cache, chaves, df):
+    """Grava as chaves com datas de uso crescentes (a primeira é a menos usada)"""
+    for segundos, chave in enumerate(chaves):
+        cache.gravar(chave, df)
+        os.utime(cache._caminho(chave), (1_000_000 + segundos, 1_000_000 + segundos))
+
+def test_despejo_apaga_os_menos_usados(cache):
+    df = gerar_dados('Vendas', 200, seed=1)
+    _gravar_com_uso(cache, ['a', 'b', 'c', 'd'], df)
+    tamanho_arquivo = os.path.getsize(cache._caminho('a'))
+
+    # Ler 'a' a torna a mais recente: 'b' e 'c' saem primeiro
+    assert cache.ler('a') is not None
+    cache.tamanho_maximo = 2 * tamanho_arquivo
+    cache.despejar()
+    assert [cache.ler(chave) is not None for chave in 'abcd'] == [True, False, False, True]
+
+def test_despejo_nunca_apaga_o_arquivo_mantido(cache):
+    df = gerar_dados('Vendas', 200, seed=1)
+    _gravar_com_uso(cache, ['a', 'b', 'c'], df)
+    cache.tamanho_maximo = 1
+    cache.despejar(manter=cache._caminho('a'))
+    assert os.path.exists(cache._caminho('a'))
+    assert not os.path.exists(cache._caminho('b'))
+    assert not os.path.exists(cache._caminho('c'))
+
+def test_gravar_acima_do_limite_mantem_o_novo(tmp_path):
+    cache = CacheDados(str(tmp_path), tamanho_maximo=1)
+    cache.obter('Vendas', 200, seed=1)
+    novo = cache.obter('Vendas', 200, seed=2)
+    assert cache.ler(cache.chave('Vendas', 200, seed=1)) is None
+    pd.testing.assert_frame_equal(cache.ler(cache.chave('Vendas', 200, seed=2)), novo)
+
+@pytest.mark.parametrize('area,subarea', [
+    ('Vendas', None),
+    ('Logística', 'Transporte'),
+    ('Financeiro', 'Fluxo de Caixa'),
+    ('SLA de Atendimento', 'Helpdesk'),
+])
+@pytest.mark.parametrize('compacto', [False, True])
+def test_ida_e_volta_devolve_o_mesmo_dataframe(cache, area, subarea, compacto):
+    esperado = gerar_dados(area, 500, subarea, seed=3, compacto=compacto)
+    gravado = cache.obter(area, 500, subarea, seed=3, compacto=compacto)
+    lido = cache.obter(area, 500, subarea, seed=3, compacto=compacto)
+
+    assert cache.ler(cache.chave(area, 500, subarea, seed=3, compacto=compacto)) is not None
+    for df in (gravado, lido):
+        pd.testing.assert_frame_equal(df, esperado)
+        assert df.attrs['colunas_data'] == list(esperado.attrs.get('colunas_data', []))
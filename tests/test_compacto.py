@@ -0,0 +1,48 @@
+"""Tipos estreitos do modo compacto: os valores são sempre os do modo padrão"""
+import numpy as np
+import pandas as pd
+
+from gerador_dados.compacto import estreitar, tipo_estreito
+from gerador_dados.esquemas import Coluna, Esquema, inteiros, uniforme
+from gerador_dados.motor import gerar_dados
+
+def _quantidade_livre(lote):
+    return lote.inteiros(0, 100_000)
+
+def test_area_registrada_fora_das_faixas_padrao(registrar):
+    registrar(Esquema('Estoque Central', colunas=[
+        inteiros('Quantidade', 0, 1_000_000),
+        uniforme('Valor (R$)', 100_000, 900_000),
+        Coluna('Nº Vezes', _quantidade_livre),
+    ]))
+    padrao = gerar_dados('Estoque Central', 5_000, seed=7)
+    compacto = gerar_dados('Estoque Central', 5_000, seed=7, compacto=True)
+
+    assert compacto['Quantidade'].dtype == np.int32
+    assert compacto['Valor (R$)'].dtype == np.float64
+    # Sem faixa declarada, a coluna fica no tipo largo (o nome não decide o tipo)
+    assert compacto['Nº Vezes'].dtype == np.int64
+    pd.testing.assert_frame_equal(compacto, padrao, check_dtype=False)
+
+def test_area_registrada_dentro_das_faixas(registrar):
+    registrar(Esquema('Loja', colunas=[inteiros('Itens', -5, 100), uniforme('Preço', 1, 600)]))
+    compacto = gerar_dados('Loja', 1_000, seed=7, compacto=True)
+    assert compacto['Itens'].dtype == np.int8
+    assert compacto['Preço'].dtype == np.float32
+    padrao = gerar_dados('Loja', 1_000, seed=7)
+    np.testing.assert_array_equal(compacto['Preço'].to_numpy().astype(str).astype(float), padrao['Preço'])
+
+def test_valores_fora_do_tipo_da_tabela_ficam_largos():
+    colunas = {'Quantidade': np.array([1, 394_825]), 'Valor': np.array([10.5, 291_789.6])}
+    estreitar(colunas)
+    assert colunas['Quantidade'].dtype == np.int64
+    assert colunas['Valor'].dtype == np.float64
+    assert colunas['Valor'][1] == 291_789.6
+
+def test_tipo_estreito():
+    assert tipo_estreito(0, 127) == np.int8
+    assert tipo_estreito(-129, 0) == np.int16
+    assert tipo_estreito(0, 2 ** 31) == np.int64
+    assert tipo_estreito(0, 65_535.99, 2) == np.float32
+    assert tipo_estreito(0, 291_789.6, 2) == np.float64
+    assert tipo_estreito(-180, 180, 4) == np.float32
@@ -0,0 +1,120 @@
+"""Parquet e Feather/Arrow: gravar em vários blocos dá o mesmo arquivo lógico que num só"""
+import pandas as pd
+import pytest
+
+from gerador_dados.exportacao import FORMATOS_ARROW, exportar_em_partes, gravar_blocos
+from gerador_dados.motor import gerar_dados, gerar_em_blocos
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+ipc = pytest.importorskip('pyarrow.ipc')
+
+LINHAS = 3_000
+SEED = 11
+
+AREAS = [
+    ('Vendas', None),
+    ('Fornecedores', None),
+    ('Logística', 'Transporte'),
+    ('Financeiro', 'Fluxo de Caixa'),
+    ('SLA de Atendimento', 'Helpdesk'),
+]
+
+def _ler(caminho, formato):
+    if formato == 'parquet':
+        return pq.read_table(caminho)
+    with pa.memory_map(str(caminho)) as fonte:
+        return ipc.open_file(fonte).read_all()
+
+def _gravar(tmp_path, nome, formato, area, subarea, qtd=LINHAS, tamanho_bloco=LINHAS, **opcoes):
+    caminho = tmp_path / f'{nome}.{formato}'
+    blocos = gerar_em_blocos(area, qtd, subarea, seed=SEED, tamanho_bloco=tamanho_bloco, nativo=True)
+    total = gravar_blocos(blocos, caminho, formato, **opcoes)
+    return total, _ler(caminho, formato)
+
+def _dicionarios(tabela):
+    return [campo.name for campo in tabela.schema if pa.types.is_dictionary(campo.type)]
+
+def _vocabulario(tabela, nome):
+    return tabela.unify_dictionaries().column(nome).chunk(0).dictionary.to_pylist()
+
+@pytest.mark.parametrize('formato', FORMATOS_ARROW)
+@pytest.mark.parametrize('area,subarea', AREAS)
+@pytest.mark.parametrize('tamanho_bloco', [700, 1_000])
+def test_varios_blocos_igual_a_um_bloco(tmp_path, formato, area, subarea, tamanho_bloco):
+    total_um, um = _gravar(tmp_path, 'um', formato, area, subarea)
+    total_varios, varios = _gravar(tmp_path, 'varios', formato, area, subarea, tamanho_bloco=tamanho_bloco)
+
+    assert total_um == total_varios == LINHAS
+    assert varios.schema.equals(um.schema)
+    assert _dicionarios(varios) == _dicionarios(um)
+    for nome in _dicionarios(um):
+        assert _vocabulario(varios, nome) == _vocabulario(um, nome)
+    pd.testing.assert_frame_equal(varios.to_pandas(), um.to_pandas())
+
+@pytest.mark.parametrize('formato', FORMATOS_ARROW)
+def test_dicionario_cresce_entre_blocos_pequenos(tmp_path, formato):
+    # Blocos de 13 linhas trazem valores novos quase sempre: cada um vira um delta do dicionário
+    colunas = ['Produto', 'Forma de Pagamento', 'Status', 'Vendedor']
+    _, um = _gravar(tmp_path, 'um', formato, 'Vendas', None, colunas_dicionario=colunas)
+    _, varios = _gravar(tmp_path, 'varios', formato, 'Vendas', None, tamanho_bloco=13,
+                        colunas_dicionario=colunas)
+
+    assert _dicionarios(varios) == _dicionarios(um) == colunas
+    for nome in colunas:
+        assert _vocabulario(varios, nome) == _vocabulario(um, nome)
+    pd.testing.assert_frame_equal(varios.to_pandas(), um.to_pandas())
+
+@pytest.mark.parametrize('formato', FORMATOS_ARROW)
+def test_valores_iguais_aos_de_gerar_dados(tmp_path, formato):
+    _, tabela = _gravar(tmp_path, 'dados', formato, 'Logística', 'Transporte', tamanho_bloco=700)
+    esperado = gerar_dados('Logística', LINHAS, 'Transporte', seed=SEED, nativo=True)
+    lido = tabela.to_pandas()
+    # O Parquet/Arrow devolve as datas (date32) como objetos `date`
+    for nome in esperado.attrs['colunas_data']:
+        lido[nome] = pd.to_datetime(lido[nome])
+    for nome in _dicionarios(tabela):
+        lido[nome] = lido[nome].astype(object)
+    pd.testing.assert_frame_equal(lido, esperado, check_dtype=False)
+
+def test_colunas_de_valores_quase_unicos_nao_viram_dicionario(tmp_path):
+    _, tabela = _gravar(tmp_path, 'dados', 'parquet', 'SLA de Atendimento', 'Helpdesk', tamanho_bloco=100)
+    dicionarios = _dicionarios(tabela)
+    assert 'Ticket' not in dicionarios and 'Usuário' not in dicionarios
+    assert {'Categoria', 'Prioridade', 'Status'} <= set(dicionarios)
+
+@pytest.mark.parametrize('formato', FORMATOS_ARROW)
+@pytest.mark.parametrize('area,subarea', AREAS)
+def test_arquivo_sem_linhas_mantem_o_esquema(tmp_path, formato, area, subarea):
+    total, vazio = _gravar(tmp_path, 'vazio', formato, area, subarea, qtd=0)
+    _, cheio = _gravar(tmp_path, 'cheio', formato, area, subarea)
+
+    assert total == vazio.num_rows == 0
+    assert vazio.column_names == cheio.column_names
+    for campo_vazio, campo_cheio in zip(vazio.schema, cheio.schema):
+        tipo_vazio, tipo_cheio = campo_vazio.type, campo_cheio.type
+        # Sem linhas não há como saber se o texto se repete: só o tipo dos valores conta
+        if pa.types.is_dictionary(tipo_vazio) or pa.types.is_dictionary(tipo_cheio):
+            tipo_vazio = getattr(tipo_vazio, 'value_type', tipo_vazio)
+            tipo_cheio = getattr(tipo_cheio, 'value_type', tipo_cheio)
+            assert pa.types.is_string(tipo_vazio) or pa.types.is_large_string(tipo_vazio)
+            assert pa.types.is_string(tipo_cheio) or pa.types.is_large_string(tipo_cheio)
+        else:
+            assert tipo_vazio == tipo_cheio, campo_vazio.name
+
+@pytest.mark.parametrize('formato', FORMATOS_ARROW)
+def test_sem_blocos_grava_arquivo_valido(tmp_path, formato):
+    caminho = tmp_path / f'nada.{formato}'
+    assert gravar_blocos(iter(()), caminho, formato) == 0
+    tabela = _ler(caminho, formato)
+    assert tabela.num_rows == 0 and tabela.num_columns == 0
+
+@pytest.mark.parametrize('formato', FORMATOS_ARROW)
+def test_exportar_em_partes_igual_ao_arquivo(tmp_path, formato):
+    caminho = tmp_path / f'dados.{formato}'
+    gravar_blocos(gerar_em_blocos('Vendas', LINHAS, seed=SEED, tamanho_bloco=700, nativo=True), caminho, formato)
+    partes = exportar_em_partes(gerar_em_blocos('Vendas', LINHAS, seed=SEED, tamanho_bloco=700, nativo=True),
+                                formato)
+    em_partes = tmp_path / f'partes.{formato}'
+    em_partes.write_bytes(b''.join(partes))
+    assert _ler(em_partes, formato).equals(_ler(caminho, formato))
@@ -0,0 +1,90 @@
+"""Invariantes da geração para todas as áreas, com `hoje` fixo.
+
+Cada linha é função só de (seed, área, subárea, número da linha), então a
+saída não pode depender de como o conjunto é fatiado, dividido em blocos ou
+workers, projetado ou atualizado dia a dia.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gerador_dados.areas import AREAS
+from gerador_dados.esquemas import esquema
+from gerador_dados.incremental import INCREMENTAIS, Incremental
+from gerador_dados.motor import gerar_dados, gerar_em_blocos, gerar_linhas
+from gerador_dados.paralelo import gerar_dados_paralelo
+
+HOJE = date(2025, 6, 15)
+SEED = 20_250_615
+LINHAS = 1_000
+
+AREAS_SUBAREAS = [(area, subarea) for area, subareas in AREAS.items() for subarea in subareas or [None]]
+MODOS = {'padrao': {}, 'nativo': {'nativo': True}, 'compacto': {'compacto': True}}
+
+def _id(valor):
+    return '/'.join(parte for parte in valor if parte) if isinstance(valor, tuple) else None
+
+@pytest.fixture(scope='module', params=AREAS_SUBAREAS, ids=_id)
+def area(request):
+    return request.param
+
+def _gerar(area, qtd=LINHAS, **opcoes):
+    return gerar_dados(area[0], qtd, area[1], SEED, hoje=HOJE, **opcoes)
+
+@pytest.fixture(scope='module')
+def completo(area):
+    return _gerar(area)
+
+# FATIAS E BLOCOS
+@pytest.mark.parametrize('inicio, fim', [(0, 1), (137, 138), (250, 731), (999, 1000)])
+def test_fatia_igual_ao_conjunto(area, completo, inicio, fim):
+    fatia = gerar_linhas(area[0], inicio, fim, area[1], SEED, hoje=HOJE)
+    pd.testing.assert_frame_equal(fatia, completo.iloc[inicio:fim])
+
+@pytest.mark.parametrize('modo', MODOS)
+@pytest.mark.parametrize('tamanho_bloco', [13, 256, LINHAS - 1, LINHAS])
+def test_blocos_nao_mudam_a_saida(area, modo, tamanho_bloco):
+    blocos = gerar_em_blocos(area[0], LINHAS, area[1], SEED, tamanho_bloco, hoje=HOJE, **MODOS[modo])
+    pd.testing.assert_frame_equal(pd.concat(list(blocos)), _gerar(area, **MODOS[modo]))
+
+@pytest.mark.parametrize('workers, tamanho_bloco', [(1, 300), (3, 128)])
+def test_workers_nao_mudam_a_saida(area, completo, workers, tamanho_bloco):
+    paralelo = gerar_dados_paralelo(area[0], LINHAS, area[1], SEED, workers, tamanho_bloco, hoje=HOJE)
+    pd.testing.assert_frame_equal(paralelo, completo)
+
+def test_chaves_unicas_entre_blocos(area):
+    colunas = [coluna.nome for coluna in esquema(*area).colunas if coluna.universo is not None]
+    if not colunas:
+        pytest.skip('área sem colunas de chave única')
+    blocos = pd.concat(list(gerar_em_blocos(area[0], 5 * LINHAS, area[1], SEED, 333, hoje=HOJE)))
+    for nome in colunas:
+        assert not blocos[nome].duplicated().any(), nome
+
+# PROJEÇÃO
+def test_projecao_igual_ao_conjunto(area, completo):
+    for nome in completo.columns:
+        projetado = _gerar(area, colunas=[nome])
+        assert list(projetado.columns) == [nome]
+        pd.testing.assert_series_equal(projetado[nome], completo[nome])
+    par = list(completo.columns[::-3])
+    pd.testing.assert_frame_equal(_gerar(area, colunas=par), completo[par])
+
+# INCREMENTAL
+@pytest.mark.parametrize('chave', list(INCREMENTAIS), ids=_id)
+def test_incremental_igual_a_geracao_do_zero(chave, tmp_path):
+    inicio = HOJE - timedelta(days=40)
+    checkpoint = tmp_path / 'checkpoint.json'
+    incremental = Incremental(*chave, seed=SEED, linhas_por_dia=30, inicio=inicio)
+    tabela, _ = incremental.atualizar(HOJE - timedelta(days=25))
+    for dia in (HOJE - timedelta(days=24), HOJE - timedelta(days=3), HOJE):
+        incremental.salvar(checkpoint)
+        incremental = Incremental.carregar(checkpoint)
+        novas, alteradas = incremental.atualizar(dia)
+        tabela.update(alteradas)
+        tabela = pd.concat([tabela, novas])
+
+    do_zero, _ = Incremental(*chave, seed=SEED, linhas_por_dia=30, inicio=inicio).atualizar(HOJE)
+    assert len(do_zero) and np.array_equal(tabela.index, do_zero.index)
+    pd.testing.assert_frame_equal(tabela, do_zero)
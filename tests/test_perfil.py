@@ -0,0 +1,71 @@
+"""Perfis de threads sobrepostas não se misturam nem ficam ativos depois do `with`"""
+import threading
+import tracemalloc
+
+from gerador_dados import perfil as modulo_perfil
+from gerador_dados.motor import gerar_dados
+from gerador_dados.perfil import medido, perfilar
+
+@medido('etapa', lambda nome: nome)
+def _etapa(nome):
+    return nome
+
+def _em_threads(memoria):
+    """A abre o perfil, B abre o seu, A fecha antes de B (ordem que quebrava o global)"""
+    a_entrou, b_entrou, a_saiu = threading.Event(), threading.Event(), threading.Event()
+    perfis, ativos_depois = {}, {}
+
+    def thread_a():
+        with perfilar(memoria) as perfil:
+            perfis['a'] = perfil
+            _etapa('a')
+            a_entrou.set()
+            b_entrou.wait(5)
+        ativos_depois['a'] = modulo_perfil._ativo.get()
+        a_saiu.set()
+
+    def thread_b():
+        with perfilar(memoria) as perfil:
+            perfis['b'] = perfil
+            b_entrou.set()
+            a_saiu.wait(5)
+            # O tracemalloc segue ligado enquanto este perfil de memória existe
+            perfis['tracemalloc_b'] = tracemalloc.is_tracing()
+            _etapa('b')
+            gerar_dados('Vendas', 100, seed=1)
+        ativos_depois['b'] = modulo_perfil._ativo.get()
+
+    threads = [threading.Thread(target=thread_a), threading.Thread(target=thread_b)]
+    threads[0].start()
+    a_entrou.wait(5)
+    threads[1].start()
+    for thread in threads:
+        thread.join(10)
+    return perfis, ativos_depois
+
+def test_perfis_sobrepostos_em_threads():
+    perfis, ativos_depois = _em_threads(memoria=False)
+    assert ativos_depois == {'a': None, 'b': None}
+    assert modulo_perfil._ativo.get() is None
+    assert set(perfis['a'].chamadas) == {'etapa:a'}
+    assert 'etapa:b' in perfis['b'].chamadas and 'etapa:a' not in perfis['b'].chamadas
+    # Depois dos dois, nada mais é registrado
+    _etapa('c')
+    assert 'etapa:c' not in perfis['a'].chamadas and 'etapa:c' not in perfis['b'].chamadas
+
+def test_perfis_de_memoria_sobrepostos():
+    assert not tracemalloc.is_tracing()
+    perfis, _ = _em_threads(memoria=True)
+    assert perfis['tracemalloc_b']
+    assert perfis['b'].alocacoes
+    assert not tracemalloc.is_tracing()
+
+def test_perfis_aninhados():
+    with perfilar() as externo:
+        _etapa('externo')
+        with perfilar() as interno:
+            _etapa('interno')
+        _etapa('externo')
+    assert externo.chamadas['etapa:externo'][0] == 2 and 'etapa:interno' not in externo.chamadas
+    assert set(interno.chamadas) == {'etapa:interno'}
+    assert modulo_perfil._ativo.get() is None
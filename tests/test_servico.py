@@ -0,0 +1,175 @@
+"""Serviço HTTP em localhost (porta efêmera): corpos em fluxo, erros e métricas"""
+import asyncio
+import gzip
+import io
+import json
+import socket
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import pytest
+
+from gerador_dados import motor, servico
+from gerador_dados.exportacao import exportar_bytes
+from gerador_dados.motor import gerar_dados
+from gerador_dados.servico import Servico
+
+class _Servidor:
+    """`Servico` num laço de eventos em outra thread, para os testes usarem HTTP bloqueante"""
+
+    def __init__(self, **opcoes):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.servico = self._executar(Servico(porta=0, **opcoes).iniciar())
+        self.url = f'http://127.0.0.1:{self.servico.porta}'
+
+    def _executar(self, corrotina):
+        return asyncio.run_coroutine_threadsafe(corrotina, self.loop).result(60)
+
+    def get(self, caminho, metodo='GET'):
+        """(status, cabeçalhos, corpo), também para respostas de erro"""
+        requisicao = urllib.request.Request(self.url + caminho, method=metodo)
+        try:
+            with urllib.request.urlopen(requisicao, timeout=60) as resposta:
+                return resposta.status, resposta.headers, resposta.read()
+        except urllib.error.HTTPError as erro:
+            return erro.code, erro.headers, erro.read()
+
+    def encerrar(self):
+        self._executar(self.servico.encerrar())
+        self._executar(_cancelar_respostas())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(10)
+        self.loop.close()
+
+async def _cancelar_respostas():
+    """Cancela as respostas ainda em andamento (ex.: a do cliente que parou de ler)"""
+    tarefas = [tarefa for tarefa in asyncio.all_tasks() if tarefa is not asyncio.current_task()]
+    for tarefa in tarefas:
+        tarefa.cancel()
+    await asyncio.gather(*tarefas, return_exceptions=True)
+
+@pytest.fixture(scope='module')
+def servidor():
+    servidor = _Servidor(workers=2, tamanho_bloco=300)
+    yield servidor
+    servidor.encerrar()
+
+# CORPOS
+@pytest.mark.parametrize('area, subarea', [('Vendas', None), ('Logística', 'Transporte')])
+def test_csv_igual_a_gerar_dados(servidor, area, subarea):
+    consulta = f'area={area}&linhas=1000&seed=11' + (f'&subarea={subarea}' if subarea else '')
+    status, cabecalhos, corpo = servidor.get('/dados?' + urllib.parse.quote(consulta, safe='=&'))
+    assert status == 200
+    assert cabecalhos['Transfer-Encoding'] == 'chunked'
+    assert (cabecalhos['X-Seed'], cabecalhos['X-Linhas']) == ('11', '1000')
+    assert corpo.decode('utf-8') == gerar_dados(area, 1000, subarea, seed=11).to_csv(index=False)
+
+def test_csv_gzip(servidor):
+    status, cabecalhos, corpo = servidor.get('/dados?area=Vendas&linhas=1000&seed=5&compressao=gzip')
+    assert status == 200 and cabecalhos['Content-Type'] == 'application/gzip'
+    assert 'vendas.csv.gz' in cabecalhos['Content-Disposition']
+    assert gzip.decompress(corpo).decode('utf-8') == gerar_dados('Vendas', 1000, seed=5).to_csv(index=False)
+
+def test_ndjson(servidor):
+    status, _, corpo = servidor.get('/dados?area=RH&linhas=700&seed=5&formato=ndjson')
+    assert status == 200
+    esperado = gerar_dados('RH', 700, seed=5, nativo=True)
+    assert corpo == exportar_bytes([esperado], 'ndjson')
+    registros = [json.loads(linha) for linha in corpo.decode('utf-8').splitlines()]
+    assert len(registros) == 700 and [r['Nome'] for r in registros] == esperado['Nome'].tolist()
+
+def test_parquet(servidor):
+    pq = pytest.importorskip('pyarrow.parquet')
+    status, cabecalhos, corpo = servidor.get('/dados?area=Vendas&linhas=1000&seed=5&formato=parquet')
+    assert status == 200 and cabecalhos['Content-Type'] == 'application/vnd.apache.parquet'
+    lido = pq.read_table(io.BytesIO(corpo)).to_pandas()
+    esperado = gerar_dados('Vendas', 1000, seed=5, nativo=True)
+    assert list(lido.columns) == list(esperado.columns)
+    for nome in esperado.columns:
+        # Colunas só de data voltam do Parquet (date32) como `date`
+        valores = esperado[nome].dt.date if nome in esperado.attrs['colunas_data'] else esperado[nome]
+        assert lido[nome].astype(object).tolist() == valores.astype(object).tolist(), nome
+
+def test_parquet_sem_linhas(servidor):
+    pq = pytest.importorskip('pyarrow.parquet')
+    status, _, corpo = servidor.get('/dados?area=Vendas&linhas=0&formato=parquet')
+    tabela = pq.read_table(io.BytesIO(corpo))
+    assert status == 200 and tabela.num_rows == 0
+    assert tabela.column_names == list(gerar_dados('Vendas', 1, seed=1).columns)
+
+# ERROS
+@pytest.mark.parametrize('caminho, status, trecho', [
+    ('/dados?area=Nada', 400, 'área inválida'),
+    ('/dados?area=Vendas&linhas=abc', 400, 'inteiros'),
+    ('/dados?area=Vendas&linhas=-1', 400, 'linhas deve estar entre'),
+    ('/dados?area=Logística', 400, 'exige subarea'),
+    ('/dados?area=Vendas&formato=xml', 400, 'formato inválido'),
+    ('/dados?area=Vendas&compressao=snappy', 400, 'compressão inválida'),
+    ('/nada', 404, 'caminho desconhecido'),
+])
+def test_erros_do_cliente(servidor, caminho, status, trecho):
+    recebido, _, corpo = servidor.get(urllib.parse.quote(caminho, safe='/?=&'))
+    assert recebido == status
+    assert trecho in json.loads(corpo)['erro']
+
+def test_metodo_nao_permitido(servidor):
+    status, cabecalhos, _ = servidor.get('/dados?area=Vendas', metodo='POST')
+    assert status == 405 and cabecalhos['Allow'] == 'GET'
+
+def test_falha_interna_responde_500(servidor, monkeypatch):
+    def falhar(*args, **kwargs):
+        raise ValueError('falha simulada')
+    antes = servidor.get('/metricas')[2]
+    monkeypatch.setattr(motor, 'preparar_contexto', falhar)
+    status, _, corpo = servidor.get('/dados?area=Vendas&linhas=10')
+    assert status == 500
+    assert json.loads(corpo)['erro'] == 'falha interna: ValueError: falha simulada'
+    por_status = json.loads(servidor.get('/metricas')[2])['por_status']
+    assert por_status['500'] == json.loads(antes)['por_status'].get('500', 0) + 1
+
+def test_requisicao_malformada_e_lenta(servidor, monkeypatch):
+    monkeypatch.setattr(servico, 'TEMPO_LEITURA', 0.2)
+    porta = servidor.servico.porta
+    with socket.create_connection(('127.0.0.1', porta), timeout=5) as conexao:
+        conexao.sendall(b'LIXO\r\n\r\n')
+        assert conexao.recv(100) == b''
+    # Sem enviar nada: a conexão é fechada ao fim de TEMPO_LEITURA, sem resposta
+    with socket.create_connection(('127.0.0.1', porta), timeout=5) as conexao:
+        assert conexao.recv(100) == b''
+
+def test_fila_cheia_responde_503():
+    servidor = _Servidor(workers=1, max_requisicoes=1, fila_maxima=0, tamanho_bloco=1000)
+    try:
+        # Uma resposta grande que o cliente não lê ocupa a única vaga
+        ocupada = socket.create_connection(('127.0.0.1', servidor.servico.porta))
+        ocupada.sendall(b'GET /dados?area=Vendas&linhas=5000000 HTTP/1.1\r\nHost: x\r\n\r\n')
+        assert ocupada.recv(12) == b'HTTP/1.1 200'
+        status, cabecalhos, corpo = servidor.get('/dados?area=Vendas&linhas=10')
+        assert status == 503 and cabecalhos['Retry-After'] == '1'
+        assert json.loads(servidor.get('/metricas')[2])['rejeitadas'] == 1
+        ocupada.close()
+    finally:
+        servidor.encerrar()
+
+# MÉTRICAS E ÁREAS
+def test_areas(servidor):
+    status, _, corpo = servidor.get('/areas')
+    assert status == 200 and json.loads(corpo)['Logística'] == ['Transporte', 'Estoque', 'Distribuição']
+
+def test_metricas(servidor):
+    antes = json.loads(servidor.get('/metricas')[2])
+    _, _, corpo = servidor.get('/dados?area=' + urllib.parse.quote('Saúde') + '&linhas=1234&seed=1')
+    metricas = json.loads(servidor.get('/metricas')[2])
+    assert metricas['requisicoes'] == antes['requisicoes'] + 2
+    assert metricas['linhas'] == antes['linhas'] + 1234
+    assert metricas['bytes'] >= antes['bytes'] + len(corpo)
+    assert metricas['por_status']['200'] >= antes['por_status'].get('200', 0) + 2
+    assert metricas['em_andamento'] == 0 and metricas['aguardando'] == 0
+    recentes = metricas['recentes']
+    assert recentes['respostas'] >= 1
+    assert set(recentes['total']) == {'p50', 'p95', 'p99', 'max'}
+    assert recentes['linhas_por_segundo'] > 0